@@ -14,6 +14,9 @@ def main(argv=sys.argv):
         'traverse': 'cortexpy.command.traverse.traverse',
         'subgraph': 'cortexpy.command.subgraph.subgraph',
         'prune': 'cortexpy.command.prune.prune',
+        'stats': 'cortexpy.command.stats.stats',
+        'index': 'cortexpy.command.index.index',
+        'join': 'cortexpy.command.join.join',
     }
     parser = argparse.ArgumentParser(prog='cortexpy')
     parser.add_argument('--version', action='version',
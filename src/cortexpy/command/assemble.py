@@ -13,6 +13,10 @@ def assemble(argv):
     parser.add_argument('--color', type=int, help='Restrict view to single color')
     parser.add_argument('--max-nodes', type=int, default=1000,
                         help='Maximum number of nodes to traverse [default: %(default)s]')
+    parser.add_argument('-p', '--processes', type=int, default=1,
+                        help='Number of processes to split the start k-mers between.'
+                             '  Each process memory-maps the graph'
+                             ' [default: %(default)s]')
     args = parser.parse_args(argv)
 
     from cortexpy.logging_config import configure_logging_from_args_and_get_logger
@@ -41,6 +45,8 @@ def assemble(argv):
         traversal_colors=colors,
         orientation=EngineTraversalOrientation.both,
         max_nodes=args.max_nodes,
+        graph_paths=[args.graph],
+        processes=args.processes,
     )
     traverser.traverse_from_each_kmer_in_fasta(args.start_sequences_fasta)
     kmers = kmerize_fasta(args.start_sequences_fasta, traverser.ra_parser.kmer_size)
@@ -50,3 +56,4 @@ def assemble(argv):
     seq_record_generator = interactor.all_simple_paths()
 
     SeqIO.write(seq_record_generator, output, 'fasta')
+    logger.info('Kmer cache: %s', random_access.record_cache.stats)
@@ -0,0 +1,40 @@
+def index(argv):
+    import argparse
+    from .shared import get_shared_argparse
+    from cortexpy.graph.parser.sparse_index import DEFAULT_PAGE_SIZE
+    shared_parser = get_shared_argparse()
+    parser = argparse.ArgumentParser(
+        'cortexpy index', parents=[shared_parser],
+        description="""
+        Build a sparse kmer index of a sorted cortex graph.
+
+        The index stores the first kmer of every page of records and is written next to the graph
+        by default.  Random access parsers pick up the index automatically and use it to read a
+        single page of records per kmer lookup.  An index is ignored once its graph is modified.
+        """
+    )
+    parser.set_defaults(out=None)
+    parser.add_argument('graph', help='Input cortexpy graph')
+    parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE,
+                        help='Approximate number of bytes of graph records per index entry'
+                             ' [default: %(default)s]')
+    args = parser.parse_args(argv)
+
+    from cortexpy.logging_config import configure_logging_from_args_and_get_logger
+    logger = configure_logging_from_args_and_get_logger(args, 'cortexpy.index')
+
+    if args.page_size < 1:
+        logger.error('--page-size (%s) needs to be greater than 0', args.page_size)
+        return 1
+
+    from cortexpy.graph.parser.sparse_index import SparseKmerIndex, sparse_index_path
+
+    if args.out is None:
+        args.out = sparse_index_path(args.graph)
+
+    logger.info('Indexing graph: %s', args.graph)
+    sparse_index = SparseKmerIndex.from_graph_path(args.graph, page_size=args.page_size)
+    logger.info('Indexed %s kmers in %s pages of %s records', sparse_index.n_records,
+                sparse_index.n_pages, sparse_index.records_per_page)
+    with open(args.out, 'wb') as fh:
+        sparse_index.dump(fh)
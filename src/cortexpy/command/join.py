@@ -0,0 +1,41 @@
+def join(argv):
+    import argparse
+    from .shared import get_shared_argparse
+    shared_parser = get_shared_argparse()
+    parser = argparse.ArgumentParser(
+        'cortexpy join', parents=[shared_parser],
+        description="""
+        Join sorted cortex graphs into a single sorted multi-color cortex graph.
+
+        The graphs are streamed and merged by kmer, so memory use does not grow with graph size.
+        The colors of the output graph are the colors of the input graphs in input order.  Kmers
+        that are missing from an input graph have no coverage and no edges in its colors.
+        """
+    )
+    parser.add_argument('graphs', nargs='+', help='Input sorted cortex graphs')
+    args = parser.parse_args(argv)
+
+    from cortexpy.logging_config import configure_logging_from_args_and_get_logger
+    logger = configure_logging_from_args_and_get_logger(args, 'cortexpy.join')
+
+    import os
+    import sys
+    from cortexpy.graph.join import join_graph_paths
+
+    if args.out == '-':
+        output = sys.stdout.buffer
+    else:
+        output = open(args.out, 'wb')
+
+    logger.info('Joining %s graphs', len(args.graphs))
+    try:
+        n_kmers = join_graph_paths(args.graphs, output)
+    except ValueError as e:
+        logger.error(str(e))
+        if args.out != '-':
+            output.close()
+            os.remove(args.out)
+        return 1
+    if args.out != '-':
+        output.close()
+    logger.info('Wrote %s kmers', n_kmers)
@@ -3,35 +3,111 @@ def prune(argv):
     from .shared import get_shared_argparse
     shared_parser = get_shared_argparse()
     parser = argparse.ArgumentParser('cortexpy prune', parents=[shared_parser])
-    parser.add_argument('-t', '--remove-tips', required=True, type=int,
+    parser.add_argument('-t', '--remove-tips', type=int,
                         help='Remove tips shorter than this number')
     parser.add_argument('graph', help="Input cortexpy graph.  '-' reads from stdin")
+    parser.add_argument('-p', '--processes', type=int, default=1,
+                        help='Number of processes to split tip finding between.'
+                             '  Only used with --streaming [default: %(default)s]')
+    parser.add_argument('--streaming', action='store_true',
+                        help='Prune a sorted graph file through a memory map instead of loading'
+                             ' the graph into memory.  Memory use is proportional to the number'
+                             ' of pruned kmers')
+    cleaning = parser.add_argument_group(
+        'coverage cleaning',
+        'Remove low coverage kmers and unitigs from a sorted graph file before removing tips.'
+        '  Coverage is summed over all colors.  Thresholds default to the first minimum of the'
+        ' coverage histogram.'
+    )
+    cleaning.add_argument('--remove-low-coverage-kmers', action='store_true',
+                          help='Remove kmers with a coverage below the kmer threshold')
+    cleaning.add_argument('--kmer-coverage-threshold', type=int,
+                          help='Kmer coverage threshold')
+    cleaning.add_argument('--remove-low-coverage-unitigs', action='store_true',
+                          help='Remove unitigs with a mean kmer coverage below the unitig'
+                               ' threshold')
+    cleaning.add_argument('--unitig-coverage-threshold', type=int,
+                          help='Unitig coverage threshold')
     args = parser.parse_args(argv)
 
     from cortexpy.logging_config import configure_logging_from_args_and_get_logger
     logger = configure_logging_from_args_and_get_logger(args, 'cortexpy.prune')
 
-    if args.remove_tips < 2:
+    is_cleaning = args.remove_low_coverage_kmers or args.remove_low_coverage_unitigs
+    if args.remove_tips is None and not is_cleaning:
+        logger.error('Nothing to prune: use --remove-tips or --remove-low-coverage-kmers or'
+                     ' --remove-low-coverage-unitigs')
+        return 1
+    if args.remove_tips is not None and args.remove_tips < 2:
         logger.error('--remove-tips (%s) needs to be greater than 1', args.remove_tips)
         return 1
-
-    from cortexpy.graph.interactor import Interactor
-    from cortexpy.graph.parser.streaming import load_cortex_graph
-    from cortexpy.graph.serializer.kmer import dump_colored_de_bruijn_graph_to_cortex
+    if (args.streaming or is_cleaning) and args.graph == '-':
+        logger.error('--streaming and coverage cleaning need a graph file, not stdin')
+        return 1
 
     import sys
+    import tempfile
     if args.out == '-':
         output = sys.stdout.buffer
     else:
         output = open(args.out, 'wb')
 
+    with tempfile.TemporaryDirectory() as tmpdir:
+        graph_path = args.graph
+        if is_cleaning:
+            from cortexpy.graph.clean import clean_graph_path
+            cleaning_output = output
+            if args.remove_tips is not None:
+                graph_path = f'{tmpdir}/cleaned.ctx'
+                cleaning_output = open(graph_path, 'wb')
+            clean_graph_path(args.graph, cleaning_output,
+                             remove_kmers=args.remove_low_coverage_kmers,
+                             kmer_threshold=args.kmer_coverage_threshold,
+                             remove_unitigs=args.remove_low_coverage_unitigs,
+                             unitig_threshold=args.unitig_coverage_threshold)
+            if cleaning_output is not output:
+                cleaning_output.close()
+
+        if args.remove_tips is not None:
+            prune_tips(args, graph_path, output, logger)
+    if args.out != '-':
+        output.close()
+
+
+def prune_tips(args, graph_path, output, logger):
+    if args.streaming:
+        from cortexpy.graph.prune import prune_tips_less_than_from_graph_path
+        prune_tips_less_than_from_graph_path(args.remove_tips, graph_path, output,
+                                             n_workers=args.processes)
+        return
+
+    import sys
+    from cortexpy.graph.cortex import build_cortex_graph_from_header
+    from cortexpy.graph.interactor import Interactor
+    from cortexpy.graph.parser.header import Header
+    from cortexpy.graph.parser.parallel import (
+        header_and_n_records_from_path,
+        load_cortex_graph_from_path,
+    )
+    from cortexpy.graph.parser.streaming import kmer_generator_from_stream_and_header
+    from cortexpy.graph.serializer.kmer import (
+        ColorInformationBlock,
+        dump_colored_de_bruijn_graph_to_cortex,
+    )
+
     logger.info('Loading de Bruijn graph')
-    if args.graph == '-':
-        graph = load_cortex_graph(sys.stdin.buffer)
+    if graph_path == '-':
+        header = Header.from_stream(sys.stdin.buffer)
+        graph = build_cortex_graph_from_header(
+            header, kmer_generator=kmer_generator_from_stream_and_header(sys.stdin.buffer, header)
+        )
     else:
-        graph = load_cortex_graph(open(args.graph, 'rb'))
+        header, _ = header_and_n_records_from_path(graph_path)
+        graph = load_cortex_graph_from_path(graph_path)
 
     logger.info(f'Loaded {len(graph)} kmers')
 
     graph = Interactor(graph).prune_tips_less_than(args.remove_tips).graph
-    dump_colored_de_bruijn_graph_to_cortex(graph, output)
+    color_info_blocks = [ColorInformationBlock.from_header_block(block)
+                         for block in header.color_info_blocks]
+    dump_colored_de_bruijn_graph_to_cortex(graph, output, color_info_blocks=color_info_blocks)
@@ -9,3 +9,15 @@ def get_shared_argparse():
                                help="Output cortexpy graph. '-' writes to stdout")
 
     return shared_parser
+
+
+def positive_int(value):
+    """Argparse type of integers that are at least one"""
+    import argparse
+    try:
+        int_value = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError('invalid int value: {!r}'.format(value))
+    if int_value < 1:
+        raise argparse.ArgumentTypeError('{} is not a positive integer'.format(value))
+    return int_value
@@ -0,0 +1,49 @@
+def stats(argv):
+    import argparse
+    from .shared import get_shared_argparse
+    from cortexpy.graph.statistics import DEFAULT_MAX_COVERAGE
+    shared_parser = get_shared_argparse()
+    parser = argparse.ArgumentParser(
+        'cortexpy stats', parents=[shared_parser],
+        description="""
+        Summarize a cortex graph in a single streaming pass without loading it into memory.
+
+        Output is a JSON document with the number of kmers and, for each color, the number of
+        kmers present, tips, isolated kmers, a coverage histogram and in- and out-degree counts.
+        """
+    )
+    parser.add_argument('graph', help="Input cortexpy graph.  '-' reads from stdin")
+    parser.add_argument('--max-coverage', type=int, default=DEFAULT_MAX_COVERAGE,
+                        help='Coverages of at least this value are counted in the last bin of '
+                             'the coverage histogram [default: %(default)s]')
+    parser.add_argument('-p', '--processes', type=int, default=1,
+                        help='Number of processes to split the graph between.'
+                             '  Ignored when reading from stdin [default: %(default)s]')
+    args = parser.parse_args(argv)
+
+    from cortexpy.logging_config import configure_logging_from_args_and_get_logger
+    logger = configure_logging_from_args_and_get_logger(args, 'cortexpy.stats')
+
+    if args.max_coverage < 1:
+        logger.error('--max-coverage (%s) needs to be greater than 0', args.max_coverage)
+        return 1
+
+    import sys
+    import json
+    from cortexpy.graph.statistics import statistics_from_path, statistics_from_stream
+
+    if args.out == '-':
+        output = sys.stdout
+    else:
+        output = open(args.out, 'wt')
+
+    logger.info('Computing statistics of graph: %s', args.graph)
+    if args.graph == '-':
+        graph_stats = statistics_from_stream(sys.stdin.buffer, max_coverage=args.max_coverage)
+    else:
+        graph_stats = statistics_from_path(args.graph,
+                                           max_coverage=args.max_coverage,
+                                           n_processes=args.processes)
+    logger.info('Found %s kmers', graph_stats.n_kmers)
+    json.dump(graph_stats.to_dict(), output)
+    output.write('\n')
@@ -1,7 +1,9 @@
 def subgraph(argv):
     import argparse
-    from .shared import get_shared_argparse
+    from .shared import get_shared_argparse, positive_int
     import cortexpy.constants
+    from cortexpy.graph.parser.prefix_table import MAX_PREFIX_LENGTH
+    from cortexpy.graph.parser.record_cache import RECORD_CACHE_POLICIES
     shared_parser = get_shared_argparse()
     parser = argparse.ArgumentParser(
         'cortexpy subgraph', parents=[shared_parser],
@@ -36,10 +38,30 @@ def subgraph(argv):
     parser.add_argument('--logging-interval', type=int, default=90,
                         help='Logging interval.  [default: %(default)s]')
     parser.add_argument('--cache-size', type=int, default=0, help='Number of kmers to cache')
-    parser.add_argument('--binary-search-cache-size', type=int, default=0,
-                        help='Number of kmers to cache for binary search')
-    parser.add_argument('--slurp', action='store_true',
-                        help='Slurp all cortex graphs before traversal')
+    parser.add_argument('--cache-policy', choices=RECORD_CACHE_POLICIES, default='lru',
+                        help='Eviction policy of the kmer cache.  Ignored with --slurp'
+                             ' [default: %(default)s]')
+    index_group = parser.add_mutually_exclusive_group()
+    index_group.add_argument('--in-memory-index', action='store_true',
+                             help='Load the kmers of each graph into memory for fast binary'
+                                  ' search.  Ignored with --slurp')
+    index_group.add_argument('--prefix-length', type=positive_int, default=None,
+                             help='Restrict each binary search to the kmers that share the'
+                                  ' leading PREFIX_LENGTH bases of the searched kmer, using a'
+                                  ' table of prefixes that is built on the first lookup.'
+                                  '  At most {} bases are used.'
+                                  '  Ignored with --slurp'.format(MAX_PREFIX_LENGTH))
+    parser.add_argument('--int-kmers', action='store_true',
+                        help='Traverse with integer-encoded kmers instead of kmer strings')
+    parser.add_argument('-p', '--processes', type=int, default=1,
+                        help='Number of processes to split the seed kmers between.'
+                             '  Each process memory-maps the graphs'
+                             ' [default: %(default)s]')
+    access_group = parser.add_mutually_exclusive_group()
+    access_group.add_argument('--slurp', action='store_true',
+                              help='Slurp all cortex graphs before traversal')
+    access_group.add_argument('--mmap', action='store_true',
+                              help='Memory-map all cortex graphs for random access')
     args = parser.parse_args(argv)
 
     from cortexpy.logging_config import configure_logging_from_args_and_get_logger
@@ -61,24 +83,32 @@ def subgraph(argv):
             from cortexpy.graph.parser.random_access import SlurpedRandomAccess
             RAClass = SlurpedRandomAccess.from_handle
             logger.info("Slurping cortex graphs")
+        elif args.mmap:
+            from cortexpy.graph.parser.random_access import MmapRandomAccess as RAClass
+            logger.info("Memory-mapping cortex graphs")
         else:
             from cortexpy.graph.parser.random_access import RandomAccess as RAClass
 
-        if len(args.graphs) == 1:
-            ra_parser = RAClass(
-                stack.enter_context(open(args.graphs[0], 'rb')),
-                kmer_cache_size=args.cache_size
-            )
+        ra_kwargs = {'kmer_cache_size': args.cache_size}
+        if not args.slurp:
+            ra_kwargs['cache_policy'] = args.cache_policy
+            if args.in_memory_index:
+                ra_kwargs['load_kmer_uints'] = True
+            ra_kwargs['prefix_length'] = args.prefix_length
+        ra_parsers = [RAClass(stack.enter_context(open(graph_path, 'rb')), **ra_kwargs)
+                      for graph_path in args.graphs]
+        if len(ra_parsers) == 1:
+            ra_parser = ra_parsers[0]
         else:
-            ra_parser = RandomAccessCollection(
-                [RAClass(stack.enter_context(open(graph_path, 'rb')),
-                         kmer_cache_size=args.cache_size)
-                 for graph_path in args.graphs])
+            ra_parser = RandomAccessCollection(ra_parsers)
         engine = Engine(
             ra_parser,
             orientation=EngineTraversalOrientation[args.orientation.name],
             max_nodes=args.max_nodes,
-            logging_interval=args.logging_interval
+            logging_interval=args.logging_interval,
+            int_kmers=args.int_kmers,
+            graph_paths=args.graphs,
+            processes=args.processes,
         )
 
         if args.colors is not None:
@@ -92,4 +122,8 @@ def subgraph(argv):
         else:
             engine.traverse_from_each_kmer_in(args.initial_contig)
 
+        if not args.slurp:
+            for graph_path, graph_parser in zip(args.graphs, ra_parsers):
+                logger.info('Kmer cache of %s: %s', graph_path, graph_parser.record_cache.stats)
+
         dump_colored_de_bruijn_graph_to_cortex(engine.graph, output)
@@ -12,13 +12,17 @@ def traverse(argv):
 
         This tool also allows the creation of a JSON representation of a CORTEX graph that is consistent 
         with seed strings by using the --to-json and --seed-strings arguments.
+        The --to-gfa argument writes the unitig graph as GFA instead.
 
         If a links file is supplied, then branches consistent with the links will be preferred in
         the traversal. 
         """
     )
     parser.add_argument('graph', help="cortex graph. Slurp graph from stdin is '-'.")
-    parser.add_argument('--to-json', action='store_true')
+    output_format = parser.add_mutually_exclusive_group()
+    output_format.add_argument('--to-json', action='store_true')
+    output_format.add_argument('--to-gfa', action='store_true',
+                               help='Write unitig graph as GFA1 to --out')
     parser.add_argument('--seed-strings', nargs='*', default=[],
                         help="Strings with seed kmers from which to start contig traversal. "
                              "Multiple strings can be specified.")
@@ -55,6 +59,25 @@ def traverse(argv):
     else:
         output = open(args.out, 'wt')
 
+    if (args.to_json or args.to_gfa) and not args.seed_strings and args.graph != '-':
+        from cortexpy.graph.columnar_graph import ColumnarGraph
+        from cortexpy.graph.parser.columnar import is_sorted_from_stream_and_header
+        from cortexpy.graph.parser.header import Header
+        with open(args.graph, 'rb') as fh:
+            is_sorted = is_sorted_from_stream_and_header(fh, Header.from_stream(fh))
+            if is_sorted:
+                fh.seek(0)
+                columnar_graph = ColumnarGraph.from_graph_handle(fh)
+                if args.to_gfa:
+                    logger.info('Writing GFA representation of sorted graph to %s', args.out)
+                    Serializer(columnar_graph).to_gfa(output)
+                    return
+                logger.info('Writing JSON representation of sorted graph to %s', args.out)
+                Serializer(columnar_graph).write_json(output)
+                output.write('\n')
+                return
+        logger.info('Graph is not sorted')
+
     logger.info(f'Loading graph: %s', args.graph)
     if args.graph == '-':
         graph = load_cortex_graph(sys.stdin.buffer)
@@ -71,11 +94,19 @@ def traverse(argv):
             .make_graph_nodes_consistent(seed_kmer_strings) \
             .graph
 
+    if args.to_gfa:
+        logger.info('Writing GFA representation of graph to %s', args.out)
+        if consistent_graph:
+            graph = consistent_graph
+        Serializer(graph).to_gfa(output)
+        return
+
     if args.to_json:
-        logger.info('Writing JSON representation of graph to STDOUT')
+        logger.info('Writing JSON representation of graph to %s', args.out)
         if consistent_graph:
             graph = consistent_graph
-        print(Serializer(graph).to_json())
+        Serializer(graph).write_json(output)
+        output.write('\n')
         return
 
     if not consistent_graph:
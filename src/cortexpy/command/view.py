@@ -1,3 +1,6 @@
+FASTA_LINE_LENGTH = 60
+
+
 def traverse_deprecated(*args, **kwargs):
     import warnings
 
@@ -28,10 +31,31 @@ def view_graph(argv):
 
     parser = argparse.ArgumentParser(prog='cortexpy view graph')
     parser.add_argument('graph', help="cortex graph")
-    parser.add_argument('--kmers', action='store_true')
+    output_format = parser.add_mutually_exclusive_group()
+    output_format.add_argument('--kmers', action='store_true')
+    output_format.add_argument('--to-gfa', action='store_true',
+                               help='Write unitig graph as GFA1')
+    parser.add_argument('-p', '--processes', type=int, default=1,
+                        help='Number of processes to split the graph between'
+                             ' [default: %(default)s]')
     args = parser.parse_args(argv)
 
     import sys
+    if args.to_gfa:
+        from cortexpy.graph.serializer.serializer import Serializer, load_graph_to_serialize
+        with open(args.graph, 'rb') as fh:
+            Serializer(load_graph_to_serialize(fh)).to_gfa(sys.stdout)
+        return
+    if args.processes > 1:
+        from cortexpy.graph.parser.parallel import parallel_map_records
+        if args.kmers:
+            blocks = parallel_map_records(args.graph, kmer_strings_from_block, args.processes)
+            write_kmer_string_blocks(blocks, sys.stdout)
+        else:
+            for block in parallel_map_records(args.graph, cortex_jdk_print_string_from_block,
+                                              args.processes):
+                sys.stdout.write(block)
+        return
     with open(args.graph, 'rb') as fh:
         if args.kmers:
             write_kmer_strings(fh, sys.stdout)
@@ -44,37 +68,91 @@ def view_contig(argv):
     parser = argparse.ArgumentParser(prog='cortexpy view contig')
     parser.add_argument('graph', help="cortex graph")
     parser.add_argument('contig', help='contig to explore inside graph')
-    parser.add_argument('--to-json', action='store_true')
+    output_format = parser.add_mutually_exclusive_group()
+    output_format.add_argument('--to-json', action='store_true')
+    output_format.add_argument('--to-gfa', action='store_true',
+                               help='Write unitig graph of contig as GFA1')
     args = parser.parse_args(argv)
 
+    import sys
     from cortexpy.graph.contig_retriever import ContigRetriever
     from cortexpy.graph.serializer.serializer import Serializer
 
     contig_retriever = ContigRetriever(open(args.graph, 'rb'))
     if args.to_json:
-        serializer = Serializer(contig_retriever.get_kmer_graph(args.contig))
-        print(serializer.to_json())
+        Serializer(contig_retriever.get_kmer_graph(args.contig)).write_json(sys.stdout)
+        sys.stdout.write('\n')
+    elif args.to_gfa:
+        Serializer(contig_retriever.get_kmer_graph(args.contig)).to_gfa(sys.stdout)
     else:
         print_contig(contig_retriever, args.contig)
 
 
 def write_kmer_strings(input, output):
-    from Bio import SeqIO
-    from Bio.Seq import Seq
-    from Bio.SeqRecord import SeqRecord
+    """Write the kmers of a graph stream as FASTA records named by their index in the graph"""
+    from cortexpy.graph.parser.header import Header
+    from cortexpy.graph.parser.streaming import record_block_generator_from_stream_and_header
+
+    header = Header.from_stream(input)
+    write_kmer_string_blocks(
+        (kmer_strings_from_block(header, block) for block in
+         record_block_generator_from_stream_and_header(input, header)),
+        output
+    )
+
+
+def write_kmer_string_blocks(kmer_string_blocks, output):
+    """Write lists of kmer strings as FASTA, one write per list
 
-    from cortexpy.graph.parser.streaming import kmer_string_generator_from_stream
+    The output is identical to that of Biopython's FASTA writer with sequences wrapped at
+    FASTA_LINE_LENGTH letters."""
+    kmer_idx = 0
+    for kmer_strings in kmer_string_blocks:
+        output.write(fasta_string_from_kmer_strings(kmer_strings, kmer_idx))
+        kmer_idx += len(kmer_strings)
 
-    seqs = (SeqRecord(Seq(s), id=str(i), description="") for i, s in
-            enumerate(kmer_string_generator_from_stream(input)))
-    SeqIO.write(seqs, output, "fasta")
 
+def fasta_string_from_kmer_strings(kmer_strings, first_kmer_idx=0):
+    if kmer_strings and len(kmer_strings[0]) > FASTA_LINE_LENGTH:
+        kmer_strings = ('\n'.join(k[start:start + FASTA_LINE_LENGTH]
+                                  for start in range(0, len(k), FASTA_LINE_LENGTH))
+                        for k in kmer_strings)
+    return ''.join(['>{}\n{}\n'.format(kmer_idx, kmer_string) for kmer_idx, kmer_string in
+                    enumerate(kmer_strings, first_kmer_idx)])
 
-def print_cortex_file(graph_handle):
-    from cortexpy.graph.parser.streaming import kmer_generator_from_stream
 
-    for kmer in kmer_generator_from_stream(graph_handle):
-        print(kmer_to_cortex_jdk_print_string(kmer))
+def kmer_strings_from_block(header, block):
+    from cortexpy.graph.parser.columnar import KmerColumns
+
+    return KmerColumns.from_buffer(block, header).kmer_strings(header.kmer_size)
+
+
+def cortex_jdk_print_string_from_block(header, block):
+    """Return the print strings of a block of records, one line per record"""
+    from cortexpy.edge_set import EDGE_SET_STR_BY_EDGE_BYTE
+    from cortexpy.graph.parser.columnar import KmerColumns
+
+    columns = KmerColumns.from_buffer(block, header)
+    coverage_strings = (' ' + ' '.join(map(str, coverage))
+                        for coverage in columns.coverage.tolist())
+    edge_set_strings = (' ' + ' '.join(map(EDGE_SET_STR_BY_EDGE_BYTE.__getitem__, edges))
+                        for edges in columns.edges.tolist())
+    return ''.join(['{}{}{}\n'.format(*line) for line in
+                    zip(columns.kmer_strings(header.kmer_size), coverage_strings,
+                        edge_set_strings)])
+
+
+def print_cortex_file(graph_handle, output=None):
+    """Write the kmers of a graph stream in CortexJDK print format, one write per block"""
+    import sys
+    from cortexpy.graph.parser.header import Header
+    from cortexpy.graph.parser.streaming import record_block_generator_from_stream_and_header
+
+    if output is None:
+        output = sys.stdout
+    header = Header.from_stream(graph_handle)
+    for block in record_block_generator_from_stream_and_header(graph_handle, header):
+        output.write(cortex_jdk_print_string_from_block(header, block))
 
 
 def print_contig(contig_retriever, contig):
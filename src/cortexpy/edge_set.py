@@ -12,6 +12,29 @@ EDGE_SET_LETTER_LOOKUP = {letter: idx for idx, letter in enumerate(EDGE_SET_DATA
 
 EDGE_IDX_TO_LETTER = ['A', 'C', 'G', 'T', 'T', 'G', 'C', 'A']
 
+# Number of incoming and outgoing edges of each possible raw edge set byte
+NUM_INCOMING_BY_EDGE_BYTE = np.array([bin(b >> 4).count('1') for b in range(256)], dtype=np.uint8)
+NUM_OUTGOING_BY_EDGE_BYTE = np.array([bin(b & 0xF).count('1') for b in range(256)],
+                                     dtype=np.uint8)
+
+# Lookup tables of raw edge set bytes, used by ByteEdgeSet
+EDGE_SET_LETTER_BITS = {letter: 1 << (7 - idx) for letter, idx in EDGE_SET_LETTER_LOOKUP.items()}
+EDGE_SET_DATA_BY_EDGE_BYTE = [tuple((b >> (7 - idx)) & 1 for idx in range(EDGE_SET_LENGTH))
+                              for b in range(256)]
+INCOMING_EDGE_IDXS_BY_EDGE_BYTE = [
+    tuple(idx for idx in range(HALF_EDGE_SET_LENGTH) if (b >> (7 - idx)) & 1) for b in range(256)
+]
+OUTGOING_EDGE_IDXS_BY_EDGE_BYTE = [
+    tuple(idx for idx in range(HALF_EDGE_SET_LENGTH) if (b >> (3 - idx)) & 1) for b in range(256)
+]
+EDGE_SET_STR_BY_EDGE_BYTE = [
+    ''.join(letter if b & EDGE_SET_LETTER_BITS[letter] else '.'
+            for letter in EDGE_SET_REPR_LETTER_ORDER)
+    for b in range(256)
+]
+_NUM_INCOMING_BY_EDGE_BYTE = NUM_INCOMING_BY_EDGE_BYTE.tolist()
+_NUM_OUTGOING_BY_EDGE_BYTE = NUM_OUTGOING_BY_EDGE_BYTE.tolist()
+
 
 @attr.s(slots=True, eq=False)
 class EdgeSet:
@@ -86,6 +109,38 @@ class EdgeSet:
             is_lexlo = bool(kmer_string == lexlo(kmer_string))
         return self._get_kmer_strings(kmer_string[1:], False, is_lexlo)
 
+    def _get_kmer_ints(self, kmer_int, codec, is_incoming, is_lexlo):
+        if is_incoming:
+            if is_lexlo:
+                edges = self.incoming
+            else:
+                edges = self.outgoing
+            for edge_idx, edge in enumerate(edges):
+                if edge:
+                    yield codec.shift_in_left(kmer_int, edge_idx)
+        else:
+            if is_lexlo:
+                edges = self.outgoing
+            else:
+                edges = self.incoming
+            for edge_idx, edge in enumerate(edges):
+                if edge:
+                    yield codec.shift_in_right(kmer_int, 3 - edge_idx)
+
+    def get_incoming_kmer_ints(self, kmer_int, codec, is_lexlo=None):
+        """Integer-encoded version of :py:meth:`get_incoming_kmer_strings`
+
+        codec is the :py:class:`~cortexpy.int_kmer.IntKmerCodec` of kmer_int."""
+        if is_lexlo is None:
+            is_lexlo = codec.is_lexlo(kmer_int)
+        return self._get_kmer_ints(kmer_int, codec, True, is_lexlo)
+
+    def get_outgoing_kmer_ints(self, kmer_int, codec, is_lexlo=None):
+        """Integer-encoded version of :py:meth:`get_outgoing_kmer_strings`"""
+        if is_lexlo is None:
+            is_lexlo = codec.is_lexlo(kmer_int)
+        return self._get_kmer_ints(kmer_int, codec, False, is_lexlo)
+
     def get_incoming_kmers(self, kmer_string):
         lexlo_string = lexlo(kmer_string)
         assert lexlo_string == kmer_string
@@ -113,14 +168,103 @@ class EdgeSet:
     def oriented(self, orientation):
         return OrientedEdgeSet(self, orientation)
 
-    def dump(self, buffer):
+    def to_byte(self):
+        """Return the edge set as a Cortex edge set byte"""
         binary = np.packbits(self.data)
         assert 1 == len(binary)
-        buffer.write(binary[0])
+        return int(binary[0])
+
+    def dump(self, buffer):
+        buffer.write(bytes((self.to_byte(),)))
+
+
+class ByteEdgeSet(EdgeSet):
+    """An edge set that stores the raw edge set byte of a Cortex graph record
+
+    Bit 7 - i of the byte is element i of the edge set array. Degrees, neighbors and string
+    representations are looked up in tables indexed by the byte, and :py:meth:`dump` writes the
+    byte as is. The byte-backed edge set compares equal to an array-backed edge set with the same
+    edges.
+    """
+    __slots__ = ('byte',)
+
+    def __init__(self, byte=0):
+        self.byte = byte
+
+    def __repr__(self):
+        return 'ByteEdgeSet(byte={})'.format(self.byte)
+
+    @property
+    def data(self):
+        return EDGE_SET_DATA_BY_EDGE_BYTE[self.byte]
+
+    @data.setter
+    def data(self, value):
+        assert len(value) == EDGE_SET_LENGTH
+        self.byte = int(np.packbits(np.asarray(value, dtype=np.uint8))[0])
+
+    def is_edge(self, letter):
+        return bool(self.byte & EDGE_SET_LETTER_BITS[letter])
+
+    def add_edge(self, letter):
+        self.byte |= EDGE_SET_LETTER_BITS[letter]
+
+    def remove_edge(self, letter):
+        self.byte &= ~EDGE_SET_LETTER_BITS[letter]
+
+    def __getitem__(self, item):
+        return EDGE_SET_DATA_BY_EDGE_BYTE[self.byte][item]
+
+    def __eq__(self, other):
+        if isinstance(other, ByteEdgeSet):
+            return self.byte == other.byte
+        return super().__eq__(other)
+
+    @property
+    def outgoing(self):
+        return EDGE_SET_DATA_BY_EDGE_BYTE[self.byte][HALF_EDGE_SET_LENGTH:]
+
+    @property
+    def incoming(self):
+        return EDGE_SET_DATA_BY_EDGE_BYTE[self.byte][:HALF_EDGE_SET_LENGTH]
+
+    def num_outgoing(self):
+        return _NUM_OUTGOING_BY_EDGE_BYTE[self.byte]
+
+    def num_incoming(self):
+        return _NUM_INCOMING_BY_EDGE_BYTE[self.byte]
+
+    def _get_edge_idxs(self, is_incoming, is_lexlo):
+        if is_incoming == is_lexlo:
+            return INCOMING_EDGE_IDXS_BY_EDGE_BYTE[self.byte]
+        return OUTGOING_EDGE_IDXS_BY_EDGE_BYTE[self.byte]
+
+    def _get_kmer_strings(self, sub_kmer_string, is_incoming, is_lexlo):
+        edge_idxs = self._get_edge_idxs(is_incoming, is_lexlo)
+        if is_incoming:
+            return (EDGE_IDX_TO_LETTER[edge_idx] + sub_kmer_string for edge_idx in edge_idxs)
+        return (sub_kmer_string + EDGE_IDX_TO_LETTER[edge_idx + 4] for edge_idx in edge_idxs)
+
+    def _get_kmer_ints(self, kmer_int, codec, is_incoming, is_lexlo):
+        edge_idxs = self._get_edge_idxs(is_incoming, is_lexlo)
+        if is_incoming:
+            return (codec.shift_in_left(kmer_int, edge_idx) for edge_idx in edge_idxs)
+        return (codec.shift_in_right(kmer_int, 3 - edge_idx) for edge_idx in edge_idxs)
+
+    def to_str(self, *, as_revcomp=False):
+        if as_revcomp:
+            return revcomp(EDGE_SET_STR_BY_EDGE_BYTE[self.byte])
+        return EDGE_SET_STR_BY_EDGE_BYTE[self.byte]
+
+    def to_byte(self):
+        return self.byte
+
+    def dump(self, buffer):
+        buffer.write(bytes((self.byte,)))
 
 
 def empty():
-    return EdgeSet(np.zeros(EDGE_SET_LENGTH, dtype=np.uint8))
+    return ByteEdgeSet(0)
 
 
 @attr.s(slots=True)
@@ -130,6 +274,7 @@ class OrientedEdgeSet(object):
     neighbor_kmers = attr.ib(init=False)
     neighbor = attr.ib(init=False)
     neighbor_kmer_strings = attr.ib(init=False)
+    neighbor_kmer_ints = attr.ib(init=False)
     _num_neighbor = attr.ib(init=False)
 
     def __attrs_post_init__(self):
@@ -138,11 +283,13 @@ class OrientedEdgeSet(object):
             self.neighbor = self.edge_set.outgoing
             self._num_neighbor = self.edge_set.num_outgoing
             self.neighbor_kmer_strings = self.edge_set.get_outgoing_kmer_strings
+            self.neighbor_kmer_ints = self.edge_set.get_outgoing_kmer_ints
         else:
             self.neighbor_kmers = self.edge_set.get_incoming_kmers
             self.neighbor = self.edge_set.incoming
             self._num_neighbor = self.edge_set.num_incoming
             self.neighbor_kmer_strings = self.edge_set.get_incoming_kmer_strings
+            self.neighbor_kmer_ints = self.edge_set.get_incoming_kmer_ints
 
     def other_orientation(self):
         return OrientedEdgeSet(self.edge_set, EdgeTraversalOrientation.other(self.orientation))
@@ -153,3 +300,9 @@ class OrientedEdgeSet(object):
             return self.other_orientation().num_neighbor(lexlo(kmer_string))
         else:
             return self._num_neighbor()
+
+    def num_neighbor_for_int(self, kmer_int, codec):
+        """Integer-encoded version of :py:meth:`num_neighbor`"""
+        if codec.is_lexlo(kmer_int):
+            return self._num_neighbor()
+        return self.other_orientation()._num_neighbor()
@@ -0,0 +1,172 @@
+"""Coverage cleaning of Cortex graphs
+====================================
+
+This module contains functions for removing low coverage kmers and unitigs from a sorted Cortex
+graph file. The graph is memory-mapped as a
+:py:class:`~cortexpy.graph.columnar_graph.ColumnarGraph`, so the records are never loaded as kmer
+objects. Coverage is summed over all colors.
+
+Kmers with a coverage below the kmer threshold are removed first. Unitigs are then built from the
+remaining kmers with :py:class:`~cortexpy.graph.columnar_unitig.UnitigRecords` and unitigs with a
+mean kmer coverage below the unitig threshold are removed. The cleaned graph is copied block by
+block from a boolean removal mask, and edges to removed kmers are cleared on the way.
+Thresholds that are not given are picked from the coverage histogram of the kmers or unitigs.
+The thresholds are recorded in the color information blocks of the cleaned graph.
+"""
+import logging
+
+import attr
+import numpy as np
+
+from cortexpy.graph.columnar_graph import ColumnarGraph
+from cortexpy.graph.columnar_unitig import UnitigRecords
+from cortexpy.graph.parser.columnar import record_dtype
+from cortexpy.graph.parser.constants import RECORD_BLOCK_SIZE
+from cortexpy.graph.parser.kmer_ext import removed_neighbor_edges
+from cortexpy.graph.serializer.kmer import ColorInformationBlock
+from cortexpy.graph.statistics import DEFAULT_MAX_COVERAGE
+
+logger = logging.getLogger(__name__)
+
+
+@attr.s(slots=True)
+class CleaningReport(object):
+    """Thresholds and number of removed kmers and unitigs of a cleaning run
+
+    A threshold of None means that the corresponding cleaning step was not run."""
+    kmer_threshold = attr.ib(None)
+    unitig_threshold = attr.ib(None)
+    n_kmers_removed = attr.ib(0)
+    n_unitigs_removed = attr.ib(0)
+    n_unitig_kmers_removed = attr.ib(0)
+
+
+def coverage_histogram(coverage, max_coverage=DEFAULT_MAX_COVERAGE):
+    """Return the histogram of an array of coverages
+
+    Coverages of max_coverage or more are counted in the last bin."""
+    coverage = np.minimum(np.asarray(coverage), max_coverage).astype(np.int64)
+    return np.bincount(coverage, minlength=max_coverage + 1)
+
+
+def pick_coverage_threshold(histogram):
+    """Return the coverage of the first minimum of a coverage histogram
+
+    Sequencing errors make up a peak of low coverages at the start of the histogram that decays
+    into the first minimum. Coverages below the returned threshold are considered errors. A
+    histogram without a minimum has a threshold of 1, so only kmers without coverage are removed.
+
+    >>> pick_coverage_threshold([0, 10, 4, 2, 5, 8, 3])
+    3
+    """
+    for coverage in range(1, len(histogram) - 1):
+        if histogram[coverage + 1] > histogram[coverage]:
+            return coverage
+    return 1
+
+
+def find_unitigs(graph, removed):
+    """Return the unitig id of each record and the mean kmer coverage of each unitig
+
+    Unitig ids are indices into the array of unitig coverages. Records that are set in the
+    boolean array removed are not part of any unitig and have a unitig id of -1."""
+    records = UnitigRecords.from_columnar_graph(graph, removed)
+    first_records = records.nodes[records.offsets[:-1]] >> 1
+    is_kept_unitig = ~removed[first_records]
+    if len(records) == 0:
+        unitig_coverage = np.zeros(0, dtype=np.float64)
+    else:
+        unitig_coverage = (np.add.reduceat(graph.total_coverage[records.nodes >> 1],
+                                           records.offsets[:-1])
+                           / np.diff(records.offsets))
+    unitig_ids = np.full(len(records), -1, dtype=np.int64)
+    unitig_ids[is_kept_unitig] = np.arange(np.count_nonzero(is_kept_unitig))
+    return unitig_ids[records.unitig_of_record], unitig_coverage[is_kept_unitig]
+
+
+def cleaned_color_info_blocks(header, report):
+    """Return the color information blocks of a graph after cleaning it as in report"""
+    blocks = []
+    for block in header.color_info_blocks:
+        block = ColorInformationBlock.from_header_block(block)
+        if report.kmer_threshold is not None:
+            block = attr.evolve(block, are_low_cov_kmers_removed=True,
+                                cov_threshold_on_kmers=report.kmer_threshold)
+        if report.unitig_threshold is not None:
+            block = attr.evolve(block, are_low_cov_unitigs_removed=True,
+                                cov_threshold_on_unitigs=report.unitig_threshold)
+        blocks.append(block)
+    return blocks
+
+
+def find_records_to_remove(graph, *, remove_kmers=True, kmer_threshold=None,
+                           remove_unitigs=True, unitig_threshold=None,
+                           max_coverage=DEFAULT_MAX_COVERAGE):
+    """Return a boolean array of the records of graph to remove and a :py:class:`CleaningReport`
+
+    Thresholds that are None are picked with :py:func:`pick_coverage_threshold`."""
+    report = CleaningReport()
+    removed = np.zeros(len(graph), dtype=bool)
+    if remove_kmers:
+        if kmer_threshold is None:
+            kmer_threshold = pick_coverage_threshold(
+                coverage_histogram(graph.total_coverage, max_coverage)
+            )
+        removed = graph.total_coverage < kmer_threshold
+        report.kmer_threshold = kmer_threshold
+        report.n_kmers_removed = int(np.count_nonzero(removed))
+        logger.info('Removing %s kmers with coverage less than %s', report.n_kmers_removed,
+                    kmer_threshold)
+    if remove_unitigs:
+        unitig_ids, unitig_coverage = find_unitigs(graph, removed)
+        if unitig_threshold is None:
+            unitig_threshold = pick_coverage_threshold(
+                coverage_histogram(np.floor(unitig_coverage), max_coverage)
+            )
+        is_low_coverage_unitig = unitig_coverage < unitig_threshold
+        is_low_coverage = np.zeros(len(graph), dtype=bool)
+        in_unitig = unitig_ids != -1
+        is_low_coverage[in_unitig] = is_low_coverage_unitig[unitig_ids[in_unitig]]
+        report.unitig_threshold = unitig_threshold
+        report.n_unitigs_removed = int(np.count_nonzero(is_low_coverage_unitig))
+        report.n_unitig_kmers_removed = int(np.count_nonzero(is_low_coverage))
+        removed = removed | is_low_coverage
+        logger.info('Removing %s of %s unitigs with mean coverage less than %s',
+                    report.n_unitigs_removed, len(unitig_coverage), unitig_threshold)
+    return removed, report
+
+
+def copy_cleaned_records(graph, removed, output, block_size=RECORD_BLOCK_SIZE):
+    """Copy the records of graph that are not set in the boolean array removed to output
+
+    Edges to removed records are cleared. Records are copied in blocks of at most block_size
+    bytes, one write per block."""
+    removed_edges = removed_neighbor_edges(graph.header.kmer_size, graph.columns.kmers,
+                                           graph.union_edges, removed)
+    records = np.frombuffer(graph.ra_parser.body, dtype=record_dtype(graph.header),
+                            count=len(graph))
+    records_per_block = max(1, block_size // graph.header.record_size)
+    for start in range(0, len(graph), records_per_block):
+        stop = start + records_per_block
+        is_kept = ~removed[start:stop]
+        block = records[start:stop][is_kept]
+        block['edges'] &= ~removed_edges[start:stop][is_kept, np.newaxis]
+        output.write(block.tobytes())
+
+
+def clean_graph_path(graph_path, output, block_size=RECORD_BLOCK_SIZE, **kwargs):
+    """Remove low coverage kmers and unitigs from a sorted graph and write it to output
+
+    kwargs are passed on to :py:func:`find_records_to_remove`.
+    Returns a :py:class:`CleaningReport`. Raises ValueError if the kmers of the graph are not
+    unique and in ascending order."""
+    with open(graph_path, 'rb') as graph_handle:
+        graph = ColumnarGraph.from_graph_handle(graph_handle)
+        if not graph.is_sorted():
+            raise ValueError('Graph {} is not sorted'.format(graph_path))
+        removed, report = find_records_to_remove(graph, **kwargs)
+        header = attr.evolve(graph.header,
+                             color_info_blocks=cleaned_color_info_blocks(graph.header, report))
+        header.dump(output)
+        copy_cleaned_records(graph, removed, output, block_size=block_size)
+    return report
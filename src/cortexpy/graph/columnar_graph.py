@@ -0,0 +1,104 @@
+"""Columnar Cortex graphs
+========================
+
+This module contains a read-only view of a sorted Cortex graph whose records are held as
+:py:class:`~cortexpy.graph.parser.columnar.KmerColumns` of a memory-mapped graph file. Kmers are
+addressed by their record index, so per-kmer state such as a removal mask or a visited bitmap
+is a NumPy array with one entry per record instead of a dict of kmer objects. Neighbors are
+computed on integer-encoded kmers (see :py:mod:`cortexpy.int_kmer`) and located with
+:py:func:`numpy.searchsorted`.
+"""
+import attr
+import numpy as np
+
+from cortexpy.edge_set import ByteEdgeSet
+from cortexpy.graph.parser.columnar import KmerColumns, kmers_are_sorted
+from cortexpy.graph.parser.random_access import MmapRandomAccess
+from cortexpy.int_kmer import get_int_kmer_codec
+
+
+@attr.s(slots=True)
+class ColumnarGraph(object):
+    """A sorted Cortex graph with records stored as columns
+
+    union_edges is the bitwise or of the edge bytes of all colors of each record and
+    total_coverage is the coverage of each record summed over all colors. graph holds the graph
+    attributes of the header in the same keys as a
+    :py:class:`~cortexpy.graph.cortex.CortexDiGraph`."""
+    ra_parser = attr.ib()
+    columns = attr.ib()
+    kmer_index = attr.ib()
+    codec = attr.ib(init=False)
+    union_edges = attr.ib(init=False)
+    total_coverage = attr.ib(init=False)
+    graph = attr.ib(init=False)
+
+    def __attrs_post_init__(self):
+        self.codec = get_int_kmer_codec(self.header.kmer_size)
+        self.graph = {'sample_names': self.header.sample_names,
+                      'kmer_size': self.header.kmer_size,
+                      'num_colors': self.header.num_colors,
+                      'colors': self.header.colors}
+        if self.header.num_colors == 0:
+            self.union_edges = np.zeros(len(self.columns), dtype=np.uint8)
+        else:
+            self.union_edges = np.bitwise_or.reduce(self.columns.edges, axis=1)
+        self.total_coverage = self.columns.coverage.sum(axis=1, dtype=np.uint64)
+
+    @classmethod
+    def from_graph_handle(cls, graph_handle):
+        """Map the graph of a seekable graph handle into memory"""
+        ra_parser = MmapRandomAccess(graph_handle, load_kmer_uints=True)
+        columns = KmerColumns.from_buffer(ra_parser.body, ra_parser.header,
+                                          n_records=ra_parser.n_records)
+        return cls(ra_parser=ra_parser, columns=columns,
+                   kmer_index=ra_parser.graph_kmer_sequence)
+
+    @property
+    def header(self):
+        return self.ra_parser.header
+
+    def __len__(self):
+        return len(self.columns)
+
+    def is_sorted(self):
+        """Return True if the kmers of the graph are unique and in ascending order"""
+        return kmers_are_sorted(self.columns.kmers)
+
+    def kmer_int(self, index):
+        """Return the lexlo kmer int of the record at index"""
+        kmer_int = 0
+        for word in self.columns.kmers[index].tolist():
+            kmer_int = (kmer_int << 64) | word
+        return kmer_int
+
+    def index_of_kmer_int(self, kmer_int):
+        """Return the record index of a kmer int in either orientation, or -1 if it is missing"""
+        uints = self.codec.to_uints(self.codec.lexlo(kmer_int))
+        index = self.kmer_index.index_uint_vector(uints)
+        if index < len(self) and np.array_equal(self.kmer_index.columns[:, index], uints):
+            return index
+        return -1
+
+    def neighbors(self, kmer_int, index, outgoing, removed=None, color=None):
+        """Return the (kmer_int, index) tuples of the neighbors of a kmer in color, or in any
+        color if color is None
+
+        kmer_int is the kmer of the record at index in the orientation to walk from. Neighbors
+        that are missing from the graph or that are set in the boolean array removed are left
+        out."""
+        if color is None:
+            edge_set = ByteEdgeSet(int(self.union_edges[index]))
+        else:
+            edge_set = ByteEdgeSet(int(self.columns.edges[index, color]))
+        is_lexlo = self.codec.is_lexlo(kmer_int)
+        if outgoing:
+            neighbor_ints = edge_set.get_outgoing_kmer_ints(kmer_int, self.codec, is_lexlo)
+        else:
+            neighbor_ints = edge_set.get_incoming_kmer_ints(kmer_int, self.codec, is_lexlo)
+        neighbors = []
+        for neighbor_int in neighbor_ints:
+            neighbor_index = self.index_of_kmer_int(neighbor_int)
+            if neighbor_index != -1 and (removed is None or not removed[neighbor_index]):
+                neighbors.append((neighbor_int, neighbor_index))
+        return neighbors
@@ -0,0 +1,261 @@
+"""Unitigs of columnar Cortex graphs
+===================================
+
+This module contains a unitig finder that works on the kmer, coverage and edge columns of a
+:py:class:`~cortexpy.graph.columnar_graph.ColumnarGraph` instead of a networkx kmer graph.
+
+A kmer of the graph is an oriented node: 2 * record index for its lexlo kmer and
+2 * record index + 1 for the reverse complement. The next node of each oriented node in its
+unitig is computed for all records at once, and the maximal unitigs are then walked in linear time
+with a visited bitmap (see :py:func:`~cortexpy.graph.parser.kmer_ext.walk_unitigs`). Unitigs are
+defined as in :py:meth:`cortexpy.graph.serializer.unitig.UnitigFinder.find_unitig_from`: two
+kmers are adjacent in a unitig if each is the only neighbor of the other in that direction, their
+edges are in every color in which they have coverage, and they have coverage in the same colors.
+
+Unitigs are stored in :py:class:`UnitigRecords` as arrays of oriented nodes, so a unitig sequence
+or coverage array is only built when it is asked for.
+"""
+import attr
+import numpy as np
+
+from cortexpy.graph.parser.kmer_ext import (
+    removed_neighbor_edges,
+    unitig_neighbor_nodes,
+    walk_unitigs,
+)
+
+LETTERS = np.frombuffer(b'ACGT', dtype=np.uint8)
+
+
+def flip_nodes(nodes):
+    """Return the reverse complements of an array of oriented nodes, keeping -1 for no node"""
+    return np.where(nodes == -1, -1, nodes ^ 1)
+
+
+def next_unitig_nodes(graph, removed=None):
+    """Return the node that follows each oriented node of a
+    :py:class:`~cortexpy.graph.columnar_graph.ColumnarGraph` in its unitig, or -1
+
+    Records that are set in the boolean array removed are treated as missing: their nodes have
+    no next node and edges to them are ignored."""
+    n_nodes = 2 * len(graph)
+    edges = graph.columns.edges
+    union_edges = graph.union_edges
+    if removed is not None:
+        removed_edges = removed_neighbor_edges(graph.header.kmer_size, graph.columns.kmers,
+                                               union_edges, removed)
+        edges = edges & ~removed_edges[:, np.newaxis]
+        union_edges = union_edges & ~removed_edges
+    neighbors = unitig_neighbor_nodes(graph.header.kmer_size, graph.columns.kmers, union_edges)
+    if removed is not None:
+        neighbors[removed] = -1
+    presence = graph.columns.coverage > 0
+    union_edges = union_edges[:, np.newaxis]
+    for column, nibble_mask in ((0, 0x0F), (1, 0xF0)):
+        has_same_edge_in_all_colors = np.all(
+            np.where(presence, (edges & nibble_mask) == (union_edges & nibble_mask),
+                     (edges & nibble_mask) == 0),
+            axis=1
+        )
+        neighbors[~has_same_edge_in_all_colors, column] = -1
+    if len(graph) == 0:
+        color_class = np.zeros(0, dtype=np.int64)
+    else:
+        color_class = np.unique(presence, axis=0, return_inverse=True)[1].reshape(-1)
+
+    successors = np.empty(n_nodes, dtype=np.int64)
+    predecessors = np.empty(n_nodes, dtype=np.int64)
+    successors[0::2] = neighbors[:, 0]
+    successors[1::2] = flip_nodes(neighbors[:, 1])
+    predecessors[0::2] = neighbors[:, 1]
+    predecessors[1::2] = flip_nodes(neighbors[:, 0])
+
+    nodes = np.arange(n_nodes, dtype=np.int64)
+    has_successor = successors != -1
+    successor_or_self = np.where(has_successor, successors, nodes)
+    is_next = (has_successor
+               & (predecessors[successor_or_self] == nodes)
+               & (color_class[successor_or_self >> 1] == color_class[nodes >> 1])
+               & (successor_or_self >> 1 != nodes >> 1))
+    return np.where(is_next, successors, -1)
+
+
+@attr.s(slots=True, frozen=True)
+class UnitigLink(object):
+    """An edge in color from the last kmer of unitig source to the first kmer of unitig target
+
+    A unitig that is reversed is linked in its reverse complement orientation."""
+    source = attr.ib()
+    source_is_reversed = attr.ib()
+    target = attr.ib()
+    target_is_reversed = attr.ib()
+    color = attr.ib()
+
+    def reverse(self):
+        """Return the same link seen from the reverse complement of its target"""
+        return UnitigLink(self.target, not self.target_is_reversed,
+                          self.source, not self.source_is_reversed, self.color)
+
+
+@attr.s(slots=True)
+class UnitigRecords(object):
+    """The maximal unitigs of a :py:class:`~cortexpy.graph.columnar_graph.ColumnarGraph`
+
+    nodes holds the oriented nodes of all unitigs in walk order and unitig u consists of
+    nodes[offsets[u]:offsets[u + 1]]. is_cycle is a boolean array of the unitigs whose last kmer
+    links back to their first kmer."""
+    graph = attr.ib()
+    nodes = attr.ib()
+    offsets = attr.ib()
+    is_cycle = attr.ib()
+    _unitig_of_record = attr.ib(None)
+
+    @classmethod
+    def from_columnar_graph(cls, graph, removed=None):
+        """Find the unitigs of graph
+
+        Records that are set in the boolean array removed are treated as missing when kmers are
+        joined into unitigs, so each of them is a single-kmer unitig."""
+        nodes, offsets, is_cycle = walk_unitigs(next_unitig_nodes(graph, removed))
+        return cls(graph, nodes, offsets, is_cycle)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @property
+    def unitig_of_record(self):
+        """The unitig of each record of the graph"""
+        if self._unitig_of_record is None:
+            unitig_of_record = np.empty(len(self.graph), dtype=np.int64)
+            unitig_of_record[self.nodes >> 1] = np.repeat(np.arange(len(self)),
+                                                          np.diff(self.offsets))
+            self._unitig_of_record = unitig_of_record
+        return self._unitig_of_record
+
+    def oriented_nodes(self, unitig, is_reversed=False):
+        nodes = self.nodes[self.offsets[unitig]:self.offsets[unitig + 1]]
+        if is_reversed:
+            return nodes[::-1] ^ 1
+        return nodes
+
+    def kmer_int(self, node):
+        """Return the kmer int of an oriented node"""
+        kmer_int = self.graph.kmer_int(node >> 1)
+        if node & 1:
+            return self.graph.codec.revcomp(kmer_int)
+        return kmer_int
+
+    def kmer_string(self, node):
+        return self.graph.codec.decode(self.kmer_int(node))
+
+    def has_incoming_edges(self, node):
+        """Return True if an oriented node has incoming edges in any color"""
+        union_edges = int(self.graph.union_edges[node >> 1])
+        if node & 1:
+            return union_edges & 0x0F != 0
+        return union_edges >> 4 != 0
+
+    def sequence(self, unitig, is_reversed=False):
+        nodes = self.oriented_nodes(unitig, is_reversed)
+        suffix = LETTERS[self._last_letters(nodes[1:])].tobytes().decode()
+        return self.kmer_string(nodes[0]) + suffix
+
+    def coverage(self, unitig, is_reversed=False):
+        """Return the coverage of the kmers of a unitig as an (n_kmers, num_colors) array"""
+        return self.graph.columns.coverage[self.oriented_nodes(unitig, is_reversed) >> 1]
+
+    def _last_letters(self, nodes):
+        kmers = self.graph.columns.kmers[nodes >> 1]
+        first_letter_pos = 2 * (self.graph.header.kmer_size - 1)
+        first_letters = (kmers[:, kmers.shape[1] - 1 - first_letter_pos // 64]
+                         >> np.uint64(first_letter_pos % 64)) & np.uint64(3)
+        last_letters = kmers[:, -1] & np.uint64(3)
+        return np.where(nodes & 1, np.uint64(3) - first_letters, last_letters).astype(np.uint8)
+
+    def links_from(self, unitig, is_reversed=False):
+        """Generate the :py:class:`UnitigLink` objects that leave the last kmer of a unitig
+
+        Links are generated in color order."""
+        graph = self.graph
+        last_node = self.oriented_nodes(unitig, is_reversed)[-1]
+        last_kmer_int = self.kmer_int(last_node)
+        for color in range(graph.header.num_colors):
+            for kmer_int, index in graph.neighbors(last_kmer_int, last_node >> 1, True,
+                                                   color=color):
+                node = 2 * index + (0 if graph.codec.is_lexlo(kmer_int) else 1)
+                target = int(self.unitig_of_record[index])
+                if self.oriented_nodes(target)[0] == node:
+                    yield UnitigLink(unitig, is_reversed, target, False, color)
+                elif self.oriented_nodes(target)[-1] == node ^ 1:
+                    yield UnitigLink(unitig, is_reversed, target, True, color)
+
+    def canonical_links_from(self, unitig):
+        """Generate the links of a unitig that are in their canonical orientation
+
+        A link is canonical if it sorts before its reverse, so iterating over all unitigs
+        generates each link once."""
+        for is_reversed in (False, True):
+            for link in self.links_from(unitig, is_reversed):
+                if attr.astuple(link) <= attr.astuple(link.reverse()):
+                    yield link
+
+    def links(self):
+        """Return the sorted list of :py:class:`UnitigLink` objects between the unitigs
+
+        Each link is only returned in its canonical orientation."""
+        links = set()
+        for unitig in range(len(self)):
+            links.update(self.canonical_links_from(unitig))
+        return sorted(links, key=attr.astuple)
+
+    def cycles(self, links):
+        """Return the set of unitigs of more than one kmer whose last kmer links to their
+        first kmer"""
+        return {link.source for link in links if link.source == link.target
+                and link.source_is_reversed == link.target_is_reversed
+                and len(self.oriented_nodes(link.source)) > 1}
+
+    def consistent_edges(self, links, is_reversed, cycles):
+        """Generate the (source, target, color) edges between unitigs oriented by is_reversed
+
+        Links that join a reversed and a forward unitig and self links of unitigs that are not
+        in cycles are skipped."""
+        for link in links:
+            source_is_reversed = is_reversed[link.source] != link.source_is_reversed
+            target_is_reversed = is_reversed[link.target] != link.target_is_reversed
+            if source_is_reversed != target_is_reversed:
+                continue
+            if link.source == link.target and link.source not in cycles:
+                continue
+            if source_is_reversed:
+                yield link.target, link.source, link.color
+            else:
+                yield link.source, link.target, link.color
+
+    def consistent_orientations(self, links):
+        """Return a boolean array of the unitigs to reverse so that links join unitigs that
+        are not reversed
+
+        Orientations are propagated along links from the first unitig of each connected
+        component. Links that cannot be made consistent, such as links of hairpins, are
+        ignored."""
+        is_reversed = np.zeros(len(self), dtype=bool)
+        is_oriented = np.zeros(len(self), dtype=bool)
+        neighbors = [[] for _ in range(len(self))]
+        for link in links:
+            is_flip = link.source_is_reversed != link.target_is_reversed
+            neighbors[link.source].append((link.target, is_flip))
+            neighbors[link.target].append((link.source, is_flip))
+        for start in range(len(self)):
+            if is_oriented[start]:
+                continue
+            is_oriented[start] = True
+            stack = [start]
+            while stack:
+                unitig = stack.pop()
+                for neighbor, is_flip in neighbors[unitig]:
+                    if not is_oriented[neighbor]:
+                        is_oriented[neighbor] = True
+                        is_reversed[neighbor] = is_reversed[unitig] != is_flip
+                        stack.append(neighbor)
+        return is_reversed
@@ -1,9 +1,9 @@
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 
 import attr
 import networkx as nx
 
-from cortexpy.utils import lexlo
+from cortexpy.utils import lexlo, kmerize_contig
 from .parser.kmer import EmptyKmerBuilder, revcomp_target_to_match_ref, connect_kmers
 from .parser.random_access import RandomAccess
 
@@ -32,18 +32,21 @@ class ContigRetriever(object):
     def get_kmers(self, contig):
         kmer_size = self.graph_parser.kmer_size
         assert len(contig) >= kmer_size
+        kmer_strings = list(kmerize_contig(contig, kmer_size))
+        unseen_lexlo_kmer_strings = [
+            lexlo_kmer_string
+            for lexlo_kmer_string in OrderedDict.fromkeys(lexlo(k) for k in kmer_strings)
+            if lexlo_kmer_string not in self.seen_kmer_strings
+        ]
+        unseen_kmers = self.graph_parser.get_kmers_for_strings(unseen_lexlo_kmer_strings)
+        for lexlo_kmer_string, kmer in zip(unseen_lexlo_kmer_strings, unseen_kmers):
+            if kmer is None:
+                kmer = self.empty_kmer_builder.build(lexlo_kmer_string)
+            self.seen_kmer_strings[lexlo_kmer_string] = kmer
+
         kmers = []
-        for kmer_start in range(len(contig) - kmer_size + 1):
-            kmer_string = contig[kmer_start:(kmer_start + kmer_size)]
-            lexlo_kmer_string = lexlo(kmer_string)
-            if lexlo_kmer_string in self.seen_kmer_strings:
-                kmer = self.seen_kmer_strings[lexlo_kmer_string]
-            else:
-                try:
-                    kmer = self.graph_parser.get_kmer_for_string(kmer_string)
-                except KeyError:
-                    kmer = self.empty_kmer_builder.build(kmer_string)
-                self.seen_kmer_strings[lexlo_kmer_string] = kmer
+        for kmer_string in kmer_strings:
+            kmer = self.seen_kmer_strings[lexlo(kmer_string)]
             kmer.increment_color_coverage(self.num_colors - 1)
             kmers.append((kmer, kmer_string))
         for kmer_idx in range(len(kmers) - 1):
@@ -15,6 +15,7 @@ import networkx as nx
 
 from cortexpy.constants import EdgeTraversalOrientation
 from cortexpy.graph.parser.kmer import find_all_neighbors, disconnect_kmers
+from cortexpy.int_kmer import get_int_kmer_codec
 from cortexpy.utils import lexlo
 
 
@@ -77,6 +78,16 @@ class CortexGraphMapping(MutableMapping):
             return self._new_kmers[lexlo_key]
         return self.ra_parser[lexlo_key]
 
+    def get_kmer_for_int(self, kmer_int):
+        """Return the kmer of an integer-encoded kmer (see :py:mod:`cortexpy.int_kmer`)
+
+        Lookups go straight to the ra_parser while no kmers have been added to or deleted from
+        the mapping, so the kmer is only converted to a string if the mapping has been modified.
+        """
+        if not self._new_kmers and not self._exclusion_set:
+            return self.ra_parser.get_kmer_for_int(kmer_int)
+        return self[get_int_kmer_codec(self.ra_parser.kmer_size).decode(kmer_int)]
+
     def __setitem__(self, key, value):
         lexlo_key = lexlo(key)
         if lexlo_key in self._exclusion_set:
@@ -179,6 +190,12 @@ class CortexDiGraph(Collection):
     def __getitem__(self, item):
         return self.succ[item]
 
+    def get_kmer_for_int(self, kmer_int):
+        """Return the kmer of an integer-encoded kmer (see :py:mod:`cortexpy.int_kmer`)"""
+        if hasattr(self._kmer_mapping.ra_parser, 'get_kmer_for_int'):
+            return self._kmer_mapping.get_kmer_for_int(kmer_int)
+        return self._kmer_mapping[get_int_kmer_codec(self.graph['kmer_size']).decode(kmer_int)]
+
     def add_node(self, kmer_string, *, kmer):
         self._kmer_mapping[kmer_string] = kmer
 
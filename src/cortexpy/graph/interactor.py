@@ -15,6 +15,7 @@ from cortexpy.constants import EdgeTraversalOrientation, EdgeDFSTraversalDirecti
 from cortexpy.graph.cortex import CortexDiGraph, ConsistentCortexDiGraph
 from cortexpy.graph.parser.kmer import revcomp_target_to_match_ref
 from cortexpy.graph.serializer.unitig import UnitigCollapser
+from cortexpy.int_kmer import get_int_kmer_codec
 from cortexpy.links import UnitigLinkWalker, LinkedGraphTraverser
 from cortexpy.utils import lexlo, revcomp
 
@@ -47,6 +48,11 @@ class Interactor(object):
             self.graph.add_edges_from(graph_to_add.edges(keys=True))
 
     def find_nodes_of_tips_less_than(self, n):
+        if isinstance(self.graph, CortexDiGraph):
+            return self._find_nodes_of_tips_less_than_from_edge_sets(n)
+        return self._find_nodes_of_tips_less_than_from_edge_dfs(n)
+
+    def _find_nodes_of_tips_less_than_from_edge_dfs(self, n):
         nodes_to_prune = set()
         graph = make_multi_graph(self.graph)
         num_tips = 0
@@ -71,6 +77,18 @@ class Interactor(object):
         logger.info('Found %s of %s tips shorter than %s.', num_tips_to_prune, num_tips, n)
         return nodes_to_prune
 
+    def _find_nodes_of_tips_less_than_from_edge_sets(self, n):
+        """Walk tips on the edge sets of the kmers instead of on networkx edges"""
+        from cortexpy.graph.prune import (
+            dead_end_kmer_ints_of_kmers, find_tips_less_than, lexlo_kmer_ints_of_tips,
+        )
+        kmer_size = self.graph.graph['kmer_size']
+        codec = get_int_kmer_codec(kmer_size)
+        dead_ends = dead_end_kmer_ints_of_kmers((self.graph.node[node] for node in self.graph),
+                                                codec)
+        tips = find_tips_less_than(n, dead_ends, self.graph, kmer_size)
+        return {codec.decode(kmer_int) for kmer_int in lexlo_kmer_ints_of_tips(tips, n)}
+
     def prune_tips_less_than(self, n):
         logger.info(f'Removing tips shorter than {n} k-mers')
         nodes_to_prune = self.find_nodes_of_tips_less_than(n)
@@ -0,0 +1,107 @@
+"""Joining Cortex graphs
+========================
+
+This module contains functions for joining sorted Cortex graphs into a single sorted multi-color
+Cortex graph. The input graphs are streamed in blocks of records and k-way merged by kmer, so
+memory use is bounded by the block size and the number of input graphs. The colors of the
+joined graph are the colors of the input graphs in input order.
+"""
+import heapq
+
+from cortexpy.graph.parser.constants import RECORD_BLOCK_SIZE, UINT32_T, UINT64_T
+from cortexpy.graph.parser.header import Header
+from cortexpy.graph.parser.streaming import keyed_record_generator_from_stream_and_header
+from cortexpy.graph.serializer.kmer import ColorInformationBlock
+
+
+def join_headers(headers):
+    """Return the header of the graph that joins graphs with headers"""
+    kmer_sizes = {header.kmer_size for header in headers}
+    if len(kmer_sizes) != 1:
+        raise ValueError('Graphs have different kmer sizes: {}'.format(sorted(kmer_sizes)))
+
+    def joined(attribute):
+        return tuple(value for header in headers for value in getattr(header, attribute))
+
+    return Header(kmer_size=headers[0].kmer_size,
+                  kmer_container_size=headers[0].kmer_container_size,
+                  num_colors=sum(header.num_colors for header in headers),
+                  mean_read_lengths=joined('mean_read_lengths'),
+                  total_sequences=joined('total_sequences'),
+                  sample_names=joined('sample_names'),
+                  error_rates=joined('error_rates'),
+                  color_info_blocks=[ColorInformationBlock.from_header_block(block)
+                                     for block in joined('color_info_blocks')])
+
+
+def join_graph_streams(streams, output, block_size=RECORD_BLOCK_SIZE):
+    """Join sorted graphs read from streams and write the joined graph to output
+
+    Kmers that are missing from an input graph have zero coverage and no edges in the colors of
+    that graph. Return the number of kmers written."""
+    headers = [Header.from_stream(stream) for stream in streams]
+    header = join_headers(headers)
+    header.dump(output)
+
+    kmer_bytes = header.kmer_container_size * UINT64_T
+    coverage_slices = []
+    edge_slices = []
+    for input_header in headers:
+        coverage_end = kmer_bytes + UINT32_T * input_header.num_colors
+        coverage_slices.append(slice(kmer_bytes, coverage_end))
+        edge_slices.append(slice(coverage_end, input_header.record_size))
+    empty_coverages = [bytes(UINT32_T * h.num_colors) for h in headers]
+    empty_edges = [bytes(h.num_colors) for h in headers]
+
+    records = heapq.merge(*(
+        keyed_record_generator_from_stream_and_header(stream, input_header, input_idx,
+                                                      block_size=block_size)
+        for input_idx, (stream, input_header) in enumerate(zip(streams, headers))
+    ))
+    n_kmers = 0
+    out_block = bytearray()
+    group_key = None
+    group = {}
+    for key, input_idx, record in records:
+        if key != group_key:
+            if group:
+                out_block += _join_records(group, coverage_slices, edge_slices,
+                                           empty_coverages, empty_edges)
+                n_kmers += 1
+                if len(out_block) >= block_size:
+                    output.write(out_block)
+                    out_block = bytearray()
+            group_key = key
+            group = {}
+        group[input_idx] = record
+    if group:
+        out_block += _join_records(group, coverage_slices, edge_slices, empty_coverages,
+                                   empty_edges)
+        n_kmers += 1
+    output.write(out_block)
+    return n_kmers
+
+
+def _join_records(group, coverage_slices, edge_slices, empty_coverages, empty_edges):
+    kmer = next(iter(group.values()))[:coverage_slices[0].start]
+    coverages = []
+    edges = []
+    for input_idx in range(len(coverage_slices)):
+        record = group.get(input_idx)
+        if record is None:
+            coverages.append(empty_coverages[input_idx])
+            edges.append(empty_edges[input_idx])
+        else:
+            coverages.append(record[coverage_slices[input_idx]])
+            edges.append(record[edge_slices[input_idx]])
+    return b''.join([kmer] + coverages + edges)
+
+
+def join_graph_paths(paths, output, block_size=RECORD_BLOCK_SIZE):
+    """Join sorted graph files and write the joined graph to output"""
+    streams = [open(str(path), 'rb') for path in paths]
+    try:
+        return join_graph_streams(streams, output, block_size=block_size)
+    finally:
+        for stream in streams:
+            stream.close()
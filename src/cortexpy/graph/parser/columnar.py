@@ -0,0 +1,135 @@
+"""Columnar parsing of Cortex graphs
+====================================
+
+This module contains functions for decoding the body of a Cortex graph in large blocks of
+records. Each block is returned as columns of NumPy arrays instead of one Python object per kmer.
+"""
+
+import attr
+import numpy as np
+
+from cortexpy.graph.parser.constants import RECORD_BLOCK_SIZE
+from cortexpy.graph.parser.header import Header
+from cortexpy.graph.parser.kmer_ext import raw_block_to_kmer_bytes
+
+
+def record_dtype(header):
+    """Return the structured NumPy dtype of a Cortex graph record described by header"""
+    return np.dtype([('kmer', '<u8', (header.kmer_container_size,)),
+                     ('coverage', '<u4', (header.num_colors,)),
+                     ('edges', 'u1', (header.num_colors,))])
+
+
+@attr.s(slots=True)
+class KmerColumns(object):
+    """A block of Cortex graph records stored as columns
+
+    kmers is an (n, kmer_container_size) uint64 array of kmer container words, most significant
+    word first. coverage is an (n, num_colors) uint32 array and edges is an (n, num_colors) uint8
+    array of raw edge sets. Columns decoded from a buffer are read-only views of that buffer.
+    """
+    kmers = attr.ib()
+    coverage = attr.ib()
+    edges = attr.ib()
+
+    @classmethod
+    def from_records(cls, records):
+        return cls(kmers=records['kmer'], coverage=records['coverage'], edges=records['edges'])
+
+    @classmethod
+    def from_buffer(cls, buffer, header, n_records=-1, offset=0):
+        """Decode n_records records (all by default) from a buffer without copying"""
+        return cls.from_records(
+            np.frombuffer(buffer, dtype=record_dtype(header), count=n_records, offset=offset)
+        )
+
+    def __len__(self):
+        return len(self.kmers)
+
+    def kmer_strings(self, kmer_size):
+        """Decode the kmers of all records into a list of kmer strings"""
+        kmers = np.ascontiguousarray(self.kmers, dtype='<u8')
+        kmer_strings = raw_block_to_kmer_bytes(kmer_size, kmers.shape[1] * kmers.itemsize,
+                                               kmers.view(np.uint8).reshape(-1)).decode()
+        return [kmer_strings[start:start + kmer_size]
+                for start in range(0, len(kmer_strings), kmer_size)]
+
+
+def kmer_columns_generator_from_stream(stream, **kwargs):
+    header = Header.from_stream(stream)
+    return kmer_columns_generator_from_stream_and_header(stream, header, **kwargs)
+
+
+def record_block_generator_from_stream_and_header(stream, header, block_size=RECORD_BLOCK_SIZE,
+                                                  n_records=None):
+    """Generate blocks of whole records of at most block_size bytes from the current position
+
+    At most n_records records are read if n_records is not None."""
+    record_size = record_dtype(header).itemsize
+    records_per_block = max(1, block_size // record_size)
+    n_records_left = n_records
+    while n_records_left is None or n_records_left > 0:
+        n_block_records = records_per_block
+        if n_records_left is not None:
+            n_block_records = min(n_block_records, n_records_left)
+            n_records_left -= n_block_records
+        block = stream.read(n_block_records * record_size)
+        if len(block) % record_size != 0:
+            raise ValueError(
+                "Block size ({}) % Record size ({}) != 0".format(len(block), record_size))
+        if len(block) == 0:
+            return
+        yield block
+
+
+def kmer_columns_generator_from_stream_and_header(stream, header, *,
+                                                  block_size=RECORD_BLOCK_SIZE,
+                                                  n_records=None):
+    """Generate :py:class:`KmerColumns` blocks of records read from the current stream position
+
+    Blocks are read with :py:func:`record_block_generator_from_stream_and_header`, so memory use
+    is bounded by the block size.
+    """
+    for block in record_block_generator_from_stream_and_header(stream, header,
+                                                               block_size=block_size,
+                                                               n_records=n_records):
+        yield KmerColumns.from_buffer(block, header)
+
+
+def kmers_are_sorted(kmers):
+    """Return True if the rows of an array of kmer container words are unique and in ascending
+    order"""
+    is_greater = np.zeros(max(len(kmers) - 1, 0), dtype=bool)
+    is_equal = np.ones_like(is_greater)
+    for word_idx in range(kmers.shape[1]):
+        previous, current = kmers[:-1, word_idx], kmers[1:, word_idx]
+        is_greater |= is_equal & (current > previous)
+        is_equal &= current == previous
+    return bool(np.all(is_greater))
+
+
+def is_sorted_from_stream_and_header(stream, header, block_size=RECORD_BLOCK_SIZE):
+    """Return True if the kmers of the graph body at the current stream position are unique and
+    in ascending order
+
+    Only the kmer words of one block of records are held in memory at a time."""
+    last_kmer = None
+    for columns in kmer_columns_generator_from_stream_and_header(stream, header,
+                                                                 block_size=block_size):
+        if last_kmer is not None and tuple(columns.kmers[0].tolist()) <= last_kmer:
+            return False
+        if not kmers_are_sorted(columns.kmers):
+            return False
+        last_kmer = tuple(columns.kmers[-1].tolist())
+    return True
+
+
+def load_kmer_columns(stream):
+    """Load all records of a Cortex graph into a single :py:class:`KmerColumns` object"""
+    header = Header.from_stream(stream)
+    blocks = list(kmer_columns_generator_from_stream_and_header(stream, header))
+    if not blocks:
+        return KmerColumns.from_buffer(b'', header)
+    return KmerColumns(kmers=np.concatenate([b.kmers for b in blocks]),
+                       coverage=np.concatenate([b.coverage for b in blocks]),
+                       edges=np.concatenate([b.edges for b in blocks]))
@@ -12,3 +12,4 @@ LETTER_TO_NUM = bytes.maketrans(b'ACGT', bytes([0x00, 0x01, 0x02, 0x03]))
 ASCII_OFFSET_OF_ZERO = 48
 NUM_LETTERS_PER_UINT = UINT64_T * LETTERS_PER_BYTE
 NUM_TO_BITS = np.array([[0, 0], [0, 1], [1, 0], [1, 1]])
+RECORD_BLOCK_SIZE = 2 ** 22
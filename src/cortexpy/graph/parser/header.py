@@ -4,6 +4,7 @@
 This module contains classes for parsing and representing a Cortex file header
 """
 
+import io
 import struct
 from struct import unpack
 
@@ -89,6 +90,12 @@ class Header:
         return self._error_rates
 
     def dump(self, buffer):
+        """Write the header to buffer in a single write"""
+        header_buffer = io.BytesIO()
+        self._dump(header_buffer)
+        buffer.write(header_buffer.getvalue())
+
+    def _dump(self, buffer):
         magic_word = b''.join(CORTEX_MAGIC_WORD)
         assert struct.calcsize('L') == UINT64_T
         assert struct.calcsize('I') == UINT32_T
@@ -17,7 +17,7 @@ from cortexpy.graph.parser.constants import (
     UINT64_T, UINT32_T, LETTER_TO_NUM,
     NUM_LETTERS_PER_UINT, NUM_TO_BITS,
 )
-from cortexpy.graph.parser.kmer_ext import raw_kmer_to_string, raw_edges_to_list, raw_to_coverage
+from cortexpy.graph.parser.kmer_ext import raw_kmer_to_string, raw_to_coverage
 
 
 def check_kmer_string(kmer_string):
@@ -213,7 +213,18 @@ class StringKmerConverter(object):
                                       self._padding_array,
                                       letter_vals[-self.kmer_size:]))
         letter_val_bits = NUM_TO_BITS[letter_vals]
-        return np.packbits(letter_val_bits).view('uint64').newbyteorder()
+        return np.packbits(letter_val_bits).view(np.dtype(np.uint64).newbyteorder())
+
+    def to_uint_vectors(self, kmer_strings):
+        """Converts a sequence of kmer_strings to a 2D uint64 array with one kmer per row"""
+        n_kmers = len(kmer_strings)
+        translated_kmer_strings = ''.join(kmer_strings).encode().translate(LETTER_TO_NUM)
+        letter_vals = np.frombuffer(translated_kmer_strings, dtype=np.uint8)
+        letter_vals = letter_vals.reshape(n_kmers, self.kmer_size)
+        padding = np.broadcast_to(self._padding_array, (n_kmers, len(self._padding_array)))
+        letter_vals = np.concatenate((padding, letter_vals), axis=1)
+        letter_val_bits = NUM_TO_BITS[letter_vals].reshape(n_kmers, -1)
+        return np.packbits(letter_val_bits, axis=1).view('>u8').astype(np.uint64)
 
     def to_raw(self, kmer_string):
         uints = self.to_uints(kmer_string)
@@ -233,6 +244,12 @@ class KmerData(object):
     def get_raw_kmer(self):
         return self._data[:self.kmer_container_size_in_uint64ts * UINT64_T]
 
+    def get_unchanged_record(self):
+        """Return the raw record if coverage and edges have not been decoded, otherwise None"""
+        if self._coverage is None and self._edges is None:
+            return bytes(self._data)
+        return None
+
     @property
     def kmer(self):
         if self._kmer is None:
@@ -257,8 +274,7 @@ class KmerData(object):
             start = (
                 self.kmer_container_size_in_uint64ts * UINT64_T + self.num_colors * UINT32_T
             )
-            tuples = raw_edges_to_list(self._data[start:])
-            self._edges = [cortexpy.edge_set.EdgeSet(t) for t in tuples]
+            self._edges = [cortexpy.edge_set.ByteEdgeSet(b) for b in self._data[start:]]
         return self._edges
 
     @edges.setter
@@ -380,15 +396,25 @@ class Kmer:
     def get_raw_kmer(self):
         return self._kmer_data.get_raw_kmer()
 
+    def to_bytes(self):
+        """Return the Cortex record of this kmer
+
+        The raw record of a kmer parsed from a graph is returned as is if its coverage and edges
+        have not been accessed since parsing, and therefore cannot have changed."""
+        if (
+            isinstance(self._kmer_data, KmerData)
+            and self.num_colors == self._kmer_data.num_colors
+        ):
+            raw_record = self._kmer_data.get_unchanged_record()
+            if raw_record is not None:
+                return raw_record
+        coverage = self.coverage
+        return b''.join([self.get_raw_kmer(),
+                         struct.pack('{}I'.format(len(coverage)), *coverage),
+                         bytes(edge_set.to_byte() for edge_set in self.edges)])
+
     def dump(self, buffer):
-        if self.kmer == self._kmer_data.kmer:
-            buffer.write(self.get_raw_kmer())
-        else:
-            raise NotImplementedError
-        for cov in self.coverage:
-            buffer.write(struct.pack('I', cov))
-        for edge_set in self.edges:
-            edge_set.dump(buffer)
+        buffer.write(self.to_bytes())
 
     def __getitem__(self, item):
         """Allow kmers to be used as node objects in networkx graphs"""
@@ -1,8 +1,11 @@
 # distutils: language=c++
 
+from libc.stdint cimport int64_t, uint64_t
 from libcpp.string cimport string
 from libcpp.vector cimport vector
 
+import numpy as np
+
 cdef size_t SIZE_OF_INT64 = 8
 cdef string NUM_TO_LETTER_LIST = b'ACGT'
 
@@ -73,3 +76,235 @@ def raw_to_coverage(const unsigned char[:] buffer not None, size_t offset, size_
     # coverage_raw = self._data[start:(start + self.num_colors * UINT32_T)]
     # fmt_string = ''.join(['I' for _ in range(self.num_colors)])
     # self._coverage = unpack(fmt_string, coverage_raw)
+
+
+# Block kernels
+#
+# The functions below decode a whole block of fixed-size records in one call. block is a
+# contiguous buffer of records of record_size bytes. Coverage and edges are decoded without a
+# kernel as NumPy views of the block (see cortexpy.graph.parser.columnar.KmerColumns).
+
+def raw_block_to_kmer_bytes(unsigned kmer_size, size_t record_size,
+                            const unsigned char[:] block not None):
+    """Return the kmers of all records of a block as one bytes object of kmer_size letters each"""
+    assert kmer_size > 0
+    cdef size_t kmer_container_size = (kmer_size + 31) // 32
+    assert kmer_container_size * SIZE_OF_INT64 <= record_size
+    assert block.shape[0] % record_size == 0
+    cdef size_t n_records = block.shape[0] // record_size
+    cdef size_t n_pad_letters = kmer_container_size * 32 - kmer_size
+    cdef string letters
+    letters.resize(n_records * kmer_size)
+    cdef size_t record_idx, word_idx, byte_idx, letter_idx, record_start, out_idx
+    cdef size_t container_letter_idx
+    cdef unsigned char kmer_byte
+    out_idx = 0
+    for record_idx in range(n_records):
+        record_start = record_idx * record_size
+        container_letter_idx = 0
+        for word_idx in range(kmer_container_size):
+            for byte_idx in reversed(range(SIZE_OF_INT64)):
+                kmer_byte = block[record_start + word_idx * SIZE_OF_INT64 + byte_idx]
+                for letter_idx in range(4):
+                    if container_letter_idx >= n_pad_letters:
+                        letters[out_idx] = NUM_TO_LETTER_LIST[(kmer_byte >> (6 - 2 * letter_idx)) & 0x3]
+                        out_idx += 1
+                    container_letter_idx += 1
+    return bytes(letters)
+
+
+# Unitig kernels
+#
+# The functions below work on the kmers of a sorted graph. kmers is an (n, kmer_container_size)
+# array of kmer container words, most significant word first. Each record is a lexlo kmer and
+# oriented nodes are encoded as 2 * record index for the lexlo kmer and 2 * record index + 1 for
+# its reverse complement.
+
+cdef inline unsigned char _get_letter(const uint64_t[:, :] kmers, size_t row,
+                                      size_t kmer_size, size_t letter_idx):
+    cdef size_t pos = 2 * (kmer_size - 1 - letter_idx)
+    cdef size_t word_idx = kmers.shape[1] - 1 - pos // 64
+    return (kmers[row, word_idx] >> (pos % 64)) & 0x3
+
+cdef int64_t _find_oriented_node(const uint64_t[:, :] kmers, size_t kmer_size,
+                                   vector[unsigned char]& letters,
+                                   vector[uint64_t]& words):
+    """Return the oriented node of a kmer given as letters, or -1 if it is missing"""
+    cdef size_t n_words = kmers.shape[1]
+    cdef size_t idx, pos, word_idx
+    cdef int is_lexlo = 1
+    cdef unsigned char letter, rc_letter
+    for idx in range(kmer_size):
+        letter = letters[idx]
+        rc_letter = 3 - letters[kmer_size - 1 - idx]
+        if letter != rc_letter:
+            is_lexlo = letter < rc_letter
+            break
+    for word_idx in range(n_words):
+        words[word_idx] = 0
+    for idx in range(kmer_size):
+        if is_lexlo:
+            letter = letters[idx]
+        else:
+            letter = 3 - letters[kmer_size - 1 - idx]
+        pos = 2 * (kmer_size - 1 - idx)
+        words[n_words - 1 - pos // 64] |= (<uint64_t> letter) << (pos % 64)
+
+    cdef size_t start = 0
+    cdef size_t stop = kmers.shape[0]
+    cdef size_t middle
+    cdef int comparison
+    while start < stop:
+        middle = start + (stop - start) // 2
+        comparison = 0
+        for word_idx in range(n_words):
+            if kmers[middle, word_idx] != words[word_idx]:
+                comparison = -1 if kmers[middle, word_idx] < words[word_idx] else 1
+                break
+        if comparison == 0:
+            return 2 * middle + (0 if is_lexlo else 1)
+        if comparison < 0:
+            start = middle + 1
+        else:
+            stop = middle
+    return -1
+
+def unitig_neighbor_nodes(size_t kmer_size, const uint64_t[:, :] kmers not None,
+                          const unsigned char[:] edges not None):
+    """Return the unique neighbors of the lexlo kmer of each record as an (n, 2) int64 array
+
+    edges are the raw edge set bytes of each record. Column 0 is the oriented node of the
+    outgoing neighbor and column 1 the oriented node of the incoming neighbor. A neighbor is -1
+    if the edge set does not have exactly one edge in that direction or if the neighbor is
+    missing from kmers."""
+    assert kmer_size > 0
+    assert kmers.shape[1] == (kmer_size + 31) // 32
+    assert kmers.shape[0] == edges.shape[0]
+    cdef size_t n_records = kmers.shape[0]
+    neighbors = np.full((n_records, 2), -1, dtype=np.int64)
+    cdef int64_t[:, :] neighbors_view = neighbors
+    cdef vector[unsigned char] letters
+    letters.resize(kmer_size)
+    cdef vector[uint64_t] words
+    words.resize(kmers.shape[1])
+    cdef size_t row, idx
+    cdef unsigned char out_nibble, in_nibble, letter
+    for row in range(n_records):
+        out_nibble = edges[row] & 0x0F
+        in_nibble = edges[row] >> 4
+        if out_nibble != 0 and out_nibble & (out_nibble - 1) == 0:
+            for idx in range(1, kmer_size):
+                letters[idx - 1] = _get_letter(kmers, row, kmer_size, idx)
+            letter = 0
+            while out_nibble >> letter != 1:
+                letter += 1
+            letters[kmer_size - 1] = letter
+            neighbors_view[row, 0] = _find_oriented_node(kmers, kmer_size, letters, words)
+        if in_nibble != 0 and in_nibble & (in_nibble - 1) == 0:
+            for idx in range(kmer_size - 1):
+                letters[idx + 1] = _get_letter(kmers, row, kmer_size, idx)
+            letter = 0
+            while (0x8 >> letter) != in_nibble:
+                letter += 1
+            letters[0] = letter
+            neighbors_view[row, 1] = _find_oriented_node(kmers, kmer_size, letters, words)
+    return neighbors
+
+def removed_neighbor_edges(size_t kmer_size, const uint64_t[:, :] kmers not None,
+                           const unsigned char[:] edges not None, removed not None):
+    """Return the edge bits of each record that link to a removed record as a uint8 array
+
+    edges are the raw edge set bytes of each record and removed is a boolean array of the
+    removed records. The mask of a removed record is 0."""
+    assert kmer_size > 0
+    assert kmers.shape[1] == (kmer_size + 31) // 32
+    assert kmers.shape[0] == edges.shape[0]
+    assert kmers.shape[0] == removed.shape[0]
+    cdef const unsigned char[:] removed_view = np.asarray(removed, dtype=bool).view(np.uint8)
+    cdef size_t n_records = kmers.shape[0]
+    mask = np.zeros(n_records, dtype=np.uint8)
+    cdef unsigned char[:] mask_view = mask
+    cdef vector[unsigned char] letters
+    letters.resize(kmer_size)
+    cdef vector[uint64_t] words
+    words.resize(kmers.shape[1])
+    cdef size_t row, idx
+    cdef unsigned char bit
+    cdef int64_t node
+    for row in range(n_records):
+        if removed_view[row] or edges[row] == 0:
+            continue
+        for bit in range(8):
+            if not (edges[row] >> bit) & 0x1:
+                continue
+            if bit < 4:
+                for idx in range(1, kmer_size):
+                    letters[idx - 1] = _get_letter(kmers, row, kmer_size, idx)
+                letters[kmer_size - 1] = bit
+            else:
+                for idx in range(kmer_size - 1):
+                    letters[idx + 1] = _get_letter(kmers, row, kmer_size, idx)
+                letters[0] = 7 - bit
+            node = _find_oriented_node(kmers, kmer_size, letters, words)
+            if node != -1 and removed_view[node >> 1]:
+                mask_view[row] |= 1 << bit
+    return mask
+
+cdef _int64_array(const vector[int64_t]& values):
+    array = np.empty(values.size(), dtype=np.int64)
+    cdef int64_t[:] array_view = array
+    cdef size_t idx
+    for idx in range(values.size()):
+        array_view[idx] = values[idx]
+    return array
+
+def walk_unitigs(const int64_t[:] next_nodes not None):
+    """Walk the maximal unitigs of n records in linear time
+
+    next_nodes holds the oriented node that follows each of the 2 * n oriented nodes in its
+    unitig, or -1. Following a node forwards must be the same as following its reverse
+    complement backwards: next_nodes[a] == b if and only if next_nodes[b ^ 1] == a ^ 1.
+
+    Returns the oriented nodes of all unitigs in walk order, the offsets of each unitig into
+    these nodes and a boolean array of which unitigs are cycles. Every record is in exactly one
+    unitig, and the unitigs are in the order of their lowest record index."""
+    assert next_nodes.shape[0] % 2 == 0
+    cdef size_t n_records = next_nodes.shape[0] // 2
+    cdef vector[char] visited
+    visited.resize(n_records, 0)
+    cdef vector[int64_t] nodes
+    nodes.reserve(n_records)
+    cdef vector[int64_t] backward
+    cdef vector[int64_t] offsets
+    offsets.push_back(0)
+    cdef vector[int64_t] is_cycle
+    cdef size_t record_idx, idx
+    cdef int64_t start, node, other
+    for record_idx in range(n_records):
+        if visited[record_idx]:
+            continue
+        start = 2 * record_idx
+        visited[record_idx] = 1
+        backward.clear()
+        node = start
+        while True:
+            other = next_nodes[node ^ 1]
+            if other == -1 or visited[other >> 1]:
+                break
+            node = other ^ 1
+            visited[node >> 1] = 1
+            backward.push_back(node)
+        for idx in reversed(range(backward.size())):
+            nodes.push_back(backward[idx])
+        nodes.push_back(start)
+        node = start
+        while True:
+            other = next_nodes[node]
+            if other == -1 or visited[other >> 1]:
+                break
+            node = other
+            visited[node >> 1] = 1
+            nodes.push_back(node)
+        is_cycle.push_back(next_nodes[node] == nodes[offsets.back()])
+        offsets.push_back(nodes.size())
+    return _int64_array(nodes), _int64_array(offsets), _int64_array(is_cycle).astype(bool)
@@ -0,0 +1,133 @@
+"""Parallel scans of Cortex graphs
+==================================
+
+This module contains functions for scanning the body of a Cortex graph file with several worker
+processes. Records are fixed-size, so the body is split into record-aligned ranges, several per
+worker. Each worker opens the graph, reads a range in blocks of whole records and applies a
+function to every block. The block results are streamed to the parent in record order as the
+ranges complete, or reduced to a single value.
+"""
+import os
+from functools import reduce
+from multiprocessing import Pool
+
+from cortexpy.graph.cortex import build_cortex_graph_from_header
+from cortexpy.graph.parser.constants import RECORD_BLOCK_SIZE
+from cortexpy.graph.parser.header import Header
+from cortexpy.graph.parser.kmer import Kmer, KmerData
+from cortexpy.graph.parser.kmer_ext import raw_block_to_kmer_bytes
+from cortexpy.graph.parser.streaming import record_block_generator_from_stream_and_header
+
+_NO_RESULT = object()
+RANGES_PER_WORKER = 4
+
+
+def record_ranges(n_records, n_ranges):
+    """Split n_records records into at most n_ranges contiguous [start, stop) ranges"""
+    n_ranges = max(1, min(n_ranges, n_records))
+    bounds = [n_records * idx // n_ranges for idx in range(n_ranges + 1)]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def header_and_n_records_from_path(path):
+    """Return the header and the number of records of a Cortex graph file"""
+    with open(path, 'rb') as fh:
+        header = Header.from_stream(fh)
+        body_start = fh.tell()
+    return header, (os.path.getsize(path) - body_start) // header.record_size
+
+
+def map_record_range(path, start, stop, func, reduce_func=None, block_size=RECORD_BLOCK_SIZE):
+    """Apply func(header, block) to the blocks of records [start, stop) of a Cortex graph file
+
+    Return a generator of the block results, or a list of their reduction with reduce_func if
+    reduce_func is not None. A range without blocks reduces to nothing, which is returned as an
+    empty list."""
+    results = _generate_block_results(path, start, stop, func, block_size)
+    if reduce_func is None:
+        return results
+    results = list(results)
+    if not results:
+        return results
+    return [reduce(reduce_func, results)]
+
+
+def _generate_block_results(path, start, stop, func, block_size):
+    with open(path, 'rb') as fh:
+        header = Header.from_stream(fh)
+        fh.seek(start * header.record_size, os.SEEK_CUR)
+        for block in record_block_generator_from_stream_and_header(fh, header,
+                                                                   block_size=block_size,
+                                                                   n_records=stop - start):
+            yield func(header, block)
+
+
+def _map_record_range_to_list(args):
+    return list(map_record_range(*args))
+
+
+def parallel_map_records(path, func, n_workers=1, reduce_func=None, initial=_NO_RESULT,
+                         block_size=RECORD_BLOCK_SIZE):
+    """Apply func(header, block) to all blocks of records of a Cortex graph file
+
+    Each block is a bytes object of whole records. If n_workers is at least two, then the graph
+    body is split into at least :py:data:`RANGES_PER_WORKER` record ranges per worker and the
+    ranges are processed by a pool of n_workers processes. func and reduce_func therefore need to
+    be picklable. Otherwise, the body is processed in this process.
+
+    Return a generator of the block results in record order. Results arrive as soon as the
+    ranges before them are done, so only a few ranges of results are held in memory at once. If
+    reduce_func is not None, then the block results are first reduced in each range and the
+    range results are then reduced in this process, starting from initial if it is given.
+    """
+    results = _generate_range_results(path, func, n_workers, reduce_func, block_size)
+    if reduce_func is None:
+        return results
+    if initial is not _NO_RESULT:
+        return reduce(reduce_func, results, initial)
+    return reduce(reduce_func, results)
+
+
+def _generate_range_results(path, func, n_workers, reduce_func, block_size):
+    header, n_records = header_and_n_records_from_path(path)
+    if n_workers < 2:
+        yield from map_record_range(path, 0, n_records, func, reduce_func, block_size)
+        return
+    n_blocks = -(-n_records * header.record_size // block_size)
+    range_args = [(path, start, stop, func, reduce_func, block_size)
+                  for start, stop in record_ranges(n_records,
+                                                   max(n_workers * RANGES_PER_WORKER, n_blocks))]
+    with Pool(min(n_workers, len(range_args))) as pool:
+        for results in pool.imap(_map_record_range_to_list, range_args):
+            yield from results
+
+
+def _kmer_strings_and_block(header, block):
+    return raw_block_to_kmer_bytes(header.kmer_size, header.record_size, block).decode(), block
+
+
+def kmer_generator_from_path(path, n_workers=1):
+    """Generate the kmers of a Cortex graph file in record order
+
+    Kmer strings are decoded a block at a time, by n_workers processes if n_workers is at least
+    two. Every :py:class:`~cortexpy.graph.parser.kmer.Kmer` object is still built in this
+    process and each record is sent back from the workers, so extra workers give little or no
+    speedup over n_workers=1, which already avoids the per-record decoding of
+    :py:func:`~cortexpy.graph.parser.streaming.kmer_generator_from_stream`."""
+    header, _ = header_and_n_records_from_path(path)
+    record_size = header.record_size
+    kmer_size = header.kmer_size
+    for kmer_strings, block in parallel_map_records(path, _kmer_strings_and_block, n_workers):
+        for record_idx, start in enumerate(range(0, len(block), record_size)):
+            kmer_data = KmerData(block[start:start + record_size], kmer_size, header.num_colors)
+            kmer_data._kmer = kmer_strings[record_idx * kmer_size:(record_idx + 1) * kmer_size]
+            yield Kmer.from_kmer_data(kmer_data)
+
+
+def load_cortex_graph_from_path(path, n_workers=1):
+    """Load a Cortex graph file, decoding its kmer strings with n_workers processes
+
+    See :py:func:`kmer_generator_from_path` for why n_workers defaults to one."""
+    header, _ = header_and_n_records_from_path(path)
+    return build_cortex_graph_from_header(header,
+                                          kmer_generator=kmer_generator_from_path(path, n_workers))
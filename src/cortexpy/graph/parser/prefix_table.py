@@ -0,0 +1,64 @@
+"""Prefix jump tables of Cortex graphs
+======================================
+
+This module contains a table of record offsets keyed by the leading bases of the kmers of a
+sorted Cortex graph. Kmers are spread evenly over the 2-bit encoded kmer space, so the range of
+records that share a prefix is small and a kmer search only needs to bisect that range.
+"""
+import attr
+import numpy as np
+
+DEFAULT_PREFIX_LENGTH = 8
+MAX_PREFIX_LENGTH = 12
+
+
+def kmer_prefixes(kmers, kmer_size, prefix_length):
+    """Return the 2-bit encoded leading prefix_length bases of an (n, kmer_container_size) array
+    of kmer container words"""
+    kmers = np.asarray(kmers, dtype=np.uint64).reshape(-1, kmers.shape[-1])
+    kmer_container_size = kmers.shape[1]
+    first_word_bits = 2 * (kmer_size - 32 * (kmer_container_size - 1))
+    prefix_bits = 2 * prefix_length
+    if prefix_bits <= first_word_bits:
+        return kmers[:, 0] >> np.uint64(first_word_bits - prefix_bits)
+    shift = prefix_bits - first_word_bits
+    return (kmers[:, 0] << np.uint64(shift)) | (kmers[:, 1] >> np.uint64(64 - shift))
+
+
+@attr.s(slots=True)
+class PrefixJumpTable(object):
+    """Offsets of the first record of every kmer prefix in a sorted Cortex graph
+
+    offsets has 4 ** prefix_length + 1 entries. The records whose kmers start with the 2-bit
+    encoded prefix p are records offsets[p] to offsets[p + 1]. The prefix length is capped at the
+    kmer size and at :py:data:`MAX_PREFIX_LENGTH`, which keeps the table at 128 MiB or less.
+    """
+    kmer_size = attr.ib()
+    prefix_length = attr.ib()
+    offsets = attr.ib()
+
+    @classmethod
+    def from_kmer_blocks(cls, kmer_blocks, *, kmer_size, kmer_container_size,
+                         prefix_length=DEFAULT_PREFIX_LENGTH):
+        """Build a table in one pass over blocks of (n, kmer_container_size) kmer words
+
+        Raises ValueError if prefix_length is less than one."""
+        if prefix_length < 1:
+            raise ValueError('Prefix length ({}) must be at least 1'.format(prefix_length))
+        prefix_length = min(prefix_length, MAX_PREFIX_LENGTH,
+                            kmer_size - 32 * max(0, kmer_container_size - 2))
+        counts = np.zeros(4 ** prefix_length, dtype=np.int64)
+        for kmers in kmer_blocks:
+            if len(kmers) == 0:
+                continue
+            prefixes = kmer_prefixes(kmers, kmer_size, prefix_length).astype(np.int64)
+            counts += np.bincount(prefixes, minlength=len(counts))
+        offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        return cls(kmer_size=kmer_size, prefix_length=prefix_length, offsets=offsets)
+
+    def record_bounds(self, uints):
+        """Return the record range [start, stop] that contains the insertion index of uints"""
+        kmers = np.asarray(uints, dtype=np.uint64).reshape(1, -1)
+        prefix = int(kmer_prefixes(kmers, self.kmer_size, self.prefix_length)[0])
+        return int(self.offsets[prefix]), int(self.offsets[prefix + 1])
@@ -3,9 +3,11 @@
 
 This module contains classes for inspecting Cortex graphs with random access to their kmers.
 """
+import io
+import logging
+import mmap
 from bisect import bisect_left
 from collections.abc import Sequence, Mapping
-from functools import lru_cache
 from io import SEEK_END
 
 import attr
@@ -13,17 +15,25 @@ import numpy as np
 
 import cortexpy.graph.cortex
 import cortexpy.graph.parser.header
+from cortexpy.int_kmer import get_int_kmer_codec
 from cortexpy.utils import lexlo
+from .columnar import KmerColumns, kmer_columns_generator_from_stream_and_header
 from .constants import UINT64_T
 from .kmer import (
     Kmer, KmerData, KmerUintComparator,
     StringKmerConverter,
 )
+from .prefix_table import PrefixJumpTable
+from .record_cache import DEFAULT_RECORD_CACHE_BYTES, make_record_cache
+from .sparse_index import SparseKmerIndex, sparse_index_path
 from .streaming import (
     kmer_generator_from_stream_and_header,
     kmer_string_generator_from_stream_and_header,
 )
 
+logger = logging.getLogger(__name__)
+_NOT_CACHED = object()
+
 
 @attr.s(slots=True)
 class SlurpedRandomAccess(Mapping):
@@ -53,6 +63,15 @@ class SlurpedRandomAccess(Mapping):
         """Will compute the revcomp of kmer string before getting a kmer"""
         return self[lexlo(string)]
 
+    def get_kmer_for_int(self, kmer_int):
+        """Return the kmer of an integer-encoded kmer (see :py:mod:`cortexpy.int_kmer`)"""
+        codec = get_int_kmer_codec(self.kmer_size)
+        return self[codec.decode(codec.lexlo(kmer_int))]
+
+    def get_kmers_for_strings(self, strings):
+        """Return a list of kmers, or None for missing kmers, in the order of the input strings"""
+        return [self.kmer_dict.get(lexlo(string)) for string in strings]
+
     @property
     def num_colors(self):
         return self.header.num_colors
@@ -72,14 +91,38 @@ class SlurpedRandomAccess(Mapping):
 
 @attr.s(slots=True, repr=False)
 class RandomAccess(Mapping):
-    """Provide fast k-mer access to Cortex graph in log(n) time (n = number of kmers in graph)"""
+    """Provide fast k-mer access to Cortex graph in log(n) time (n = number of kmers in graph)
+
+    If the graph handle was opened from a file path and an up-to-date sparse index built with
+    ``cortexpy index`` exists next to the graph, then each kmer lookup reads a single page of
+    records instead of bisecting the whole graph on disk.
+
+    If prefix_length is set, then a :py:class:`~cortexpy.graph.parser.prefix_table.PrefixJumpTable`
+    of the leading prefix_length bases of all kmers is built on the first lookup. Each lookup then
+    only bisects the records that share the prefix of the kmer it is looking for.
+
+    Retrieved records and missing kmers are kept in a bounded
+    :py:class:`~cortexpy.graph.parser.record_cache.RecordCache` with eviction policy
+    cache_policy ('lru' or 'clock'). The cache holds at most cache_bytes bytes or, if cache_bytes
+    is None, kmer_cache_size records. A fresh kmer is decoded from the cached record on every hit,
+    because callers are free to modify the kmers they retrieve.
+    """
     graph_handle = attr.ib()
     kmer_cache_size = attr.ib(None)
+    load_kmer_uints = attr.ib(False)
+    use_sparse_index = attr.ib(True)
+    prefix_length = attr.ib(None)
+    cache_bytes = attr.ib(None)
+    cache_policy = attr.ib('lru')
     header = attr.ib(init=False)
     graph_sequence = attr.ib(init=False)
     graph_kmer_sequence = attr.ib(init=False)
     n_records = attr.ib(init=False)
-    _cached_get_uints_index_for_string = attr.ib(init=False)
+    sparse_index = attr.ib(init=False, default=None)
+    _prefix_jump_table = attr.ib(init=False, default=None)
+    record_cache = attr.ib(init=False)
+    _cache_entry_size = attr.ib(init=False)
+    _int_kmer_codec = attr.ib(init=False)
 
     def __attrs_post_init__(self):
         assert self.graph_handle.seekable()
@@ -94,35 +137,101 @@ class RandomAccess(Mapping):
                 "Body size ({}) % Record size ({}) != 0".format(body_size,
                                                                 self.header.record_size))
         self.n_records = body_size // self.header.record_size
-        if self.kmer_cache_size is None:
-            self.kmer_cache_size = self.n_records
+        self._build_sequences(body_start_stream_position)
+        if self.load_kmer_uints:
+            self.graph_kmer_sequence = self.graph_kmer_sequence.to_array()
+        elif self.use_sparse_index and self.prefix_length is None:
+            self.sparse_index = self._load_sparse_index()
+
+        self._cache_entry_size = self.header.record_size + self.header.kmer_size
+        if self.cache_bytes is None:
+            if self.kmer_cache_size is None:
+                self.cache_bytes = DEFAULT_RECORD_CACHE_BYTES
+            else:
+                self.cache_bytes = self.kmer_cache_size * self._cache_entry_size
+        self.record_cache = make_record_cache(self.cache_policy, self.cache_bytes)
+        self._int_kmer_codec = get_int_kmer_codec(self.header.kmer_size)
+
+    def _build_sequences(self, body_start):
         self.graph_sequence = KmerRecordSequence(graph_handle=self.graph_handle,
-                                                 body_start=body_start_stream_position,
+                                                 body_start=body_start,
                                                  header=self.header,
                                                  n_records=self.n_records)
         self.graph_kmer_sequence = KmerUintSequence(
             graph_handle=self.graph_handle,
-            body_start=body_start_stream_position,
+            body_start=body_start,
             header=self.header,
             n_records=self.n_records
         )
 
-        self._cached_get_uints_index_for_string = lru_cache(maxsize=self.kmer_cache_size)(
-            self._get_uints_and_index_for_string)
-
-    def _get_uints_and_index_for_string(self, kmer_string):
-        uints = self.graph_kmer_sequence.kmer_string_converter.to_uints(kmer_string)
-        index = self.graph_kmer_sequence.index_uint_vector(uints)
-        return uints, index
+    def _load_sparse_index(self):
+        """Return the sidecar sparse index of the graph, or None if there is no usable index"""
+        graph_path = getattr(self.graph_handle, 'name', None)
+        if not isinstance(graph_path, str):
+            return None
+        index_path = sparse_index_path(graph_path)
+        try:
+            with open(index_path, 'rb') as fh:
+                index = SparseKmerIndex.from_stream(fh)
+        except FileNotFoundError:
+            return None
+        if not index.is_valid_for(graph_path):
+            logger.warning('Ignoring sparse index %s: graph %s has changed since it was indexed',
+                           index_path, graph_path)
+            return None
+        if (index.n_records != self.n_records
+                or index.kmer_container_size != self.header.kmer_container_size):
+            logger.warning('Ignoring sparse index %s: it does not match graph %s',
+                           index_path, graph_path)
+            return None
+        return index
+
+    def _get_index_for_uints(self, uints):
+        if self.sparse_index is not None:
+            start, stop = self.sparse_index.record_bounds(uints)
+            index = self.graph_kmer_sequence.index_uint_vector_in_range(uints, start, stop)
+        elif self.prefix_length is not None and not self.load_kmer_uints:
+            start, stop = self.prefix_jump_table.record_bounds(uints)
+            index = self.graph_kmer_sequence.index_uint_vector(uints, start, stop)
+        else:
+            index = self.graph_kmer_sequence.index_uint_vector(uints)
+        return index
 
-    def _get_kmer_data_for_string(self, lexlo_string):
-        uints, index = self._cached_get_uints_index_for_string(lexlo_string)
+    @property
+    def prefix_jump_table(self):
+        if self._prefix_jump_table is None:
+            self._prefix_jump_table = PrefixJumpTable.from_kmer_blocks(
+                self.graph_kmer_sequence.kmer_blocks(),
+                kmer_size=self.header.kmer_size,
+                kmer_container_size=self.header.kmer_container_size,
+                prefix_length=self.prefix_length,
+            )
+        return self._prefix_jump_table
+
+    def _get_record_for_uints(self, uints):
+        """Return the record of kmer uints, or None if the kmer is not in the graph"""
+        index = self._get_index_for_uints(uints)
         if index < self.n_records:
             if KmerUintComparator(uints) == self.graph_kmer_sequence[index]:
-                kmer_data = self.graph_sequence[index]
-                kmer_data._kmer = lexlo_string
-                return kmer_data
-        raise KeyError('Could not retrieve kmer: ' + lexlo_string)
+                return self.graph_sequence.get_record(index)
+        return None
+
+    def _get_kmer_data(self, lexlo_key, to_uints):
+        """Return the kmer data of a lexlo kmer string or integer, using the record cache"""
+        record = self.record_cache.get(lexlo_key, _NOT_CACHED)
+        if record is _NOT_CACHED:
+            record = self._get_record_for_uints(to_uints(lexlo_key))
+            self.record_cache.put(lexlo_key, record, self._cache_entry_size)
+        if record is None:
+            raise KeyError('Could not retrieve kmer: {}'.format(lexlo_key))
+        return KmerData(record, kmer_size=self.header.kmer_size,
+                        num_colors=self.header.num_colors)
+
+    def _get_kmer_data_for_string(self, lexlo_string):
+        kmer_data = self._get_kmer_data(lexlo_string,
+                                        self.graph_kmer_sequence.kmer_string_converter.to_uints)
+        kmer_data._kmer = lexlo_string
+        return kmer_data
 
     def __getitem__(self, lexlo_string):
         """Return kmer associated with kmer string
@@ -156,6 +265,67 @@ class RandomAccess(Mapping):
         """Will compute the revcomp of kmer string before getting a kmer"""
         return self[lexlo(string)]
 
+    def get_kmer_for_int(self, kmer_int):
+        """Return the kmer of an integer-encoded kmer (see :py:mod:`cortexpy.int_kmer`)
+
+        The kmer is canonicalized and searched for without converting it to a string."""
+        codec = self._int_kmer_codec
+        return Kmer.from_kmer_data(self._get_kmer_data(codec.lexlo(kmer_int), codec.to_uints))
+
+    def get_kmers_for_strings(self, strings):
+        """Return a list of kmers, or None for missing kmers, in the order of the input strings
+
+        Kmers are first looked up in the record cache. The kmers that are not cached are
+        converted to lexlo kmer uints in one pass and searched for with the sparse index or the
+        prefix jump table if the graph has one. Otherwise, the uints are sorted and searched for
+        in a single sweep over the graph. Retrieved records and missing kmers are then cached.
+        """
+        lexlo_strings = [lexlo(string) for string in strings]
+        records = {}
+        uncached_strings = []
+        for lexlo_string in lexlo_strings:
+            if lexlo_string in records:
+                continue
+            record = self.record_cache.get(lexlo_string, _NOT_CACHED)
+            records[lexlo_string] = record
+            if record is _NOT_CACHED:
+                uncached_strings.append(lexlo_string)
+        for lexlo_string, record in zip(uncached_strings,
+                                        self._get_records_for_strings(uncached_strings)):
+            records[lexlo_string] = record
+            self.record_cache.put(lexlo_string, record, self._cache_entry_size)
+
+        kmers = []
+        for lexlo_string in lexlo_strings:
+            record = records[lexlo_string]
+            if record is None:
+                kmers.append(None)
+                continue
+            kmer_data = KmerData(record, kmer_size=self.header.kmer_size,
+                                 num_colors=self.header.num_colors)
+            kmer_data._kmer = lexlo_string
+            kmers.append(Kmer.from_kmer_data(kmer_data))
+        return kmers
+
+    def _get_records_for_strings(self, lexlo_strings):
+        """Return the record of each lexlo kmer string, or None if the kmer is not in the graph"""
+        if not lexlo_strings:
+            return []
+        uint_vectors = self.graph_kmer_sequence.kmer_string_converter.to_uint_vectors(
+            lexlo_strings)
+        has_index = self.sparse_index is not None or (self.prefix_length is not None
+                                                      and not self.load_kmer_uints)
+        if has_index:
+            return [self._get_record_for_uints(uints) for uints in uint_vectors]
+        records = [None for _ in lexlo_strings]
+        order = np.lexsort(uint_vectors.T[::-1])
+        indices = self.graph_kmer_sequence.index_sorted_uint_vectors(uint_vectors[order])
+        for query_idx, index in zip(order, indices):
+            if index < self.n_records:
+                if KmerUintComparator(uint_vectors[query_idx]) == self.graph_kmer_sequence[index]:
+                    records[query_idx] = self.graph_sequence.get_record(index)
+        return records
+
     @property
     def num_colors(self):
         return self.header.num_colors
@@ -173,6 +343,64 @@ class RandomAccess(Mapping):
         return self.header.kmer_size
 
 
+@attr.s(slots=True, repr=False)
+class MmapRandomAccess(RandomAccess):
+    """Provide fast k-mer access to a memory-mapped Cortex graph in log(n) time
+
+    The graph is mapped into memory once. Kmer lookups neither seek nor read the graph handle,
+    and the records they return are zero-copy views of the mapped graph body.
+
+    The map is released by :py:meth:`close` or by leaving the object as a context manager. Kmers
+    retrieved from the graph are views of the map, so they need to be dropped before.
+    """
+    _mmap = attr.ib(init=False, default=None)
+    body = attr.ib(init=False, default=None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Drop all views of the mapped graph and close the memory map
+
+        The record cache is emptied. The graph handle is left open."""
+        self.record_cache = make_record_cache(self.cache_policy, self.cache_bytes)
+        self.graph_sequence = None
+        self.graph_kmer_sequence = None
+        self._prefix_jump_table = None
+        self.body = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def _build_sequences(self, body_start):
+        self.body = self._map_graph()[body_start:]
+        self.graph_sequence = MmapKmerRecordSequence(graph_handle=self.graph_handle,
+                                                     body_start=body_start,
+                                                     header=self.header,
+                                                     n_records=self.n_records,
+                                                     body=self.body)
+        self.graph_kmer_sequence = MmapKmerUintSequence(graph_handle=self.graph_handle,
+                                                        body_start=body_start,
+                                                        header=self.header,
+                                                        n_records=self.n_records,
+                                                        body=self.body)
+
+    def _map_graph(self):
+        """Return a read-only memoryview of the whole graph file
+
+        In-memory handles such as :py:class:`io.BytesIO` have no file descriptor, so their
+        buffer is used instead."""
+        try:
+            fileno = self.graph_handle.fileno()
+        except (AttributeError, io.UnsupportedOperation):
+            return self.graph_handle.getbuffer()
+        self._mmap = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+        return memoryview(self._mmap)
+
+
 @attr.s(slots=True)
 class KmerRecordSequence(Sequence):
     graph_handle = attr.ib()
@@ -193,19 +421,29 @@ class KmerRecordSequence(Sequence):
     def __getitem__(self, item):
         if item >= self.n_records or item < 0:
             raise IndexError("Index ({}) is out of range".format(item))
-        return self._get_kmer_data_for_item(item)
+        return KmerData(
+            self.get_record(item),
+            kmer_size=self.kmer_size,
+            num_colors=self.num_colors,
+        )
 
     def __len__(self):
         return max(0, self.n_records)
 
-    def _get_kmer_data_for_item(self, item):
+    def get_record(self, item):
+        """Return the raw bytes of a record"""
         self.graph_handle.seek(self.body_start + self.record_size * item)
-        kmer_bytes = self.graph_handle.read(self.record_size)
-        return KmerData(
-            kmer_bytes,
-            kmer_size=self.kmer_size,
-            num_colors=self.num_colors,
-        )
+        return self.graph_handle.read(self.record_size)
+
+
+@attr.s(slots=True)
+class MmapKmerRecordSequence(KmerRecordSequence):
+    """A KmerRecordSequence that slices records out of a mapped graph body"""
+    body = attr.ib(kw_only=True)
+
+    def get_record(self, item):
+        start = self.record_size * item
+        return self.body[start:start + self.record_size]
 
 
 @attr.s(slots=True)
@@ -241,8 +479,123 @@ class KmerUintSequence(Sequence):
         uints = self.kmer_string_converter.to_uints(kmer_string)
         return self.index_uint_vector(uints)
 
+    def index_uint_vector(self, uints, lo=0, hi=None):
+        if hi is None:
+            hi = len(self)
+        return bisect_left(self, KmerUintComparator(uints), lo, hi)
+
+    def index_uint_vector_in_range(self, uints, start, stop):
+        """Return the insertion index of uints, which is known to lie in [start, stop]
+
+        The kmer uints of records [start, stop) are read at once and searched in memory."""
+        page = self._get_kmer_columns(start, stop).kmers
+        page = KmerUintArray(np.ascontiguousarray(page.T, dtype=np.uint64),
+                             kmer_string_converter=self.kmer_string_converter)
+        return start + page.index_uint_vector(uints)
+
+    def _get_kmer_columns(self, start, stop):
+        self.graph_handle.seek(self.body_start + self.record_size * start)
+        return KmerColumns.from_buffer(self.graph_handle.read(self.record_size * (stop - start)),
+                                       self.header)
+
+    def index_sorted_uint_vectors(self, uint_vectors):
+        """Return the insertion indices of sorted kmer uint vectors
+
+        Every search starts where the previous search ended, so the searched range keeps
+        shrinking as the sweep proceeds."""
+        indices = []
+        lower_bound = 0
+        for uints in uint_vectors:
+            lower_bound = bisect_left(self, KmerUintComparator(uints), lo=lower_bound)
+            indices.append(lower_bound)
+        return indices
+
+    def kmer_blocks(self):
+        """Generate blocks of kmer uints of all records as (n, kmer_container_size) arrays"""
+        self.graph_handle.seek(self.body_start)
+        for block in kmer_columns_generator_from_stream_and_header(self.graph_handle,
+                                                                   self.header,
+                                                                   n_records=self.n_records):
+            yield block.kmers
+
+    def to_array(self):
+        """Load the kmer uints of all records into a :py:class:`KmerUintArray`"""
+        columns = np.empty((self.kmer_container_size, self.n_records), dtype=np.uint64)
+        start = 0
+        for kmers in self.kmer_blocks():
+            columns[:, start:(start + len(kmers))] = kmers.T
+            start += len(kmers)
+        return KmerUintArray(columns, kmer_string_converter=self.kmer_string_converter)
+
+
+@attr.s(slots=True)
+class MmapKmerUintSequence(KmerUintSequence):
+    """A KmerUintSequence that reads kmer uints out of a mapped graph body without copying"""
+    body = attr.ib(kw_only=True)
+
+    def _get_kmer_data_for_item(self, item):
+        return np.frombuffer(self.body, dtype='<u8', count=self.kmer_container_size,
+                             offset=self.record_size * item)
+
+    def _get_kmer_columns(self, start, stop):
+        return KmerColumns.from_buffer(self.body, self.header, n_records=stop - start,
+                                       offset=self.record_size * start)
+
+    def kmer_blocks(self):
+        yield KmerColumns.from_buffer(self.body, self.header, n_records=self.n_records).kmers
+
+    def to_array(self):
+        kmers = KmerColumns.from_buffer(self.body, self.header, n_records=self.n_records).kmers
+        columns = np.ascontiguousarray(kmers.T, dtype=np.uint64)
+        return KmerUintArray(columns, kmer_string_converter=self.kmer_string_converter)
+
+
+@attr.s(slots=True)
+class KmerUintArray(Sequence):
+    """Kmer uints of all records of a graph held in memory
+
+    Each kmer container word is stored as its own contiguous column, so that kmer uint vectors
+    are located with :py:func:`numpy.searchsorted` instead of a bisection in Python.
+    """
+    columns = attr.ib()
+    kmer_string_converter = attr.ib()
+
+    def __getitem__(self, item):
+        if item >= len(self) or item < 0:
+            raise IndexError("Index ({}) is out of range".format(item))
+        return KmerUintComparator(kmer_uints=self.columns[:, item])
+
+    def __len__(self):
+        return self.columns.shape[1]
+
+    def index_kmer_string(self, kmer_string):
+        uints = self.kmer_string_converter.to_uints(kmer_string)
+        return self.index_uint_vector(uints)
+
     def index_uint_vector(self, uints):
-        return bisect_left(self, KmerUintComparator(uints))
+        """Return the index at which uints would be inserted to keep the kmers sorted"""
+        start, stop = 0, len(self)
+        for column, uint in zip(self.columns, np.asarray(uints, dtype=np.uint64)):
+            word_range = column[start:stop]
+            start, stop = (start + np.searchsorted(word_range, uint, side='left'),
+                           start + np.searchsorted(word_range, uint, side='right'))
+            if start == stop:
+                break
+        return int(start)
+
+    def index_uint_vectors(self, uint_vectors):
+        """Return the insertion indices of a 2D array of kmer uint vectors, one per row"""
+        uint_vectors = np.asarray(uint_vectors, dtype=np.uint64).reshape(-1, len(self.columns))
+        starts = np.searchsorted(self.columns[0], uint_vectors[:, 0], side='left')
+        if len(self.columns) == 1:
+            return starts
+        stops = np.searchsorted(self.columns[0], uint_vectors[:, 0], side='right')
+        for row in np.flatnonzero(stops - starts > 0):
+            starts[row] = self.index_uint_vector(uint_vectors[row])
+        return starts
+
+    def index_sorted_uint_vectors(self, uint_vectors):
+        return self.index_uint_vectors(uint_vectors)
 
 
 def load_ra_cortex_graph(file_handle, ra_parser_args=None):
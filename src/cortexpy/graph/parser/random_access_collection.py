@@ -3,6 +3,7 @@ from itertools import chain
 
 import attr
 
+from cortexpy.int_kmer import get_int_kmer_codec
 from cortexpy.utils import lexlo
 from .kmer import Kmer, EmptyKmerBuilder
 from .kmer_collection import KmerDataCollection
@@ -47,6 +48,43 @@ class RandomAccessCollection(Mapping):
         """Will compute the revcomp of string before getting a kmer"""
         return self[lexlo(string)]
 
+    def get_kmer_for_int(self, kmer_int):
+        """Return the kmer of an integer-encoded kmer (see :py:mod:`cortexpy.int_kmer`)"""
+        codec = get_int_kmer_codec(self.kmer_size)
+        kmers = [None for _ in self.ra_parsers]
+        for parser_idx, parser in enumerate(self.ra_parsers):
+            try:
+                kmers[parser_idx] = parser.get_kmer_for_int(kmer_int)
+            except KeyError:
+                pass
+        if all(kmer is None for kmer in kmers):
+            raise KeyError
+        lexlo_string = None
+        for parser_idx, kmer in enumerate(kmers):
+            if kmer is None:
+                if lexlo_string is None:
+                    lexlo_string = codec.decode(codec.lexlo(kmer_int))
+                kmers[parser_idx] = self.empty_kmer_builders[parser_idx].build_or_get(
+                    lexlo_string)
+        return Kmer.from_kmer_data(KmerDataCollection(kmers))
+
+    def get_kmers_for_strings(self, strings):
+        """Return a list of kmers, or None for missing kmers, in the order of the input strings"""
+        lexlo_strings = [lexlo(string) for string in strings]
+        parser_kmers = [parser.get_kmers_for_strings(lexlo_strings) for parser in self.ra_parsers]
+        kmers = []
+        for query_idx, lexlo_string in enumerate(lexlo_strings):
+            query_kmers = [p_kmers[query_idx] for p_kmers in parser_kmers]
+            if all(kmer is None for kmer in query_kmers):
+                kmers.append(None)
+                continue
+            for parser_idx, kmer in enumerate(query_kmers):
+                if kmer is None:
+                    query_kmers[parser_idx] = self.empty_kmer_builders[parser_idx].build_or_get(
+                        lexlo_string)
+            kmers.append(Kmer.from_kmer_data(KmerDataCollection(query_kmers)))
+        return kmers
+
     @property
     def sample_names(self):
         return chain.from_iterable(ra.sample_names for ra in self.ra_parsers)
@@ -0,0 +1,169 @@
+"""Record caches
+================
+
+This module contains bounded caches of Cortex graph records for random access parsers. The size
+of a cache is limited by a byte budget and entries are evicted with either a least recently used
+(LRU) or a CLOCK policy. Each cache counts its hits, misses and evictions.
+"""
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+import attr
+
+DEFAULT_RECORD_CACHE_BYTES = 2 ** 26
+RECORD_CACHE_POLICIES = ('lru', 'clock')
+
+
+@attr.s(slots=True)
+class RecordCacheStats(object):
+    hits = attr.ib(0)
+    misses = attr.ib(0)
+    evictions = attr.ib(0)
+
+    @property
+    def hit_rate(self):
+        n_lookups = self.hits + self.misses
+        if n_lookups == 0:
+            return 0.0
+        return self.hits / n_lookups
+
+    def __str__(self):
+        return 'hits={} misses={} evictions={} hit_rate={:.3f}'.format(
+            self.hits, self.misses, self.evictions, self.hit_rate)
+
+
+@attr.s(slots=True)
+class RecordCache(ABC):
+    """Abstract base class of record caches that hold at most max_bytes bytes of entries"""
+    max_bytes = attr.ib()
+    n_bytes = attr.ib(0, init=False)
+    stats = attr.ib(attr.Factory(RecordCacheStats), init=False)
+
+    @abstractmethod
+    def get(self, key, default=None):
+        """Return the value cached for key, or default if key is not cached"""
+
+    @abstractmethod
+    def put(self, key, value, n_bytes):
+        """Cache value under key, evicting entries until n_bytes more bytes fit the budget
+
+        Values larger than the whole budget are not cached."""
+
+    @abstractmethod
+    def __len__(self):
+        """Return the number of cached entries"""
+
+
+@attr.s(slots=True)
+class LRURecordCache(RecordCache):
+    """A record cache that evicts the least recently used entry first"""
+    _entries = attr.ib(attr.Factory(OrderedDict), init=False)
+
+    def get(self, key, default=None):
+        try:
+            value, _ = self._entries[key]
+        except KeyError:
+            self.stats.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def put(self, key, value, n_bytes):
+        if n_bytes > self.max_bytes:
+            return
+        if key in self._entries:
+            _, old_n_bytes = self._entries.pop(key)
+            self.n_bytes -= old_n_bytes
+        while self.n_bytes + n_bytes > self.max_bytes:
+            _, (_, evicted_n_bytes) = self._entries.popitem(last=False)
+            self.n_bytes -= evicted_n_bytes
+            self.stats.evictions += 1
+        self._entries[key] = (value, n_bytes)
+        self.n_bytes += n_bytes
+
+    def __len__(self):
+        return len(self._entries)
+
+
+@attr.s(slots=True)
+class ClockRecordCache(RecordCache):
+    """A record cache that approximates LRU eviction with the CLOCK algorithm
+
+    Entries are kept in a ring of slots, each with a reference bit that is set on every hit. The
+    clock hand sweeps the ring, clearing set reference bits, and evicts the first entry whose
+    reference bit is already clear. Unlike LRU, a hit only sets a bit.
+    """
+    _slots = attr.ib(attr.Factory(dict), init=False)
+    _keys = attr.ib(attr.Factory(list), init=False)
+    _values = attr.ib(attr.Factory(list), init=False)
+    _sizes = attr.ib(attr.Factory(list), init=False)
+    _referenced = attr.ib(attr.Factory(bytearray), init=False)
+    _free_slots = attr.ib(attr.Factory(list), init=False)
+    _hand = attr.ib(0, init=False)
+
+    def get(self, key, default=None):
+        slot = self._slots.get(key)
+        if slot is None:
+            self.stats.misses += 1
+            return default
+        self._referenced[slot] = 1
+        self.stats.hits += 1
+        return self._values[slot]
+
+    def put(self, key, value, n_bytes):
+        if n_bytes > self.max_bytes:
+            return
+        if key in self._slots:
+            self._free_slot(self._slots[key])
+        while self.n_bytes + n_bytes > self.max_bytes:
+            self._evict()
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self._keys[slot] = key
+            self._values[slot] = value
+            self._sizes[slot] = n_bytes
+            self._referenced[slot] = 0
+        else:
+            slot = len(self._keys)
+            self._keys.append(key)
+            self._values.append(value)
+            self._sizes.append(n_bytes)
+            self._referenced.append(0)
+        self._slots[key] = slot
+        self.n_bytes += n_bytes
+
+    def __len__(self):
+        return len(self._slots)
+
+    def _evict(self):
+        while True:
+            if self._hand >= len(self._keys):
+                self._hand = 0
+            slot = self._hand
+            self._hand += 1
+            if self._keys[slot] is None:
+                continue
+            if self._referenced[slot]:
+                self._referenced[slot] = 0
+                continue
+            self._free_slot(slot)
+            self.stats.evictions += 1
+            return
+
+    def _free_slot(self, slot):
+        del self._slots[self._keys[slot]]
+        self.n_bytes -= self._sizes[slot]
+        self._keys[slot] = None
+        self._values[slot] = None
+        self._sizes[slot] = 0
+        self._free_slots.append(slot)
+
+
+def make_record_cache(policy, max_bytes):
+    """Return an empty record cache with eviction policy 'lru' or 'clock'"""
+    if policy == 'lru':
+        return LRURecordCache(max_bytes)
+    if policy == 'clock':
+        return ClockRecordCache(max_bytes)
+    raise ValueError('Unknown record cache policy: {}'.format(policy))
@@ -0,0 +1,126 @@
+"""Sparse kmer indices of Cortex graphs
+=======================================
+
+This module contains classes and functions for building, storing and loading a sparse kmer index
+of a sorted Cortex graph. The index stores the first kmer of every page of records and is kept in
+a sidecar file next to the graph. A kmer lookup then searches the index in memory and reads a
+single page of records from the graph.
+"""
+import os
+import struct
+
+import attr
+import numpy as np
+
+from cortexpy.graph.parser.columnar import kmer_columns_generator_from_stream_and_header
+from cortexpy.graph.parser.constants import UINT64_T
+from cortexpy.graph.parser.header import Header
+
+SPARSE_INDEX_MAGIC_WORD = b'CTXIDX'
+SPARSE_INDEX_VERSION = 1
+SPARSE_INDEX_SUFFIX = '.idx'
+SPARSE_INDEX_HEADER_FORMAT = '<6s2I2QqQ'
+DEFAULT_PAGE_SIZE = 4096
+
+
+def sparse_index_path(graph_path):
+    """Return the path of the sidecar sparse index of a graph"""
+    return str(graph_path) + SPARSE_INDEX_SUFFIX
+
+
+@attr.s(slots=True)
+class SparseKmerIndex(object):
+    """The first kmer of every page of records_per_page records of a sorted Cortex graph
+
+    page_kmers is a (kmer_container_size, n_pages) uint64 array with one contiguous row per
+    kmer container word. The size and modification time of the indexed graph file are stored so
+    that a stale index can be detected.
+    """
+    records_per_page = attr.ib()
+    n_records = attr.ib()
+    graph_size = attr.ib()
+    graph_mtime_ns = attr.ib()
+    page_kmers = attr.ib()
+
+    @classmethod
+    def from_graph_path(cls, graph_path, page_size=DEFAULT_PAGE_SIZE):
+        """Build a sparse index of a graph with pages of about page_size bytes"""
+        graph_stat = os.stat(str(graph_path))
+        with open(str(graph_path), 'rb') as fh:
+            header = Header.from_stream(fh)
+            records_per_page = max(1, page_size // header.record_size)
+            page_kmers = []
+            n_records = 0
+            block_size = records_per_page * header.record_size * 1024
+            for columns in kmer_columns_generator_from_stream_and_header(fh, header,
+                                                                         block_size=block_size):
+                page_kmers.append(columns.kmers[::records_per_page])
+                n_records += len(columns)
+        if page_kmers:
+            page_kmers = np.concatenate(page_kmers)
+        else:
+            page_kmers = np.zeros((0, header.kmer_container_size))
+        return cls(records_per_page=records_per_page,
+                   n_records=n_records,
+                   graph_size=graph_stat.st_size,
+                   graph_mtime_ns=graph_stat.st_mtime_ns,
+                   page_kmers=np.ascontiguousarray(page_kmers.T, dtype=np.uint64))
+
+    @classmethod
+    def from_stream(cls, stream):
+        header_size = struct.calcsize(SPARSE_INDEX_HEADER_FORMAT)
+        (magic_word, version, kmer_container_size, records_per_page, n_records,
+         graph_mtime_ns, graph_size) = struct.unpack(SPARSE_INDEX_HEADER_FORMAT,
+                                                     stream.read(header_size))
+        if magic_word != SPARSE_INDEX_MAGIC_WORD:
+            raise ValueError('Saw magic word {} but was expecting {}'.format(
+                magic_word, SPARSE_INDEX_MAGIC_WORD))
+        if version != SPARSE_INDEX_VERSION:
+            raise ValueError('Unsupported sparse index version: {}'.format(version))
+        n_pages = -(-n_records // records_per_page)
+        page_kmers = np.frombuffer(stream.read(n_pages * kmer_container_size * UINT64_T),
+                                   dtype='<u8')
+        page_kmers = page_kmers.reshape(n_pages, kmer_container_size)
+        return cls(records_per_page=records_per_page,
+                   n_records=n_records,
+                   graph_size=graph_size,
+                   graph_mtime_ns=graph_mtime_ns,
+                   page_kmers=np.ascontiguousarray(page_kmers.T, dtype=np.uint64))
+
+    @property
+    def kmer_container_size(self):
+        return self.page_kmers.shape[0]
+
+    @property
+    def n_pages(self):
+        return self.page_kmers.shape[1]
+
+    def dump(self, buffer):
+        buffer.write(struct.pack(SPARSE_INDEX_HEADER_FORMAT,
+                                 SPARSE_INDEX_MAGIC_WORD,
+                                 SPARSE_INDEX_VERSION,
+                                 self.kmer_container_size,
+                                 self.records_per_page,
+                                 self.n_records,
+                                 self.graph_mtime_ns,
+                                 self.graph_size))
+        buffer.write(self.page_kmers.T.astype('<u8').tobytes())
+
+    def is_valid_for(self, graph_path):
+        """Return True if the graph file has not changed since this index was built"""
+        graph_stat = os.stat(str(graph_path))
+        return (graph_stat.st_size == self.graph_size
+                and graph_stat.st_mtime_ns == self.graph_mtime_ns)
+
+    def record_bounds(self, uints):
+        """Return the record range [start, stop] that contains the insertion index of uints"""
+        start, stop = 0, self.n_pages
+        for row, uint in zip(self.page_kmers, np.asarray(uints, dtype=np.uint64)):
+            words = row[start:stop]
+            start, stop = (start + np.searchsorted(words, uint, side='left'),
+                           start + np.searchsorted(words, uint, side='right'))
+            if start == stop:
+                break
+        page = int(start)
+        return (max(0, (page - 1) * self.records_per_page),
+                min(self.n_records, page * self.records_per_page))
@@ -1,8 +1,13 @@
 import io
 
-from cortexpy.graph.parser.constants import UINT64_T
+from cortexpy.graph.parser.columnar import (
+    KmerColumns,
+    record_block_generator_from_stream_and_header,
+)
+from cortexpy.graph.parser.constants import RECORD_BLOCK_SIZE, UINT64_T
 from cortexpy.graph.parser.header import Header
-from cortexpy.graph.parser.kmer import Kmer, KmerData, RawKmerConverter
+from cortexpy.graph.parser.kmer import Kmer, KmerData
+from cortexpy.graph.parser.kmer_ext import raw_block_to_kmer_bytes
 from cortexpy.graph.cortex import build_cortex_graph_from_header
 
 
@@ -21,28 +26,49 @@ def kmer_string_generator_from_stream(stream):
     return kmer_string_generator_from_stream_and_header(stream, header)
 
 
-def kmer_string_generator_from_stream_and_header(stream, header):
-    record_size = header.kmer_container_size * UINT64_T + 5 * header.num_colors
-    kmer_container_size = header.kmer_container_size * UINT64_T
-    assert record_size >= kmer_container_size
-    kmer_converter = RawKmerConverter(header.kmer_size)
+def _record_size(header):
+    return header.kmer_container_size * UINT64_T + 5 * header.num_colors
+
+
+def keyed_record_generator_from_stream_and_header(stream, header, input_idx,
+                                                  block_size=RECORD_BLOCK_SIZE):
+    """Generate (kmer key, input_idx, record) tuples of the records of a sorted graph body
 
-    raw_kmer = stream.read(record_size)
-    while raw_kmer != b'':
-        yield kmer_converter.to_string(raw_kmer[:kmer_container_size])
-        raw_kmer = stream.read(record_size)
+    Kmer keys are big-endian kmer bytes, so they sort like kmers. input_idx identifies the stream
+    when the records of several streams are merged, for example with :py:func:`heapq.merge`."""
+    key_size = header.kmer_container_size * UINT64_T
+    record_size = _record_size(header)
+    prev_key = b''
+    for block in record_block_generator_from_stream_and_header(stream, header,
+                                                               block_size=block_size):
+        keys = KmerColumns.from_buffer(block, header).kmers.astype('>u8').tobytes()
+        for key_start, record_start in zip(range(0, len(keys), key_size),
+                                           range(0, len(block), record_size)):
+            key = keys[key_start:key_start + key_size]
+            if key <= prev_key:
+                raise ValueError('Graph {} is not sorted or contains duplicate kmers'.format(
+                    input_idx))
+            prev_key = key
+            yield key, input_idx, block[record_start:record_start + record_size]
+
+
+def kmer_string_generator_from_stream_and_header(stream, header):
+    kmer_size = header.kmer_size
+    for block in record_block_generator_from_stream_and_header(stream, header):
+        kmer_strings = raw_block_to_kmer_bytes(kmer_size, _record_size(header), block).decode()
+        for start in range(0, len(kmer_strings), kmer_size):
+            yield kmer_strings[start:start + kmer_size]
 
 
 def kmer_generator_from_stream_and_header(stream, header):
-    record_size = header.kmer_container_size * UINT64_T + 5 * header.num_colors
-    raw_record = stream.read(record_size)
-    while raw_record != b'':
-        yield Kmer.from_kmer_data(
-            KmerData(raw_record,
-                     header.kmer_size,
-                     header.num_colors)
-        )
-        raw_record = stream.read(record_size)
+    record_size = _record_size(header)
+    for block in record_block_generator_from_stream_and_header(stream, header):
+        for start in range(0, len(block), record_size):
+            yield Kmer.from_kmer_data(
+                KmerData(block[start:start + record_size],
+                         header.kmer_size,
+                         header.num_colors)
+            )
 
 
 def kmer_list_generator_from_stream_and_header(stream, header):
@@ -0,0 +1,275 @@
+"""Pruning Cortex graphs on disk
+================================
+
+This module contains functions for removing tips from a sorted Cortex graph without loading the
+graph into memory. The dead ends of the graph are found in a streaming pass over its records and
+each tip is walked with random access to the memory-mapped graph. The surviving records are then
+streamed to the output, with the edges to pruned kmers removed. Memory use is proportional to the
+number of pruned kmers, not to the size of the graph.
+
+Tips are found as in :py:meth:`cortexpy.graph.interactor.Interactor.prune_tips_less_than`: a tip
+is an unbranched path of fewer than n kmers that starts at a dead end of the graph.
+"""
+import logging
+import operator
+from functools import partial
+
+import attr
+import numpy as np
+
+from cortexpy.edge_set import ByteEdgeSet
+from cortexpy.graph.parser.columnar import KmerColumns, is_sorted_from_stream_and_header
+from cortexpy.graph.parser.constants import RECORD_BLOCK_SIZE, UINT64_T
+from cortexpy.graph.parser.header import Header
+from cortexpy.graph.parser.kmer import disconnect_kmers
+from cortexpy.graph.parser.parallel import parallel_map_records
+from cortexpy.graph.parser.random_access import MmapRandomAccess
+from cortexpy.graph.parser.streaming import record_block_generator_from_stream_and_header
+from cortexpy.graph.serializer.kmer import dumpable_header
+from cortexpy.int_kmer import get_int_kmer_codec
+
+logger = logging.getLogger(__name__)
+
+_process_ra_parsers = {}
+
+
+@attr.s(slots=True, frozen=True)
+class Tip(object):
+    """A tip of a graph
+
+    kmer_ints are the lexlo kmer ints of the tip in walk order, starting at its dead end.
+    coverage is the coverage of each of these kmers summed over all colors."""
+    kmer_ints = attr.ib()
+    coverage = attr.ib()
+
+    def __len__(self):
+        return len(self.kmer_ints)
+
+
+def union_edge_set(kmer):
+    """Return the :py:class:`~cortexpy.edge_set.ByteEdgeSet` of the edges of kmer in any color"""
+    byte = 0
+    for edge_set in kmer.edges:
+        byte |= edge_set.to_byte()
+    return ByteEdgeSet(byte)
+
+
+def _dead_ends(kmer_int, union_edge_byte):
+    if union_edge_byte & 0x0F == 0:
+        yield kmer_int, True
+    if union_edge_byte >> 4 == 0:
+        yield kmer_int, False
+
+
+def dead_end_kmer_ints(columns):
+    """Generate (kmer_int, walk_incoming) tuples of the dead ends in a block of records
+
+    A kmer without outgoing edges in any color is walked along its incoming edges and a kmer
+    without incoming edges is walked along its outgoing edges. Kmers without any edges are
+    generated twice."""
+    if len(columns) == 0:
+        return
+    union_edges = np.bitwise_or.reduce(columns.edges, axis=1)
+    no_outgoing = (union_edges & 0x0F) == 0
+    no_incoming = (union_edges >> 4) == 0
+    for row in np.flatnonzero(no_outgoing | no_incoming):
+        kmer_int = 0
+        for word in columns.kmers[row].tolist():
+            kmer_int = (kmer_int << 64) | word
+        yield from _dead_ends(kmer_int, int(union_edges[row]))
+
+
+def dead_end_kmer_ints_of_kmers(kmers, codec):
+    """Generate (kmer_int, walk_incoming) tuples of the dead ends among kmer objects
+
+    See :py:func:`dead_end_kmer_ints`."""
+    for kmer in kmers:
+        yield from _dead_ends(codec.encode(kmer.kmer), union_edge_set(kmer).to_byte())
+
+
+def find_tip_from(*, n, start, walk_incoming, kmer_mapping, codec):
+    """Return the :py:class:`Tip` starting at kmer int start, or None
+
+    Kmers are retrieved with kmer_mapping.get_kmer_for_int. The walk follows the union of the
+    edges of all colors and only looks at the edge set of each kmer, so it takes at most n
+    lookups. It stops before the first kmer with more than one incoming or outgoing neighbor, or
+    when it would follow an edge for the second time. If the walk is n kmers or longer, then None
+    is returned. Kmers that are walked through twice in opposite orientations count twice."""
+    kmer_ints = []
+    coverage = []
+    walked_edges = set()
+    kmer_int = start
+    for _ in range(n):
+        try:
+            kmer = kmer_mapping.get_kmer_for_int(kmer_int)
+        except KeyError:
+            break
+        edge_set = union_edge_set(kmer)
+        if edge_set.num_incoming() > 1 or edge_set.num_outgoing() > 1:
+            break
+        lexlo_int = codec.lexlo(kmer_int)
+        kmer_ints.append(lexlo_int)
+        coverage.append(int(sum(kmer.coverage)))
+        if walk_incoming:
+            neighbors = edge_set.get_incoming_kmer_ints(kmer_int, codec,
+                                                        is_lexlo=kmer_int == lexlo_int)
+        else:
+            neighbors = edge_set.get_outgoing_kmer_ints(kmer_int, codec,
+                                                        is_lexlo=kmer_int == lexlo_int)
+        edge = (kmer_int, next(iter(neighbors), None))
+        if edge[1] is None or edge in walked_edges:
+            break
+        walked_edges.add(edge)
+        kmer_int = edge[1]
+    else:
+        return None
+    return Tip(tuple(kmer_ints), tuple(coverage))
+
+
+def find_tips_less_than(n, dead_ends, kmer_mapping, kmer_size):
+    """Generate the tip of each dead end, or None if the tip is not shorter than n kmers
+
+    dead_ends are (kmer_int, walk_incoming) tuples. Each tip is only walked as far as its first
+    branching kmer, so the work is proportional to the number of dead ends times n."""
+    codec = get_int_kmer_codec(kmer_size)
+    for start, walk_incoming in dead_ends:
+        yield find_tip_from(n=n, start=start, walk_incoming=walk_incoming,
+                            kmer_mapping=kmer_mapping, codec=codec)
+
+
+def lexlo_kmer_ints_of_tips(tips, n):
+    """Return the set of lexlo kmer ints of the non-empty tips, logging how many there are"""
+    kmer_ints = set()
+    num_tips = 0
+    num_tips_to_prune = 0
+    for tip in tips:
+        num_tips += 1
+        if tip:
+            kmer_ints.update(tip.kmer_ints)
+            num_tips_to_prune += 1
+    logger.info('Found %s of %s tips shorter than %s.', num_tips_to_prune, num_tips, n)
+    return kmer_ints
+
+
+def process_ra_parser(graph_path):
+    """Return the :py:class:`~cortexpy.graph.parser.random_access.MmapRandomAccess` parser of
+    the graph at graph_path of this process
+
+    The graph is opened and mapped on the first call in each process and the parser is reused by
+    later calls. It stays open until :py:func:`close_process_ra_parsers` is called or the process
+    exits."""
+    ra_parser = _process_ra_parsers.get(graph_path)
+    if ra_parser is None:
+        ra_parser = MmapRandomAccess(open(graph_path, 'rb'))
+        _process_ra_parsers[graph_path] = ra_parser
+    return ra_parser
+
+
+def close_process_ra_parsers():
+    """Close the parsers opened by :py:func:`process_ra_parser` in this process"""
+    while _process_ra_parsers:
+        _, ra_parser = _process_ra_parsers.popitem()
+        ra_parser.close()
+        ra_parser.graph_handle.close()
+
+
+def tips_less_than_from_block(graph_path, n, header, block):
+    """Return the list of tips shorter than n kmers that start at the dead ends of a block of
+    records of the graph at graph_path
+
+    Tips are walked through the memory-mapped graph of :py:func:`process_ra_parser`, which is
+    opened once per process, so the function can be used with
+    :py:func:`~cortexpy.graph.parser.parallel.parallel_map_records`."""
+    ra_parser = process_ra_parser(graph_path)
+    dead_ends = dead_end_kmer_ints(KmerColumns.from_buffer(block, header))
+    return list(find_tips_less_than(n, dead_ends, ra_parser, header.kmer_size))
+
+
+def find_kmer_ints_of_tips_less_than(n, graph_path, n_workers=1, block_size=RECORD_BLOCK_SIZE):
+    """Return the lexlo kmer ints of all tips of a graph file that are shorter than n kmers
+
+    The records of the graph are scanned for dead ends by n_workers processes and each process
+    walks the tips of its dead ends."""
+    try:
+        tips = parallel_map_records(graph_path, partial(tips_less_than_from_block, graph_path, n),
+                                    n_workers=n_workers, reduce_func=operator.add, initial=[],
+                                    block_size=block_size)
+    finally:
+        close_process_ra_parsers()
+    return lexlo_kmer_ints_of_tips(tips, n)
+
+
+def replacement_records(kmer_ints_to_prune, ra_parser):
+    """Return a dict of the records that change when kmers are pruned
+
+    Keys are the kmer bytes of a record. Pruned kmers map to an empty record and the neighbors of
+    pruned kmers map to their record without the edges to pruned kmers."""
+    codec = get_int_kmer_codec(ra_parser.kmer_size)
+    pruned_strings = {codec.decode(kmer_int) for kmer_int in kmer_ints_to_prune}
+    neighbors = {}
+    for kmer_string in pruned_strings:
+        kmer = ra_parser[kmer_string]
+        edge_set = union_edge_set(kmer)
+        neighbor_strings = set(edge_set.get_outgoing_kmers(kmer_string))
+        neighbor_strings |= set(edge_set.get_incoming_kmers(kmer_string))
+        for neighbor_string in neighbor_strings - pruned_strings:
+            if neighbor_string not in neighbors:
+                try:
+                    neighbors[neighbor_string] = ra_parser[neighbor_string]
+                except KeyError:
+                    continue
+            disconnect_kmers(kmer, neighbors[neighbor_string], ra_parser.colors)
+
+    def record_key(kmer_string):
+        return codec.to_uints(codec.encode(kmer_string)).astype('<u8').tobytes()
+
+    replacements = {record_key(kmer_string): b'' for kmer_string in pruned_strings}
+    for kmer_string, kmer in neighbors.items():
+        replacements[record_key(kmer_string)] = kmer.to_bytes()
+    return replacements
+
+
+def copy_records_with_replacements(graph_handle, header, replacements, output,
+                                   block_size=RECORD_BLOCK_SIZE):
+    """Copy the records of a graph body from graph_handle to output, one write per block
+
+    Records whose kmer bytes are a key of replacements are replaced by the associated value."""
+    key_size = header.kmer_container_size * UINT64_T
+    record_size = header.record_size
+    for block in record_block_generator_from_stream_and_header(graph_handle, header,
+                                                               block_size=block_size):
+        if not replacements:
+            output.write(block)
+            continue
+        chunks = []
+        chunk_start = 0
+        for record_start in range(0, len(block), record_size):
+            replacement = replacements.get(block[record_start:record_start + key_size])
+            if replacement is not None:
+                chunks.append(block[chunk_start:record_start])
+                chunks.append(replacement)
+                chunk_start = record_start + record_size
+        chunks.append(block[chunk_start:])
+        output.write(b''.join(chunks))
+
+
+def prune_tips_less_than_from_graph_path(n, graph_path, output, n_workers=1,
+                                         block_size=RECORD_BLOCK_SIZE):
+    """Remove tips shorter than n kmers from a sorted graph and write the pruned graph to output
+
+    Tips are found by n_workers processes. Returns the number of pruned kmers. Raises ValueError
+    if the kmers of the graph are not unique and in ascending order."""
+    with open(graph_path, 'rb') as graph_handle:
+        header = Header.from_stream(graph_handle)
+        if not is_sorted_from_stream_and_header(graph_handle, header, block_size=block_size):
+            raise ValueError('Graph {} is not sorted'.format(graph_path))
+    kmer_ints_to_prune = find_kmer_ints_of_tips_less_than(n, graph_path, n_workers=n_workers,
+                                                          block_size=block_size)
+    logger.info('Pruning %s nodes', len(kmer_ints_to_prune))
+    with open(graph_path, 'rb') as graph_handle, MmapRandomAccess(graph_handle) as ra_parser:
+        replacements = replacement_records(kmer_ints_to_prune, ra_parser)
+        dumpable_header(ra_parser.header).dump(output)
+        graph_handle.seek(ra_parser.graph_sequence.body_start)
+        copy_records_with_replacements(graph_handle, ra_parser.header, replacements, output,
+                                       block_size=block_size)
+    return len(kmer_ints_to_prune)
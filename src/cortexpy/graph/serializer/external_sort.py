@@ -0,0 +1,120 @@
+"""External sorting of Cortex graph records
+============================================
+
+This module contains a sorter for writing Cortex graphs whose kmers are not available in sorted
+order. Encoded records are collected in runs of a bounded number of bytes. Each full run is
+sorted by kmer with NumPy and spilled to a temporary file. The sorted runs are then k-way merged
+into the body of the output graph, so graphs larger than memory can be written.
+"""
+import heapq
+import io
+import tempfile
+
+import attr
+import numpy as np
+
+from cortexpy.graph.parser.columnar import KmerColumns, record_dtype
+from cortexpy.graph.parser.constants import RECORD_BLOCK_SIZE
+from cortexpy.graph.parser.streaming import keyed_record_generator_from_stream_and_header
+
+DEFAULT_SORT_RUN_BYTES = 2 ** 28
+
+
+@attr.s(slots=True)
+class ExternalRecordSorter(object):
+    """Sort the records of a Cortex graph with header, keeping at most run_bytes bytes in memory
+
+    Records are added with :py:meth:`add_kmer` or :py:meth:`add_record`, in any order.
+    :py:meth:`dump` then writes the header and the records sorted by kmer. Runs are spilled to
+    temporary files in tmpdir, or in the default temporary directory if tmpdir is None.
+    Kmers need to be unique: a kmer that was added twice raises a ValueError, whether the two
+    records end up in the same run or in different runs.
+    """
+    header = attr.ib()
+    run_bytes = attr.ib(DEFAULT_SORT_RUN_BYTES)
+    tmpdir = attr.ib(None)
+    n_records = attr.ib(0, init=False)
+    _run = attr.ib(attr.Factory(io.BytesIO), init=False)
+    _spilled_runs = attr.ib(attr.Factory(list), init=False)
+    _dtype = attr.ib(init=False)
+
+    def __attrs_post_init__(self):
+        self._dtype = record_dtype(self.header)
+
+    def add_kmer(self, kmer):
+        self._run.write(kmer.to_bytes())
+        self._record_added()
+
+    def add_record(self, record):
+        assert len(record) == self.header.record_size
+        self._run.write(record)
+        self._record_added()
+
+    def _record_added(self):
+        self.n_records += 1
+        if self._run.tell() >= self.run_bytes:
+            self._spill_run()
+
+    def _sorted_run(self):
+        records = np.frombuffer(self._run.getbuffer(), dtype=self._dtype)
+        sorted_records = records[np.lexsort(records['kmer'].T[::-1])]
+        del records
+        kmers = sorted_records['kmer']
+        duplicates = np.flatnonzero(np.all(kmers[1:] == kmers[:-1], axis=1))
+        if len(duplicates) > 0:
+            self._raise_duplicate_kmer(kmers[duplicates[0]])
+        self._run = io.BytesIO()
+        return sorted_records.tobytes()
+
+    def _raise_duplicate_kmer(self, kmer_words):
+        columns = KmerColumns(kmers=np.asarray(kmer_words, dtype=np.uint64).reshape(1, -1),
+                              coverage=None, edges=None)
+        raise ValueError('Kmer {} was added more than once'.format(
+            columns.kmer_strings(self.header.kmer_size)[0]))
+
+    def _spill_run(self):
+        run_file = tempfile.TemporaryFile(dir=self.tmpdir)
+        run_file.write(self._sorted_run())
+        run_file.seek(0)
+        self._spilled_runs.append(run_file)
+
+    @property
+    def n_spilled_runs(self):
+        return len(self._spilled_runs)
+
+    def dump(self, buffer):
+        """Write the header and the sorted records to buffer
+
+        Raises ValueError if a kmer was added more than once. Duplicates within a run are found
+        before anything is written, duplicates across spilled runs while they are merged."""
+        if not self._spilled_runs:
+            sorted_run = self._sorted_run()
+            self.header.dump(buffer)
+            buffer.write(sorted_run)
+            return
+        if self._run.tell() > 0:
+            self._spill_run()
+        self.header.dump(buffer)
+        try:
+            self._merge_spilled_runs(buffer)
+        finally:
+            for run_file in self._spilled_runs:
+                run_file.close()
+            self._spilled_runs = []
+
+    def _merge_spilled_runs(self, buffer):
+        records = heapq.merge(*(
+            keyed_record_generator_from_stream_and_header(run_file, self.header, run_idx)
+            for run_idx, run_file in enumerate(self._spilled_runs)
+        ))
+        out_block = bytearray()
+        prev_key = None
+        for key, _, record in records:
+            if key == prev_key:
+                self._raise_duplicate_kmer(np.frombuffer(key, dtype='>u8'))
+            prev_key = key
+            out_block += record
+            if len(out_block) >= RECORD_BLOCK_SIZE:
+                buffer.write(out_block)
+                out_block = bytearray()
+        buffer.write(out_block)
@@ -0,0 +1,80 @@
+"""GFA export of unitig graphs
+============================
+
+This module contains writers of unitig graphs in the
+`GFA1 format <https://github.com/GFA-spec/GFA-spec/blob/master/GFA1.md>`_. Each unitig is a
+segment (S line) and each pair of linked unitig ends is a link (L line) with an overlap of
+kmer_size - 1 bases.
+
+Segments carry the kmer coverage of the unitig summed over all kmers and colors in a ``KC:i`` tag,
+as read by assembly graph viewers such as Bandage, and the kmer coverage of each color in a
+``cc:B:I`` array tag. Links carry the colors in which the unitig ends are linked in a ``cl:B:I``
+array tag.
+
+Lines are written to a text stream as soon as they are built. Unitig records of a
+:py:class:`~cortexpy.graph.columnar_graph.ColumnarGraph` are streamed without building a unitig
+graph, so memory use does not grow with the number of segments written.
+"""
+from collections import defaultdict
+
+GFA_HEADER = 'H\tVN:Z:1.0\n'
+
+
+def segment_line(name, sequence, color_coverage):
+    """Return the S line of a segment with the kmer coverage of each color"""
+    color_coverage = [int(coverage) for coverage in color_coverage]
+    return 'S\t{}\t{}\tLN:i:{}\tKC:i:{}\tcc:B:I,{}\n'.format(
+        name, sequence, len(sequence), sum(color_coverage), ','.join(map(str, color_coverage))
+    )
+
+
+def link_line(source, source_is_reversed, target, target_is_reversed, overlap, colors):
+    """Return the L line of a link from the end of source to the start of target in colors"""
+    return 'L\t{}\t{}\t{}\t{}\t{}M\tcl:B:I,{}\n'.format(
+        source, '-' if source_is_reversed else '+', target, '-' if target_is_reversed else '+',
+        overlap, ','.join(map(str, colors))
+    )
+
+
+def write_unitig_records(records, output):
+    """Write the unitigs of :py:class:`~cortexpy.graph.columnar_unitig.UnitigRecords` as GFA
+
+    Segments are named by their unitig index. All segments are written before the links, and
+    each link is written once in its canonical orientation."""
+    overlap = records.graph.header.kmer_size - 1
+    output.write(GFA_HEADER)
+    for unitig in range(len(records)):
+        output.write(segment_line(unitig, records.sequence(unitig),
+                                  records.coverage(unitig).sum(axis=0)))
+    for unitig in range(len(records)):
+        colors_by_link_ends = defaultdict(list)
+        for link in records.canonical_links_from(unitig):
+            colors_by_link_ends[(link.source_is_reversed, link.target,
+                                 link.target_is_reversed)].append(link.color)
+        for (source_is_reversed, target, target_is_reversed), colors in \
+                colors_by_link_ends.items():
+            output.write(link_line(unitig, source_is_reversed, target, target_is_reversed,
+                                   overlap, colors))
+
+
+def write_unitig_graph(unitig_graph, output):
+    """Write a unitig graph built by
+    :py:meth:`~cortexpy.graph.serializer.unitig.UnitigCollapser.collapse_kmer_unitigs` as GFA
+
+    The unitigs of the graph are consistently oriented, so all links join forward segments.
+    Segments are named by their position in the node order of unitig_graph."""
+    overlap = unitig_graph.graph['kmer_size'] - 1
+    num_colors = len(unitig_graph.graph['colors'])
+    name_of_node = {}
+    output.write(GFA_HEADER)
+    for name, (node, data) in enumerate(unitig_graph.nodes(data=True)):
+        name_of_node[node] = name
+        color_coverage = [0] * num_colors
+        for kmer_coverage in data['coverage']:
+            for color, coverage in enumerate(kmer_coverage):
+                color_coverage[color] += int(coverage)
+        output.write(segment_line(name, data['unitig'], color_coverage))
+    for source, colors_by_target in unitig_graph.succ.items():
+        for target, colors in colors_by_target.items():
+            output.write(link_line(name_of_node[source], False, name_of_node[target], False,
+                                   overlap, sorted(colors)))
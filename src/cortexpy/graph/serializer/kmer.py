@@ -2,8 +2,10 @@ import struct
 
 import attr
 
+from cortexpy.graph.parser.constants import RECORD_BLOCK_SIZE
 from cortexpy.graph.parser.header import Header
 from cortexpy.graph.parser.kmer import calc_kmer_container_size
+from cortexpy.graph.serializer.external_sort import DEFAULT_SORT_RUN_BYTES, ExternalRecordSorter
 
 
 @attr.s(slots=True)
@@ -16,6 +18,14 @@ class ColorInformationBlock(object):
     cov_threshold_on_kmers = attr.ib(0)
     name_of_graph_cleaned_against = attr.ib(b'')
 
+    @classmethod
+    def from_header_block(cls, block):
+        """Build a color information block from a block parsed by
+        :py:meth:`~cortexpy.graph.parser.header.Header.from_stream`"""
+        values, name_of_graph_cleaned_against = block
+        flags = [flag != b'\x00' for flag in values[:4]]
+        return cls(*flags, values[4], values[5], name_of_graph_cleaned_against)
+
     def dump(self, buffer):
         assert isinstance(self.name_of_graph_cleaned_against, bytes)
         string_length = len(self.name_of_graph_cleaned_against)
@@ -31,13 +41,52 @@ class ColorInformationBlock(object):
         buffer.write(self.name_of_graph_cleaned_against)
 
 
-def dump_colored_de_bruijn_graph_to_cortex(graph, output_fh):
-    Kmers(keys=list(graph.nodes()),
-          val_callable=lambda k: graph.node[k],
-          sample_names=graph.graph['sample_names'],
-          kmer_size=graph.graph['kmer_size'],
-          num_colors=graph.graph['num_colors']) \
-        .dump(output_fh)
+def dumpable_header(header):
+    """Return a header parsed by :py:meth:`~cortexpy.graph.parser.header.Header.from_stream`
+    with its color information blocks converted to :py:class:`ColorInformationBlock` objects, so
+    that it can be dumped"""
+    return attr.evolve(header,
+                       color_info_blocks=[ColorInformationBlock.from_header_block(block)
+                                          for block in header.color_info_blocks])
+
+
+def dump_colored_de_bruijn_graph_to_cortex(graph, output_fh, run_bytes=DEFAULT_SORT_RUN_BYTES,
+                                           tmpdir=None, color_info_blocks=None):
+    """Write a colored de Bruijn graph to a Cortex graph file handle
+
+    The kmers are sorted with an external sorter that keeps at most run_bytes bytes of records
+    in memory (see :py:mod:`cortexpy.graph.serializer.external_sort`). The header gets empty
+    color information blocks unless color_info_blocks are given."""
+    header = build_header(sample_names=graph.graph['sample_names'],
+                          kmer_size=graph.graph['kmer_size'],
+                          num_colors=graph.graph['num_colors'],
+                          color_info_blocks=color_info_blocks)
+    sorter = ExternalRecordSorter(header, run_bytes=run_bytes, tmpdir=tmpdir)
+    for kmer_string in graph.nodes():
+        sorter.add_kmer(graph.node[kmer_string])
+    sorter.dump(output_fh)
+
+
+def write_kmer_records(kmers, buffer, block_size=RECORD_BLOCK_SIZE):
+    """Write the records of kmers to buffer in blocks of about block_size bytes"""
+    block = bytearray()
+    for kmer in kmers:
+        block += kmer.to_bytes()
+        if len(block) >= block_size:
+            buffer.write(block)
+            block = bytearray()
+    if block:
+        buffer.write(block)
+
+
+def build_header(*, sample_names, kmer_size, num_colors, color_info_blocks=None):
+    if color_info_blocks is None:
+        color_info_blocks = [ColorInformationBlock() for _ in range(num_colors)]
+    return Header(kmer_size=kmer_size,
+                  kmer_container_size=calc_kmer_container_size(kmer_size),
+                  num_colors=num_colors,
+                  sample_names=sample_names,
+                  color_info_blocks=color_info_blocks)
 
 
 @attr.s(slots=True)
@@ -60,15 +109,11 @@ class Kmers(object):
 
     @property
     def header(self):
-        color_info_blocks = [ColorInformationBlock() for _ in range(self.num_colors)]
-        return Header(kmer_size=self.kmer_size,
-                      kmer_container_size=self.kmer_container_size,
-                      num_colors=self.num_colors,
-                      sample_names=self.sample_names,
-                      color_info_blocks=color_info_blocks)
+        return build_header(sample_names=self.sample_names,
+                            kmer_size=self.kmer_size,
+                            num_colors=self.num_colors)
 
     def dump(self, buffer):
         """to a filehandle"""
         self.header.dump(buffer)
-        for kmer_string in self.keys:
-            self.val_callable(kmer_string).dump(buffer)
+        write_kmer_records((self.val_callable(kmer_string) for kmer_string in self.keys), buffer)
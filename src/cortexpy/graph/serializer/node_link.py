@@ -0,0 +1,98 @@
+"""Streaming node-link JSON of unitig graphs
+==========================================
+
+This module contains writers of unitig graphs in the node-link JSON format of
+:py:func:`networkx.readwrite.json_graph.node_link_data` with ``attrs={'link': 'edges'}``.
+
+Nodes are given integer IDs as they are written and each node and edge is serialized on its own,
+so the JSON document is never held in memory. Node coverage is written by color, as a list of the
+kmer coverages of the unitig in each color.
+"""
+import json
+
+from cortexpy.graph.serializer.unitig import Unitig
+
+
+def graph_data(graph_attrs, colors):
+    """Return the JSON representable graph attributes of a unitig graph"""
+    graph_attrs = dict(graph_attrs)
+    graph_attrs['colors'] = list(colors)
+    if 'sample_names' in graph_attrs:
+        graph_attrs['sample_names'] = [name.decode() if isinstance(name, bytes) else name
+                                       for name in graph_attrs['sample_names']]
+    return graph_attrs
+
+
+def node_data(data, node_id):
+    """Return the JSON representable data of a unitig node with coverage by color"""
+    data = dict(data)
+    coverage = []
+    for coverage_list in data['coverage']:
+        try:
+            coverage_list = coverage_list.tolist()
+        except AttributeError:
+            pass
+        coverage.append([int(i) for i in coverage_list])
+    data['coverage'] = [list(c) for c in zip(*coverage)]
+    data['id'] = node_id
+    return data
+
+
+def write_node_link_json(graph_attrs, nodes, edges, output):
+    """Write the node data dicts nodes and the (source, target, key) tuples edges as a
+    node-link JSON document to the text stream output"""
+    output.write('{"directed": true, "multigraph": true, "graph": ')
+    output.write(json.dumps(graph_attrs))
+    output.write(', "nodes": [')
+    for idx, node in enumerate(nodes):
+        if idx:
+            output.write(', ')
+        output.write(json.dumps(node))
+    output.write('], "edges": [')
+    for idx, (source, target, key) in enumerate(edges):
+        if idx:
+            output.write(', ')
+        output.write(json.dumps({'source': source, 'target': target, 'key': key}))
+    output.write(']}')
+
+
+def write_unitig_graph(unitig_graph, colors, output):
+    """Write a unitig graph built by
+    :py:meth:`~cortexpy.graph.serializer.unitig.UnitigCollapser.collapse_kmer_unitigs` as
+    node-link JSON
+
+    Nodes are numbered in the node order of unitig_graph."""
+    id_of_node = {}
+
+    def nodes():
+        for node, data in unitig_graph.nodes(data=True):
+            id_of_node[node] = len(id_of_node)
+            yield node_data(data, id_of_node[node])
+
+    def edges():
+        for source, target, key in unitig_graph.edges(keys=True):
+            yield id_of_node[source], id_of_node[target], key
+
+    write_node_link_json(graph_data(unitig_graph.graph, colors), nodes(), edges(), output)
+
+
+def write_unitig_records(records, colors, output):
+    """Write the unitigs of :py:class:`~cortexpy.graph.columnar_unitig.UnitigRecords` as
+    node-link JSON
+
+    Unitigs are oriented as in
+    :py:meth:`~cortexpy.graph.serializer.unitig.UnitigCollapser.collapse_kmer_unitigs` and are
+    numbered by their unitig index. Each node is built from the unitig records just before it is
+    written."""
+    links = records.links()
+    is_reversed = records.consistent_orientations(links)
+    cycles = records.cycles(links)
+
+    def nodes():
+        for idx in range(len(records)):
+            unitig = Unitig.from_unitig_records(records, idx, is_reversed[idx], idx in cycles)
+            yield node_data({'repr': unitig.repr, 'unitig': unitig.contig,
+                             'coverage': unitig.coverage}, idx)
+
+    write_node_link_json(graph_data(records.graph.graph, colors), nodes(),
+                         records.consistent_edges(links, is_reversed, cycles), output)
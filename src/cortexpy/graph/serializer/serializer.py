@@ -1,13 +1,30 @@
-import json
+import io
 
 import attr
-import networkx as nx
-from networkx.readwrite import json_graph
 
+from cortexpy.graph.columnar_graph import ColumnarGraph
+from cortexpy.graph.columnar_unitig import UnitigRecords
 from cortexpy.graph.interactor import CortexDiGraph, Interactor
+from cortexpy.graph.parser.columnar import is_sorted_from_stream_and_header
+from cortexpy.graph.parser.header import Header
+from cortexpy.graph.parser.streaming import load_cortex_graph
+from cortexpy.graph.serializer import gfa, node_link
 from cortexpy.graph.serializer.unitig import UnitigCollapser
 
 
+def load_graph_to_serialize(graph_handle):
+    """Return a :py:class:`~cortexpy.graph.columnar_graph.ColumnarGraph` of the graph of a
+    seekable graph handle if the graph is sorted, and the loaded kmer graph otherwise
+
+    Sortedness is checked by streaming the kmers of the graph before either graph is built."""
+    header = Header.from_stream(graph_handle)
+    is_sorted = is_sorted_from_stream_and_header(graph_handle, header)
+    graph_handle.seek(0)
+    if is_sorted:
+        return ColumnarGraph.from_graph_handle(graph_handle)
+    return load_cortex_graph(graph_handle)
+
+
 @attr.s(slots=True)
 class Serializer(object):
     """Converts kmer graphs to unitig graphs."""
@@ -20,14 +37,35 @@ class Serializer(object):
         self.colors = self.graph.graph['colors']
 
     def to_json(self):
-        self._collapse_graph_to_unitigs()
-        serializable = json_graph.node_link_data(self.unitig_graph, attrs={'link': 'edges'})
-        return json.dumps(serializable)
+        output = io.StringIO()
+        self.write_json(output)
+        return output.getvalue()
 
-    def _collapse_graph_to_unitigs(self):
+    def write_json(self, output):
+        """Write the unitig graph as node-link JSON to the text stream output
+
+        Nodes and edges are written as they are produced, so the JSON document is never held in
+        memory. Unitigs of a :py:class:`~cortexpy.graph.columnar_graph.ColumnarGraph` are
+        streamed to output without building a unitig graph."""
+        if isinstance(self.graph, ColumnarGraph):
+            node_link.write_unitig_records(UnitigRecords.from_columnar_graph(self.graph),
+                                           self.colors, output)
+            return
         self._make_kmer_graph_consistent()
         self._collapse_kmer_graph()
-        self._make_unitig_graph_json_representable()
+        node_link.write_unitig_graph(self.unitig_graph, self.colors, output)
+
+    def to_gfa(self, output):
+        """Write the unitig graph as GFA to the text stream output
+
+        Unitigs of a :py:class:`~cortexpy.graph.columnar_graph.ColumnarGraph` are streamed
+        to output without building a unitig graph."""
+        if isinstance(self.graph, ColumnarGraph):
+            gfa.write_unitig_records(UnitigRecords.from_columnar_graph(self.graph), output)
+            return
+        self._make_kmer_graph_consistent()
+        self._collapse_kmer_graph()
+        gfa.write_unitig_graph(self.unitig_graph, output)
 
     def _make_kmer_graph_consistent(self):
         if isinstance(self.graph, CortexDiGraph):
@@ -36,30 +74,3 @@ class Serializer(object):
     def _collapse_kmer_graph(self):
         collapser = UnitigCollapser(self.graph).collapse_kmer_unitigs()
         self.unitig_graph = collapser.unitig_graph
-
-    def _make_unitig_graph_json_representable(self):
-        """Makes the unitig graph json representable"""
-        self.unitig_graph = nx.convert_node_labels_to_integers(self.unitig_graph,
-                                                               label_attribute='node_key')
-        self.unitig_graph.graph['colors'] = self.colors
-        if 'sample_names' in self.unitig_graph.graph:
-            new_names = []
-            for name in self.unitig_graph.graph['sample_names']:
-                if isinstance(name, bytes):
-                    name = name.decode()
-                new_names.append(name)
-            self.unitig_graph.graph['sample_names'] = new_names
-
-        for _, node_data in self.unitig_graph.nodes.items():
-            del node_data['node_key']
-
-            coverage = []
-            for coverage_list in node_data['coverage']:
-                try:
-                    coverage_list = coverage_list.tolist()
-                except AttributeError:
-                    pass
-                finally:
-                    coverage.append([int(i) for i in coverage_list])
-            coverage = [list(c) for c in zip(*coverage)]
-            node_data['coverage'] = coverage
@@ -5,6 +5,8 @@ import attr
 import networkx as nx
 
 from cortexpy.constants import EdgeTraversalOrientation
+from cortexpy.graph.columnar_graph import ColumnarGraph
+from cortexpy.graph.columnar_unitig import UnitigRecords
 from cortexpy.graph.parser.kmer import revcomp_target_to_match_ref
 from cortexpy.graph.traversal.utils import OrientedGraphFuncs
 from cortexpy.utils import lexlo
@@ -42,6 +44,22 @@ class Unitig(object):
         return cls(left_node=left_node, right_node=right_node,
                    coverage=tuple(coverage), contig=contig, repr=repr, graph=search.unitig_graph)
 
+    @classmethod
+    def from_unitig_records(cls, records, unitig, is_reversed=False, is_cycle=False):
+        """Build a unitig from unitig records (see :py:mod:`cortexpy.graph.columnar_unitig`)
+
+        The unitig has no kmer graph."""
+        nodes = records.oriented_nodes(unitig, is_reversed)
+        contig = records.sequence(unitig, is_reversed)
+        if records.has_incoming_edges(nodes[0]):
+            repr = contig[records.graph.header.kmer_size - 1:]
+        else:
+            repr = contig
+        return cls(left_node=records.kmer_string(nodes[0]),
+                   right_node=records.kmer_string(nodes[-1]),
+                   coverage=tuple(map(tuple, records.coverage(unitig, is_reversed).tolist())),
+                   contig=contig, repr=repr, graph=None, is_cycle=is_cycle)
+
     @property
     def unitig_edge_colors(self):
         try:
@@ -222,10 +240,14 @@ class UnitigCollapser(object):
     unitig_finder = attr.ib(init=False)
 
     def __attrs_post_init__(self):
-        self.unitig_finder = UnitigFinder.from_graph(self.graph, test_coverage=self.test_coverage)
+        if not isinstance(self.graph, ColumnarGraph):
+            self.unitig_finder = UnitigFinder.from_graph(self.graph,
+                                                         test_coverage=self.test_coverage)
 
     @graph.validator
     def is_a_multi_di_graph(self, attribute, value):
+        if isinstance(value, ColumnarGraph):
+            return
         assert value.is_multigraph()
         assert value.is_directed()
 
@@ -239,10 +261,20 @@ class UnitigCollapser(object):
 
         Unitigs are described in :py:func:`find_unitig_from`.
 
+        A :py:class:`~cortexpy.graph.columnar_graph.ColumnarGraph` of a whole graph is collapsed
+        by :py:class:`~cortexpy.graph.columnar_unitig.UnitigRecords` without building a kmer
+        graph. Unitigs are then oriented to be consistent with each other instead of with the
+        kmer graph.
+
         :return graph:
         """
 
         logger.info(f'Collapsing graph with {len(self.graph)} kmers')
+        if isinstance(self.graph, ColumnarGraph):
+            self.unitig_graph = self._collapse_columnar_graph()
+            logger.info(
+                f'Collapsing complete. Collapsed graph contains {len(self.unitig_graph)} unitigs')
+            return self
         unitig_graph = self.unitig_finder.find_unitigs()
         out = UNITIG_GRAPH()
         out.graph = self.graph.graph
@@ -283,5 +315,20 @@ class UnitigCollapser(object):
             f'Collapsing complete. Collapsed graph contains {len(self.unitig_graph)} unitigs')
         return self
 
+    def _collapse_columnar_graph(self):
+        records = UnitigRecords.from_columnar_graph(self.graph)
+        links = records.links()
+        is_reversed = records.consistent_orientations(links)
+        cycles = records.cycles(links)
+        unitigs = [Unitig.from_unitig_records(records, idx, is_reversed[idx], idx in cycles)
+                   for idx in range(len(records))]
+        out = UNITIG_GRAPH()
+        out.graph = self.graph.graph
+        for unitig in unitigs:
+            out.add_node(unitig, repr=unitig.repr, unitig=unitig.contig, coverage=unitig.coverage)
+        for source, target, color in records.consistent_edges(links, is_reversed, cycles):
+            out.add_edge(unitigs[source], unitigs[target], color)
+        return out
+
     def _summarize_unitig(self, unitig):
         return unitig.repr, unitig.contig
@@ -0,0 +1,144 @@
+"""Cortex graph statistics
+=========================
+
+This module contains classes and functions for summarizing Cortex graphs in a single streaming
+pass over the graph body.
+"""
+from functools import partial, reduce
+
+import attr
+import numpy as np
+
+from cortexpy.edge_set import NUM_INCOMING_BY_EDGE_BYTE, NUM_OUTGOING_BY_EDGE_BYTE
+from cortexpy.graph.parser.columnar import (
+    KmerColumns,
+    kmer_columns_generator_from_stream_and_header,
+)
+from cortexpy.graph.parser.header import Header
+from cortexpy.graph.parser.parallel import (
+    header_and_n_records_from_path,
+    map_record_range,
+    parallel_map_records,
+)
+
+DEFAULT_MAX_COVERAGE = 1000
+MAX_DEGREE = 4
+
+
+@attr.s(slots=True)
+class GraphStatistics(object):
+    """Summary statistics of a Cortex graph that are accumulated one block of records at a time
+
+    All statistics are per color. Coverages of max_coverage or more are counted in the last bin
+    of a coverage histogram. Degrees are only counted for kmers that are present in a color,
+    that is kmers with a coverage greater than zero. A tip is a present kmer that has either no
+    incoming or no outgoing edges, but not both. An isolated kmer has neither.
+    """
+    num_colors = attr.ib()
+    max_coverage = attr.ib(DEFAULT_MAX_COVERAGE)
+    n_kmers = attr.ib(0)
+    n_kmers_present = attr.ib(init=False)
+    n_tips = attr.ib(init=False)
+    n_isolated = attr.ib(init=False)
+    coverage_histograms = attr.ib(init=False)
+    in_degree_counts = attr.ib(init=False)
+    out_degree_counts = attr.ib(init=False)
+
+    def __attrs_post_init__(self):
+        self.n_kmers_present = np.zeros(self.num_colors, dtype=np.int64)
+        self.n_tips = np.zeros(self.num_colors, dtype=np.int64)
+        self.n_isolated = np.zeros(self.num_colors, dtype=np.int64)
+        self.coverage_histograms = np.zeros((self.num_colors, self.max_coverage + 1),
+                                            dtype=np.int64)
+        self.in_degree_counts = np.zeros((self.num_colors, MAX_DEGREE + 1), dtype=np.int64)
+        self.out_degree_counts = np.zeros((self.num_colors, MAX_DEGREE + 1), dtype=np.int64)
+
+    def update(self, columns):
+        """Add the records of a :py:class:`~cortexpy.graph.parser.columnar.KmerColumns` block"""
+        self.n_kmers += len(columns)
+        capped_coverage = np.minimum(columns.coverage, self.max_coverage)
+        in_degrees = NUM_INCOMING_BY_EDGE_BYTE[columns.edges]
+        out_degrees = NUM_OUTGOING_BY_EDGE_BYTE[columns.edges]
+        for color in range(self.num_colors):
+            self.coverage_histograms[color] += np.bincount(capped_coverage[:, color],
+                                                           minlength=self.max_coverage + 1)
+            is_present = columns.coverage[:, color] > 0
+            self.n_kmers_present[color] += np.count_nonzero(is_present)
+            color_in_degrees = in_degrees[is_present, color]
+            color_out_degrees = out_degrees[is_present, color]
+            self.in_degree_counts[color] += np.bincount(color_in_degrees,
+                                                        minlength=MAX_DEGREE + 1)
+            self.out_degree_counts[color] += np.bincount(color_out_degrees,
+                                                         minlength=MAX_DEGREE + 1)
+            has_no_in_edges = color_in_degrees == 0
+            has_no_out_edges = color_out_degrees == 0
+            self.n_tips[color] += np.count_nonzero(has_no_in_edges != has_no_out_edges)
+            self.n_isolated[color] += np.count_nonzero(has_no_in_edges & has_no_out_edges)
+        return self
+
+    def merge(self, other):
+        """Add the statistics of another graph or part of a graph to these statistics"""
+        assert self.num_colors == other.num_colors
+        assert self.max_coverage == other.max_coverage
+        self.n_kmers += other.n_kmers
+        for name in ['n_kmers_present', 'n_tips', 'n_isolated', 'coverage_histograms',
+                     'in_degree_counts', 'out_degree_counts']:
+            getattr(self, name).__iadd__(getattr(other, name))
+        return self
+
+    def to_dict(self):
+        """Return a JSON serializable representation of the statistics"""
+        return {
+            'n_kmers': int(self.n_kmers),
+            'max_coverage': self.max_coverage,
+            'colors': [
+                {
+                    'color': color,
+                    'n_kmers_present': int(self.n_kmers_present[color]),
+                    'n_tips': int(self.n_tips[color]),
+                    'n_isolated': int(self.n_isolated[color]),
+                    'coverage_histogram': self.coverage_histograms[color].tolist(),
+                    'in_degree_counts': self.in_degree_counts[color].tolist(),
+                    'out_degree_counts': self.out_degree_counts[color].tolist(),
+                }
+                for color in range(self.num_colors)
+            ]
+        }
+
+
+def statistics_from_stream(stream, max_coverage=DEFAULT_MAX_COVERAGE):
+    """Compute the statistics of a Cortex graph read from a stream"""
+    header = Header.from_stream(stream)
+    stats = GraphStatistics(header.num_colors, max_coverage=max_coverage)
+    for columns in kmer_columns_generator_from_stream_and_header(stream, header):
+        stats.update(columns)
+    return stats
+
+
+def statistics_from_path(path, max_coverage=DEFAULT_MAX_COVERAGE, n_processes=1):
+    """Compute the statistics of a Cortex graph file
+
+    If n_processes is greater than one, then the graph body is split into record-aligned byte
+    ranges that are shared out between the processes, and the statistics of each range are
+    merged at the end.
+    """
+    header, _ = header_and_n_records_from_path(path)
+    return parallel_map_records(path, partial(_statistics_from_block, max_coverage),
+                                n_workers=n_processes,
+                                reduce_func=GraphStatistics.merge,
+                                initial=GraphStatistics(header.num_colors,
+                                                        max_coverage=max_coverage))
+
+
+def statistics_from_record_range(path, start, stop, max_coverage=DEFAULT_MAX_COVERAGE):
+    """Compute the statistics of records [start, stop) of a Cortex graph file"""
+    header, _ = header_and_n_records_from_path(path)
+    block_stats = map_record_range(path, start, stop,
+                                   partial(_statistics_from_block, max_coverage))
+    return reduce(GraphStatistics.merge, block_stats,
+                  GraphStatistics(header.num_colors, max_coverage=max_coverage))
+
+
+def _statistics_from_block(max_coverage, header, block):
+    return GraphStatistics(header.num_colors, max_coverage=max_coverage) \
+        .update(KmerColumns.from_buffer(block, header))
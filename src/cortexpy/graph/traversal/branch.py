@@ -5,6 +5,7 @@ from cortexpy.graph.cortex import (
     build_empty_cortex_graph_from_ra_parser, ConsistentCortexDiGraph,
     CortexDiGraph,
 )
+from cortexpy.int_kmer import get_int_kmer_codec
 
 SERIALIZER_GRAPH = CortexDiGraph
 
@@ -15,31 +16,55 @@ class KmerStringAlreadySeen(Exception):
 
 @attr.s(slots=True)
 class Traverser(object):
+    """Traverse a single branch of a Cortex graph
+
+    If int_kmers is True, then the branch is traversed on integer-encoded kmers (see
+    :py:mod:`cortexpy.int_kmer`). Neighbors are found by shifting bases into the kmer, kmers are
+    retrieved from the ra_parser without string canonicalization and the kmers of the branch are
+    tracked by kmer int. Kmers that are already in the parent graph are then looked up in
+    parent_kmer_ints, a set of lexlo kmer ints. Kmer strings are only decoded for the
+    :py:class:`Traversed` branch that is returned.
+    """
     ra_parser = attr.ib()
     traversal_color = attr.ib(0)
     graph = attr.ib(attr.Factory(SERIALIZER_GRAPH))
     other_stopping_colors = attr.ib(attr.Factory(set))
+    int_kmers = attr.ib(False)
     kmer = attr.ib(init=False, default=None)
     kmer_string = attr.ib(init=False)
+    kmer_int = attr.ib(init=False, default=None)
     prev_kmer = attr.ib(init=False)
     prev_kmer_string = attr.ib(init=False)
+    prev_kmer_int = attr.ib(init=False, default=None)
     orientation = attr.ib(init=False)
     parent_graph = attr.ib(init=False)
+    parent_kmer_ints = attr.ib(init=False)
+    _branch_kmers = attr.ib(init=False)
+    _codec = attr.ib(init=False, default=None)
 
     def __attrs_post_init__(self):
         assert self.traversal_color not in self.other_stopping_colors
+        if self.int_kmers:
+            self._codec = get_int_kmer_codec(self.ra_parser.kmer_size)
 
     def traverse_from(self, kmer_string, *,
                       orientation=EdgeTraversalOrientation.original,
-                      parent_graph=None):
+                      parent_graph=None, parent_kmer_ints=None):
         if parent_graph is None:
             parent_graph = set()
+        if parent_kmer_ints is None:
+            parent_kmer_ints = set()
         self.parent_graph = parent_graph
+        self.parent_kmer_ints = parent_kmer_ints
         self.graph = ConsistentCortexDiGraph(
             graph=build_empty_cortex_graph_from_ra_parser(self.ra_parser).graph)
         self.kmer_string = first_kmer_string = kmer_string
+        if self.int_kmers:
+            self.kmer_int = self._codec.encode(kmer_string)
+            self._branch_kmers = {}
         self.orientation = orientation
         self.prev_kmer_string = None
+        self.prev_kmer_int = None
 
         try:
             self._get_kmer_and_add_kmer_string_to_graph()
@@ -47,6 +72,8 @@ class Traverser(object):
             return Traversed(self.graph, orientation=self.orientation)
 
         last_oriented_edge_set = self._traverse()
+        if self.int_kmers:
+            return self._traversed_from_kmer_ints(first_kmer_string, last_oriented_edge_set)
 
         reverse_neighbor_kmer_strings = set(
             self._get_neighbors(last_oriented_edge_set.other_orientation()))
@@ -59,6 +86,28 @@ class Traverser(object):
                          neighbor_kmer_strings=self._get_neighbors(last_oriented_edge_set),
                          reverse_neighbor_kmer_strings=list(reverse_neighbor_kmer_strings))
 
+    def _traversed_from_kmer_ints(self, first_kmer_string, last_oriented_edge_set):
+        """Decode the kmers of the traversed branch into a :py:class:`Traversed` branch"""
+        decode = self._codec.decode
+        kmer_strings = {}
+        for kmer_int, kmer in self._branch_kmers.items():
+            kmer_strings[kmer_int] = decode(kmer_int)
+            self.graph.add_node(kmer_strings[kmer_int], kmer=kmer)
+        reverse_neighbor_kmer_ints = set(
+            last_oriented_edge_set.other_orientation().neighbor_kmer_ints(self.kmer_int,
+                                                                          self._codec))
+        if self.prev_kmer_int is not None:
+            reverse_neighbor_kmer_ints.remove(self.prev_kmer_int)
+        neighbor_kmer_ints = last_oriented_edge_set.neighbor_kmer_ints(self.kmer_int, self._codec)
+        return Traversed(self.graph,
+                         orientation=self.orientation,
+                         first_kmer_string=first_kmer_string,
+                         last_kmer_string=kmer_strings[self.kmer_int],
+                         neighbor_kmer_strings=[decode(k) for k in neighbor_kmer_ints],
+                         reverse_neighbor_kmer_strings=[decode(k)
+                                                        for k in reverse_neighbor_kmer_ints],
+                         lexlo_kmer_ints=[self._codec.lexlo(k) for k in self._branch_kmers])
+
     def _traverse(self):
         while True:
             traversal_edge_set = self.kmer.edges[self.traversal_color].oriented(
@@ -78,11 +127,16 @@ class Traverser(object):
                     return traversal_edge_set
 
             try:
-                self._add_next_kmer_string_to_graph_and_get_next_kmer(traversal_edge_set)
+                if self.int_kmers:
+                    self._add_next_kmer_int_to_branch_and_get_next_kmer(traversal_edge_set)
+                else:
+                    self._add_next_kmer_string_to_graph_and_get_next_kmer(traversal_edge_set)
             except KmerStringAlreadySeen:
                 return traversal_edge_set
 
     def _get_num_neighbors(self, oriented_edge_set):
+        if self.int_kmers:
+            return oriented_edge_set.num_neighbor_for_int(self.kmer_int, self._codec)
         return oriented_edge_set.num_neighbor(self.kmer_string)
 
     def _get_neighbors(self, oriented_edge_set):
@@ -99,16 +153,35 @@ class Traverser(object):
             raise
         self.prev_kmer_string = prev_kmer_string
 
+    def _add_next_kmer_int_to_branch_and_get_next_kmer(self, oriented_edge_set):
+        prev_kmer_int = self.kmer_int
+        try:
+            self.kmer_int = next(oriented_edge_set.neighbor_kmer_ints(self.kmer_int, self._codec))
+            self._get_kmer_and_add_kmer_string_to_graph()
+        except KmerStringAlreadySeen:
+            self.kmer_int = prev_kmer_int
+            raise
+        self.prev_kmer_int = prev_kmer_int
+
     def _get_kmer(self):
-        if self.kmer_string in self.graph or self.kmer_string in self.parent_graph:
-            raise KmerStringAlreadySeen
         prev_kmer = self.kmer
-        self.kmer = self.ra_parser.get_kmer_for_string(self.kmer_string)
+        if self.int_kmers:
+            if (self.kmer_int in self._branch_kmers
+                    or self._codec.lexlo(self.kmer_int) in self.parent_kmer_ints):
+                raise KmerStringAlreadySeen
+            self.kmer = self.ra_parser.get_kmer_for_int(self.kmer_int)
+        else:
+            if self.kmer_string in self.graph or self.kmer_string in self.parent_graph:
+                raise KmerStringAlreadySeen
+            self.kmer = self.ra_parser.get_kmer_for_string(self.kmer_string)
         self.prev_kmer = prev_kmer
 
     def _get_kmer_and_add_kmer_string_to_graph(self):
         self._get_kmer()
-        self.graph.add_node(self.kmer_string, kmer=self.kmer)
+        if self.int_kmers:
+            self._branch_kmers[self.kmer_int] = self.kmer
+        else:
+            self.graph.add_node(self.kmer_string, kmer=self.kmer)
 
 
 @attr.s(slots=True)
@@ -120,6 +193,7 @@ class Traversed(object):
     last_kmer_string = attr.ib(None)
     neighbor_kmer_strings = attr.ib(attr.Factory(list))
     reverse_neighbor_kmer_strings = attr.ib(attr.Factory(list))
+    lexlo_kmer_ints = attr.ib(attr.Factory(list))
 
     def is_empty(self):
         return len(self.graph) == 0
@@ -1,12 +1,21 @@
 import collections
 import copy
+import io
 import logging
+from contextlib import ExitStack
+from multiprocessing import Pool
 
 import attr
 
 from cortexpy.constants import EdgeTraversalOrientation, EngineTraversalOrientation
 from cortexpy.graph.cortex import build_empty_cortex_graph_from_ra_parser, CortexDiGraph
-from cortexpy.graph.parser.kmer import EmptyKmerBuilder
+from cortexpy.graph.parser.constants import UINT32_T, UINT64_T
+from cortexpy.graph.parser.kmer import EmptyKmerBuilder, Kmer, KmerData, calc_kmer_container_size
+from cortexpy.graph.parser.parallel import record_ranges
+from cortexpy.graph.parser.random_access import MmapRandomAccess
+from cortexpy.graph.parser.random_access_collection import RandomAccessCollection
+from cortexpy.graph.serializer.kmer import write_kmer_records
+from cortexpy.int_kmer import get_int_kmer_codec
 from cortexpy.utils import lexlo, IntervalLogger, kmerize_contig, kmerize_fasta
 from cortexpy.graph.traversal import branch
 from cortexpy.graph.interactor import Interactor
@@ -14,9 +23,41 @@ from cortexpy.graph.interactor import Interactor
 logger = logging.getLogger(__name__)
 
 
+@attr.s(slots=True)
+class SeedStats(object):
+    seeds = attr.ib(0)
+    duplicates = attr.ib(0)
+    covered = attr.ib(0)
+
+    @property
+    def traversals_avoided(self):
+        return self.duplicates + self.covered
+
+    def __str__(self):
+        return 'seeds={} duplicates={} covered={} traversals_avoided={}'.format(
+            self.seeds, self.duplicates, self.covered, self.traversals_avoided)
+
+
 @attr.s(slots=True)
 class Engine(object):
-    """This engine creates subgraphs of Cortex graphs"""
+    """This engine creates subgraphs of Cortex graphs
+
+    If graph_paths are the paths of the graphs of ra_parser and processes is greater than one,
+    then the seed kmers of :py:meth:`traverse_from_each_kmer_in_fasta` and
+    :py:meth:`traverse_from_each_kmer_in` are split into one contiguous range per process. Each
+    process traverses its range on its own memory-mapped graphs and the subgraphs of the processes
+    are merged by kmer.
+
+    Seed kmers are deduplicated before traversal. If the engine traverses in both orientations,
+    then seeds are deduplicated by their lexlo kmer, and seeds that are already in the graph are
+    skipped, because the traversals that added them have already traversed everything they
+    connect to. seed_stats counts the seeds and the traversals that were avoided.
+
+    If int_kmers is True, then branches are traversed on integer-encoded kmers (see
+    :py:class:`~cortexpy.graph.traversal.branch.Traverser`) and the engine keeps the lexlo kmer
+    ints of its graph in kmer_ints, so that branches can stop at kmers of the graph without
+    decoding kmer strings.
+    """
     ra_parser = attr.ib()
     traversal_colors = attr.ib((0,))
     orientation = attr.ib(EngineTraversalOrientation.original)
@@ -25,6 +66,11 @@ class Engine(object):
     graph = attr.ib(init=False)
     last_graph_size = attr.ib(0)
     logging_interval = attr.ib(0)
+    int_kmers = attr.ib(False)
+    graph_paths = attr.ib(None)
+    processes = attr.ib(1)
+    seed_stats = attr.ib(attr.Factory(SeedStats), init=False)
+    kmer_ints = attr.ib(attr.Factory(set), init=False)
     queuer = attr.ib(init=False)
     branch_traverser = attr.ib(init=False)
     logger = attr.ib(init=False)
@@ -46,7 +92,39 @@ class Engine(object):
         return self
 
     def _traverse_from_each_kmer_in(self, kmer_generator):
+        start_kmers = self._unique_seeds(kmer_generator)
+        if self.processes > 1 and self.graph_paths:
+            self._traverse_from_each_kmer_in_parallel(start_kmers)
+        else:
+            self._traverse_from_each_unique_kmer_in(start_kmers)
+        logger.info('Seed kmers: %s', self.seed_stats)
+        return self
+
+    def _unique_seeds(self, kmer_generator):
+        """Return the seed kmers without duplicates in order of first occurrence"""
+        if self.orientation == EngineTraversalOrientation.both:
+            canonicalize = lexlo
+        else:
+            def canonicalize(kmer_string):
+                return kmer_string
+        seen = set()
+        start_kmers = []
         for start_kmer in kmer_generator:
+            self.seed_stats.seeds += 1
+            canonical_kmer = canonicalize(start_kmer)
+            if canonical_kmer in seen:
+                self.seed_stats.duplicates += 1
+                continue
+            seen.add(canonical_kmer)
+            start_kmers.append(start_kmer)
+        return start_kmers
+
+    def _traverse_from_each_unique_kmer_in(self, start_kmers):
+        skip_covered_seeds = self.orientation == EngineTraversalOrientation.both
+        for start_kmer in start_kmers:
+            if skip_covered_seeds and start_kmer in self.graph:
+                self.seed_stats.covered += 1
+                continue
             try:
                 Interactor.from_graph(self.graph) \
                     .compose_in_graph(self._traverse_from(start_kmer).graph)
@@ -58,6 +136,40 @@ class Engine(object):
                                  " because max node limit is reached").format(start_kmer))
         return self
 
+    def _traverse_from_each_kmer_in_parallel(self, start_kmers):
+        if not start_kmers:
+            return self
+        engine_kwargs = {'traversal_colors': tuple(self.traversal_colors),
+                         'orientation': self.orientation,
+                         'max_nodes': self.max_nodes,
+                         'int_kmers': self.int_kmers}
+        range_args = [(self.graph_paths, engine_kwargs, start_kmers[start:stop])
+                      for start, stop in record_ranges(len(start_kmers), self.processes)]
+        with Pool(min(self.processes, len(range_args))) as pool:
+            for records, seed_stats in pool.imap(_traverse_from_each_kmer_in_range, range_args):
+                self.seed_stats.covered += seed_stats.covered
+                self._add_kmer_records(records)
+                self.log_graph_size()
+                if self.max_nodes and len(self.graph) > self.max_nodes:
+                    raise Exception("Terminating contig traversal because max node limit is"
+                                    " reached")
+        return self
+
+    def _add_kmer_records(self, records):
+        """Add the kmers of a buffer of Cortex records that are not in the graph yet"""
+        kmer_size = self.ra_parser.kmer_size
+        num_colors = self.ra_parser.num_colors
+        record_size = (calc_kmer_container_size(kmer_size) * UINT64_T
+                       + num_colors * (UINT32_T + 1))
+        for start in range(0, len(records), record_size):
+            kmer = Kmer.from_kmer_data(
+                KmerData(records[start:start + record_size], kmer_size, num_colors)
+            )
+            if kmer.kmer not in self.graph:
+                self.graph.add_node(kmer.kmer, kmer=kmer)
+        if self.int_kmers:
+            self._update_kmer_ints()
+
     def traverse_from_each_kmer_in_iterable(self, iterable):
         for kmer in iterable:
             self._traverse_from(kmer)
@@ -74,7 +186,8 @@ class Engine(object):
         self.branch_traverser = {
             color: branch.Traverser(self.ra_parser,
                                     traversal_color=color,
-                                    other_stopping_colors=set(self.traversal_colors) - {color})
+                                    other_stopping_colors=set(self.traversal_colors) - {color},
+                                    int_kmers=self.int_kmers)
             for color in self.traversal_colors
         }
         self.queuer = branch.Queuer(self.branch_queue,
@@ -93,6 +206,12 @@ class Engine(object):
 
     def _post_process_graph(self):
         self.graph = annotate_kmer_graph_edges(self.graph)
+        if self.int_kmers:
+            self._update_kmer_ints()
+
+    def _update_kmer_ints(self):
+        codec = get_int_kmer_codec(self.ra_parser.kmer_size)
+        self.kmer_ints = {codec.lexlo(codec.encode(kmer_string)) for kmer_string in self.graph}
 
     def _add_graph_metadata(self):
         self.graph.graph['colors'] = self.ra_parser.colors
@@ -132,8 +251,10 @@ class Engine(object):
         color_branch_traverser = self.branch_traverser[setup.traversal_color]
         branch = color_branch_traverser.traverse_from(setup.start_string,
                                                       orientation=setup.orientation,
-                                                      parent_graph=self.graph)
+                                                      parent_graph=self.graph,
+                                                      parent_kmer_ints=self.kmer_ints)
         Interactor.from_graph(self.graph).compose_in_graph(branch.graph)
+        self.kmer_ints.update(branch.lexlo_kmer_ints)
         self._connect_branch_to_parent_graph(branch, setup)
         self._link_branch_and_queue_neighbor_traversals(branch)
 
@@ -190,6 +311,30 @@ class Engine(object):
             self.logger.info('current graph size: {}'.format(self.last_graph_size))
 
 
+def _traverse_from_each_kmer_in_range(args):
+    """Traverse from a range of unique seed kmers on memory-mapped graphs and return the Cortex
+    records of the subgraph and the seed stats of the traversal"""
+    graph_paths, engine_kwargs, start_kmers = args
+    with ExitStack() as stack:
+        ra_parsers = [
+            stack.enter_context(MmapRandomAccess(stack.enter_context(open(graph_path, 'rb'))))
+            for graph_path in graph_paths
+        ]
+        if len(ra_parsers) == 1:
+            ra_parser = ra_parsers[0]
+        else:
+            ra_parser = RandomAccessCollection(ra_parsers)
+        engine = Engine(ra_parser, **engine_kwargs)
+        engine._traverse_from_each_unique_kmer_in(start_kmers)
+        records = io.BytesIO()
+        write_kmer_records((kmer for _, kmer in engine.graph.nodes(data=True)), records)
+        seed_stats = engine.seed_stats
+        # the kmers of the engine are views of the memory maps, which can only be closed once
+        # the kmers are gone
+        del engine
+    return records.getvalue(), seed_stats
+
+
 def annotate_kmer_graph_edges(graph):
     """Adds nodes to graph for kmer_strings that only exist as edges in a node's kmer."""
     colors = graph.graph['colors']
@@ -0,0 +1,97 @@
+"""Integer-encoded kmers
+========================
+
+This module contains a codec for kmers that are encoded as Python integers with two bits per
+base (A=0, C=1, G=2, T=3), first base in the most significant bits. This is the encoding of the
+kmer container words of a Cortex graph, so integer order is lexicographic order. Neighboring
+kmers are computed by shifting a base in or out and reverse complements with byte table lookups,
+so traversals do not need to slice, concatenate or translate strings.
+"""
+from functools import lru_cache
+
+import attr
+import numpy as np
+
+BASES = 'ACGT'
+BASE_TO_DIGIT_TABLE = str.maketrans(BASES, '0123')
+UINT64_MASK = 2 ** 64 - 1
+
+# The four bases encoded by each byte
+BYTE_TO_BASES = [''.join(BASES[(b >> shift) & 3] for shift in (6, 4, 2, 0)) for b in range(256)]
+# Each byte with its four bases complemented and in reverse order
+REVCOMP_BYTE_TABLE = bytes(
+    sum((3 - ((b >> (2 * idx)) & 3)) << (6 - 2 * idx) for idx in range(4)) for b in range(256)
+)
+
+
+@attr.s(slots=True)
+class IntKmerCodec(object):
+    """Encode, decode and manipulate integer-encoded kmers of size kmer_size
+
+    Python integers have arbitrary precision, so kmers of all sizes are a single integer. Use
+    :py:meth:`to_uints` to split a kmer into the uint64 words of a Cortex kmer container.
+    """
+    kmer_size = attr.ib()
+    mask = attr.ib(init=False)
+    kmer_container_size = attr.ib(init=False)
+    _n_bytes = attr.ib(init=False)
+    _pad_bits = attr.ib(init=False)
+    _first_base_shift = attr.ib(init=False)
+
+    def __attrs_post_init__(self):
+        self.mask = 4 ** self.kmer_size - 1
+        self.kmer_container_size = (self.kmer_size + 31) // 32
+        self._n_bytes = (self.kmer_size + 3) // 4
+        self._pad_bits = 2 * (4 * self._n_bytes - self.kmer_size)
+        self._first_base_shift = 2 * (self.kmer_size - 1)
+
+    def encode(self, kmer_string):
+        """
+        >>> IntKmerCodec(3).encode('ACT')
+        7
+        """
+        return int(kmer_string.translate(BASE_TO_DIGIT_TABLE), 4)
+
+    def decode(self, kmer_int):
+        """
+        >>> IntKmerCodec(3).decode(7)
+        'ACT'
+        """
+        kmer_bytes = kmer_int.to_bytes(self._n_bytes, 'big')
+        return ''.join(map(BYTE_TO_BASES.__getitem__, kmer_bytes))[-self.kmer_size:]
+
+    def revcomp(self, kmer_int):
+        """
+        >>> codec = IntKmerCodec(3)
+        >>> codec.decode(codec.revcomp(codec.encode('AAC')))
+        'GTT'
+        """
+        kmer_bytes = kmer_int.to_bytes(self._n_bytes, 'big').translate(REVCOMP_BYTE_TABLE)
+        return int.from_bytes(kmer_bytes[::-1], 'big') >> self._pad_bits
+
+    def lexlo(self, kmer_int):
+        """Return the lower of a kmer and its reverse complement"""
+        return min(kmer_int, self.revcomp(kmer_int))
+
+    def is_lexlo(self, kmer_int):
+        return kmer_int <= self.revcomp(kmer_int)
+
+    def shift_in_right(self, kmer_int, base):
+        """Drop the first base of a kmer and append base (0-3), giving an outgoing neighbor"""
+        return ((kmer_int << 2) & self.mask) | base
+
+    def shift_in_left(self, kmer_int, base):
+        """Drop the last base of a kmer and prepend base (0-3), giving an incoming neighbor"""
+        return (kmer_int >> 2) | (base << self._first_base_shift)
+
+    def to_uints(self, kmer_int):
+        """Return the kmer container words of a kmer, most significant word first"""
+        return np.array([(kmer_int >> (64 * word_idx)) & UINT64_MASK
+                         for word_idx in reversed(range(self.kmer_container_size))],
+                        dtype=np.uint64)
+
+
+@lru_cache(maxsize=None)
+def get_int_kmer_codec(kmer_size):
+    """Return the shared :py:class:`IntKmerCodec` of a kmer size"""
+    return IntKmerCodec(kmer_size)
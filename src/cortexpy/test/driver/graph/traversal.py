@@ -16,6 +16,7 @@ class EngineTestDriver(object):
     traverser = attr.ib(None)
     traversal_colors = attr.ib((0,))
     ra_constructor = attr.ib(RandomAccess)
+    int_kmers = attr.ib(False)
 
     def with_kmer(self, *args):
         self.graph_builder.with_kmer(*args)
@@ -58,7 +59,8 @@ class EngineTestDriver(object):
         self.traverser = Engine(random_access_parser,
                                 traversal_colors=self.traversal_colors,
                                 max_nodes=self.max_nodes,
-                                orientation=self.traversal_orientation)
+                                orientation=self.traversal_orientation,
+                                int_kmers=self.int_kmers)
         assert (self.start_string is None) != (self.start_kmer_string is None)
         if self.start_string:
             self.traverser.traverse_from_each_kmer_in(self.start_string)
@@ -47,24 +47,31 @@ class Mccortex(object):
 class Cortexpy(object):
     spawn_process = attr.ib(False)
 
-    def view_graph(self, graph, kmers=False, out=None):
+    def view_graph(self, graph, kmers=False, out=None, processes=None, to_gfa=False):
         args = ['view', 'graph', graph]
         if kmers:
             args.append('--kmers')
+        if to_gfa:
+            args.append('--to-gfa')
+        if processes is not None:
+            args += ['--processes', str(processes)]
         if out is not None:
             args += ['--out', out]
         return self.run(args)
 
-    def view_contig(self, contig, graph, to_json=False, other_args=()):
+    def view_contig(self, contig, graph, to_json=False, other_args=(), to_gfa=False):
         run_args = []
         if to_json:
             run_args.append('--to-json')
+        if to_gfa:
+            run_args.append('--to-gfa')
         run_args += list(other_args)
         return self.run(['view', 'contig', str(graph), contig] + run_args)
 
     def traverse(self, graph,
                  contig=None,
                  to_json=False,
+                 to_gfa=False,
                  out=None,
                  max_paths=None,
                  input_gfa=False,
@@ -75,6 +82,8 @@ class Cortexpy(object):
         cmd = ['traverse', graph]
         if to_json:
             cmd.append('--to-json')
+        if to_gfa:
+            cmd.append('--to-gfa')
         if contig is not None:
             cmd += ['--seed-strings', contig]
         if max_paths:
@@ -97,7 +106,7 @@ class Cortexpy(object):
     def subgraph(self, *, graphs, contig, out='/dev/null',
                  contig_fasta=False, colors=None,
                  max_nodes=None, verbose=False,
-                 silent=False, logging_interval=None):
+                 silent=False, logging_interval=None, processes=None, prefix_length=None):
         cmd = ['subgraph', contig, '--out', out]
         assert len(graphs) > 0
         cmd.append('--graphs')
@@ -115,19 +124,56 @@ class Cortexpy(object):
             cmd.append('--silent')
         if logging_interval is not None:
             cmd += ['--logging-interval', logging_interval]
+        if processes is not None:
+            cmd += ['--processes', processes]
+        if prefix_length is not None:
+            cmd += ['--prefix-length', prefix_length]
         return self.run(cmd)
 
-    def prune(self, *, graph, out, remove_tips=None, verbose=None):
+    def prune(self, *, graph, out, remove_tips=None, verbose=None, streaming=False,
+              remove_low_coverage_kmers=False, kmer_coverage_threshold=None,
+              remove_low_coverage_unitigs=False, unitig_coverage_threshold=None):
         cmd = ['prune', graph, '--out', out]
         if remove_tips:
             cmd.extend(['--remove-tips', remove_tips])
+        if streaming:
+            cmd.append('--streaming')
+        if remove_low_coverage_kmers:
+            cmd.append('--remove-low-coverage-kmers')
+        if kmer_coverage_threshold is not None:
+            cmd.extend(['--kmer-coverage-threshold', kmer_coverage_threshold])
+        if remove_low_coverage_unitigs:
+            cmd.append('--remove-low-coverage-unitigs')
+        if unitig_coverage_threshold is not None:
+            cmd.extend(['--unitig-coverage-threshold', unitig_coverage_threshold])
         if verbose:
             cmd.append('--verbose')
         cmd = [str(c) for c in cmd]
         return self.run(cmd)
 
-    def assemble(self, *, graph, initial_seqs, out='/dev/null'):
+    def stats(self, *, graph, out, max_coverage=None, processes=None):
+        cmd = ['stats', graph, '--out', out]
+        if max_coverage is not None:
+            cmd.extend(['--max-coverage', max_coverage])
+        if processes is not None:
+            cmd.extend(['--processes', processes])
+        return self.run(cmd)
+
+    def index(self, *, graph, out=None, page_size=None):
+        cmd = ['index', graph]
+        if out is not None:
+            cmd.extend(['--out', out])
+        if page_size is not None:
+            cmd.extend(['--page-size', page_size])
+        return self.run(cmd)
+
+    def join(self, *, graphs, out):
+        return self.run(['join', *[str(g) for g in graphs], '--out', str(out)])
+
+    def assemble(self, *, graph, initial_seqs, out='/dev/null', processes=None):
         command = ['assemble', graph, initial_seqs, '--out', out]
+        if processes is not None:
+            command += ['--processes', processes]
         return self.run(command)
 
     def run(self, args):
@@ -6,25 +6,33 @@ These functions may also be useful outside of cortexpy.
 """
 
 from datetime import datetime
-from functools import lru_cache
 
 import attr
 from Bio import SeqIO
-from Bio.Seq import reverse_complement, complement
+
+DNA_COMPLEMENT_TABLE = str.maketrans('ACGTMRWSYKVHDBNacgtmrwsykvhdbn',
+                                     'TGCAKYWSRMBDHVNtgcakywsrmbdhvn')
+DEFAULT_LEXLO_CACHE_SIZE = 2 ** 20
+
+_lexlo_cache = {}
+_lexlo_cache_size = DEFAULT_LEXLO_CACHE_SIZE
 
 
-@lru_cache(typed=True)
 def revcomp(dna_string):
-    """Return the reverse complement of a string"""
-    return reverse_complement(dna_string)
+    """Return the reverse complement of a string
+
+    >>> revcomp('AACg')
+    'cGTT'
+    """
+    return dna_string.translate(DNA_COMPLEMENT_TABLE)[::-1]
 
 
-@lru_cache(typed=True)
 def lexlo(kmer_string):
     """Return lexicographically lowest version of a kmer string and its reverse complement
 
     The reverse complement of a kmer string is generated and the lexicographically-lowest
-    kmer string is returned.
+    kmer string is returned. Results are memoized for up to
+    :py:func:`set_lexlo_cache_size` kmer strings.
 
     >>> lexlo('AAA')
     'AAA'
@@ -32,10 +40,33 @@ def lexlo(kmer_string):
     >>> lexlo('TTT')
     'AAA'
     """
+    try:
+        return _lexlo_cache[kmer_string]
+    except KeyError:
+        pass
     alt_kmer_string = revcomp(kmer_string)
     if alt_kmer_string < kmer_string:
-        return alt_kmer_string
-    return kmer_string
+        lexlo_string = alt_kmer_string
+    else:
+        lexlo_string = kmer_string
+    if len(_lexlo_cache) >= _lexlo_cache_size:
+        _lexlo_cache.clear()
+    if _lexlo_cache_size > 0:
+        _lexlo_cache[kmer_string] = lexlo_string
+    return lexlo_string
+
+
+def set_lexlo_cache_size(cache_size):
+    """Set the maximum number of kmer strings memoized by :py:func:`lexlo`
+
+    The memo is emptied whenever it is full, so its memory use stays bounded on long runs.
+    A cache size of 0 turns memoization off.
+    """
+    global _lexlo_cache_size
+    if cache_size < 0:
+        raise ValueError('Cache size ({}) needs to be at least 0'.format(cache_size))
+    _lexlo_cache_size = cache_size
+    _lexlo_cache.clear()
 
 
 @attr.s(slots=True)
@@ -0,0 +1,29 @@
+import cortexpy.graph.parser.random_access as parser
+import cortexpy.test.builder as builder
+from cortexpy.graph.parser.sparse_index import sparse_index_path
+from cortexpy.test import runner
+
+
+class TestIndex(object):
+    def test_writes_sparse_index_next_to_graph(self, tmpdir):
+        # given
+        graph_path = tmpdir / 'graph.ctx'
+        graph_path.write_binary(builder.Graph()
+                                .with_kmer_size(3)
+                                .with_kmer('AAA 2 .......T')
+                                .with_kmer('AAT 1 a.......')
+                                .build()
+                                .getvalue())
+
+        # when
+        completed_process = runner.Cortexpy().index(graph=graph_path, page_size=1)
+
+        # then
+        assert 0 == completed_process.returncode
+        with open(str(graph_path), 'rb') as fh:
+            ra = parser.RandomAccess(fh)
+            assert ra.sparse_index is not None
+            assert 2 == ra.sparse_index.n_pages
+            assert [2, 1] == [ra[k].coverage[0] for k in ['AAA', 'AAT']]
+        assert (tmpdir / 'graph.ctx.idx').check()
+        assert str(tmpdir / 'graph.ctx.idx') == sparse_index_path(graph_path)
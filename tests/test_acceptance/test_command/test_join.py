@@ -0,0 +1,46 @@
+import cortexpy.test.builder as builder
+from cortexpy.graph.parser.random_access import RandomAccess
+from cortexpy.test import runner
+
+
+class TestJoin(object):
+    def test_joins_two_graphs_into_a_random_access_graph(self, tmpdir):
+        # given
+        graph_paths = []
+        for idx, kmer_strings in enumerate([['AAA', 'AAC'], ['AAC', 'ACG']]):
+            graph_builder = builder.Graph().with_kmer_size(3)
+            for kmer_string in kmer_strings:
+                graph_builder.with_kmer(kmer_string)
+            graph_path = tmpdir / 'graph{}.ctx'.format(idx)
+            graph_path.write_binary(graph_builder.build().getvalue())
+            graph_paths.append(graph_path)
+        output = tmpdir / 'joined.ctx'
+
+        # when
+        completed_process = runner.Cortexpy().join(graphs=graph_paths, out=output)
+
+        # then
+        assert 0 == completed_process.returncode, completed_process
+        with open(str(output), 'rb') as fh:
+            ra = RandomAccess(fh)
+            assert ['AAA', 'AAC', 'ACG'] == list(ra)
+            assert (1, 1) == ra['AAC'].coverage
+            assert (0, 1) == ra['ACG'].coverage
+
+    def test_removes_partial_output_of_unsorted_graph(self, tmpdir):
+        # given
+        graph_paths = []
+        for idx, graph_builder in enumerate([
+            builder.Graph().without_sorted_kmers().with_kmer('AAC').with_kmer('AAA'),
+            builder.Graph().with_kmer('AAA'),
+        ]):
+            graph_path = tmpdir / 'graph{}.ctx'.format(idx)
+            graph_path.write_binary(graph_builder.build().getvalue())
+            graph_paths.append(graph_path)
+        output = tmpdir / 'joined.ctx'
+
+        # when
+        runner.Cortexpy().join(graphs=graph_paths, out=output)
+
+        # then
+        assert not output.exists()
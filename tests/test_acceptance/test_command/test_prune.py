@@ -1,6 +1,11 @@
 import pytest
 
+import cortexpy.test.builder as builder
 import cortexpy.test.driver.command as command
+from cortexpy.graph.parser.header import Header
+from cortexpy.graph.parser.streaming import kmer_generator_from_stream
+from cortexpy.graph.serializer.kmer import ColorInformationBlock
+from cortexpy.test import runner
 
 
 @pytest.mark.parametrize('tip_length', (2, 3))
@@ -57,3 +62,108 @@ def test_prunes_contig_that_is_too_short(tmpdir):
 
     # then
     expect.has_nodes()
+
+
+@pytest.mark.parametrize('tip_length', (2, 3))
+def test_streaming_prune_removes_two_tips_and_their_edges(tmpdir, tip_length):
+    # given
+    graph_builder = builder.Graph() \
+        .with_kmer_size(3) \
+        .with_kmer('AAC 1 ......G.') \
+        .with_kmer('ACG 1 a....C..') \
+        .with_kmer('CCC 1 ......G.') \
+        .with_kmer('CCG 1 .c...C..') \
+        .with_kmer('CGC 2 ac......')
+    graph_path = tmpdir / 'graph.ctx'
+    graph_path.write_binary(graph_builder.build().getvalue())
+    output = tmpdir / 'pruned.ctx'
+    if tip_length < 3:
+        expected_kmers = ['AAC 1 ......G.', 'ACG 1 a....C..', 'CCC 1 ......G.',
+                          'CCG 1 .c...C..', 'CGC 2 ac......']
+    else:
+        expected_kmers = ['CGC 2 ........']
+
+    # when
+    completed_process = runner.Cortexpy().prune(graph=graph_path, out=output,
+                                                remove_tips=tip_length, streaming=True)
+
+    # then
+    assert 0 == completed_process.returncode, completed_process
+    with open(str(output), 'rb') as fh:
+        kmers = list(kmer_generator_from_stream(fh))
+    assert expected_kmers == ['{} {} {}'.format(k.kmer, k.coverage[0], k.edges[0].to_str())
+                              for k in kmers]
+
+
+@pytest.mark.parametrize('tip_length', (None, 6))
+def test_removes_low_coverage_kmers_before_tips(tmpdir, tip_length):
+    # given
+    graph_builder = builder.Graph() \
+        .with_kmer_size(3) \
+        .with_kmer('AAC 10 .....C..') \
+        .with_kmer('ACC 11 a...A.G.') \
+        .with_kmer('CCA 10 a....C..') \
+        .with_kmer('CAC 10 .c.....T') \
+        .with_kmer('ACT 10 .c......') \
+        .with_kmer('CCG 1 a...A...') \
+        .with_kmer('CGA 1 .c......')
+    graph_path = tmpdir / 'graph.ctx'
+    graph_path.write_binary(graph_builder.build().getvalue())
+    output = tmpdir / 'pruned.ctx'
+
+    # when
+    completed_process = runner.Cortexpy().prune(graph=graph_path, out=output,
+                                                remove_tips=tip_length, streaming=True,
+                                                remove_low_coverage_kmers=True)
+
+    # then
+    assert 0 == completed_process.returncode, completed_process
+    with open(str(output), 'rb') as fh:
+        kmers = list(kmer_generator_from_stream(fh))
+    if tip_length is None:
+        assert ['AAC', 'ACC', 'ACT', 'CAC', 'CCA'] == [k.kmer for k in kmers]
+        assert 'a...A...' == kmers[1].edges[0].to_str()
+    else:
+        assert [] == kmers
+
+
+def test_keeps_cleaning_thresholds_in_header_when_removing_tips(tmpdir):
+    # given
+    graph_builder = builder.Graph() \
+        .with_kmer_size(3) \
+        .with_kmer('AAC 10 .....C..') \
+        .with_kmer('ACC 11 a...A.G.') \
+        .with_kmer('CCA 10 a....C..') \
+        .with_kmer('CAC 10 .c.....T') \
+        .with_kmer('ACT 10 .c......') \
+        .with_kmer('CCG 1 a...A...') \
+        .with_kmer('CGA 1 .c......')
+    graph_path = tmpdir / 'graph.ctx'
+    graph_path.write_binary(graph_builder.build().getvalue())
+    output = tmpdir / 'pruned.ctx'
+
+    # when
+    completed_process = runner.Cortexpy().prune(graph=graph_path, out=output, remove_tips=2,
+                                                remove_low_coverage_kmers=True)
+
+    # then
+    assert 0 == completed_process.returncode, completed_process
+    with open(str(output), 'rb') as fh:
+        header = Header.from_stream(fh)
+    block = ColorInformationBlock.from_header_block(header.color_info_blocks[0])
+    assert block.are_low_cov_kmers_removed
+    assert 9 == block.cov_threshold_on_kmers
+
+
+def test_fails_without_anything_to_prune(tmpdir):
+    # given
+    graph_path = tmpdir / 'graph.ctx'
+    graph_path.write_binary(builder.Graph().with_kmer_size(3).with_kmer('AAC').build().getvalue())
+
+    # when
+    completed_process = runner.Cortexpy(spawn_process=True).prune(graph=graph_path,
+                                                                  out=tmpdir / 'pruned.ctx')
+
+    # then
+    assert 0 != completed_process.returncode
+    assert 'Nothing to prune' in completed_process.stderr
@@ -0,0 +1,31 @@
+import json
+
+import cortexpy.test.builder as builder
+from cortexpy.test import runner
+
+
+class TestStats(object):
+    def test_writes_json_summary_of_graph(self, tmpdir):
+        # given
+        graph_path = tmpdir / 'graph.ctx'
+        graph_path.write_binary(builder.Graph()
+                                .with_kmer_size(3)
+                                .with_kmer('AAA 2 .......T')
+                                .with_kmer('AAT 1 a.......')
+                                .build()
+                                .getvalue())
+        output = tmpdir / 'stats.json'
+
+        # when
+        completed_process = runner.Cortexpy().stats(graph=graph_path, out=output,
+                                                    max_coverage=2, processes=2)
+
+        # then
+        assert 0 == completed_process.returncode
+        stats = json.loads(output.read())
+        assert 2 == stats['n_kmers']
+        assert 1 == len(stats['colors'])
+        color_stats = stats['colors'][0]
+        assert 2 == color_stats['n_kmers_present']
+        assert [0, 1, 1] == color_stats['coverage_histogram']
+        assert 2 == color_stats['n_tips']
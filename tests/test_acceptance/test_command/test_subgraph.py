@@ -1,4 +1,9 @@
+import pytest
+
+import cortexpy.test.builder as builder
 import cortexpy.test.driver.command as command
+from cortexpy.graph.parser.streaming import load_cortex_graph
+from cortexpy.test import runner
 
 
 class TestSubgraph(object):
@@ -116,3 +121,64 @@ class Test:
 
         # then
         expect.has_nodes('CCC', 'CCG', 'CGC', 'AAA', 'AAT', 'ATA')
+
+
+class TestProcesses(object):
+    def test_traverses_seeds_in_two_processes(self, tmpdir):
+        # given
+        graph_builder = builder.Graph().with_kmer_size(3)
+        for kmer in ['AAA 1 .......T',
+                     'AAT 1 a....C..',
+                     'ATC 1 a.......',
+                     'CCC 1 ......G.',
+                     'CCG 1 .c......']:
+            graph_builder.with_kmer(kmer)
+        graph = tmpdir / 'graph.ctx'
+        graph.write_binary(graph_builder.build().getvalue())
+        out = tmpdir / 'subgraph.ctx'
+
+        # when
+        runner.Cortexpy().subgraph(graphs=[str(graph)], contig='AAATCCCG', out=str(out),
+                                   processes=2)
+
+        # then
+        with open(str(out), 'rb') as fh:
+            assert {'AAA', 'AAT', 'ATC', 'CCC', 'CCG'} == set(load_cortex_graph(fh))
+
+
+class TestPrefixLength(object):
+    def test_traverses_graph_with_prefix_jump_table(self, tmpdir):
+        # given
+        graph_builder = builder.Graph().with_kmer_size(3)
+        for kmer in ['AAA 1 .......T',
+                     'AAT 1 a....C..',
+                     'ATC 1 a.......',
+                     'CCC 1 ......G.',
+                     'CCG 1 .c......']:
+            graph_builder.with_kmer(kmer)
+        graph = tmpdir / 'graph.ctx'
+        graph.write_binary(graph_builder.build().getvalue())
+        out = tmpdir / 'subgraph.ctx'
+
+        # when
+        runner.Cortexpy().subgraph(graphs=[str(graph)], contig='AAA', out=str(out),
+                                   prefix_length=2)
+
+        # then
+        with open(str(out), 'rb') as fh:
+            assert {'AAA', 'AAT', 'ATC'} == set(load_cortex_graph(fh))
+
+    @pytest.mark.parametrize('prefix_length', ['0', '-1', 'a'])
+    def test_rejects_invalid_prefix_length(self, tmpdir, prefix_length):
+        # given
+        graph = tmpdir / 'graph.ctx'
+        graph.write_binary(builder.Graph().with_kmer_size(3).with_kmer('AAA').build().getvalue())
+
+        # when
+        completed_process = runner.Cortexpy(spawn_process=True).subgraph(
+            graphs=[str(graph)], contig='AAA', out=str(tmpdir / 'subgraph.ctx'),
+            prefix_length=prefix_length)
+
+        # then
+        assert 2 == completed_process.returncode
+        assert '--prefix-length' in completed_process.stderr
@@ -1,4 +1,10 @@
+import json
+
+import cortexpy.test.builder as builder
+from cortexpy.graph.parser.header import Header
+from cortexpy.test import runner
 from cortexpy.test.driver import command
+from cortexpy.test.expectation.json import JsonGraph
 
 
 class Test:
@@ -125,3 +131,78 @@ class Test:
         expect.has_repr_edge('A', 'GG', 1)
         expect.has_repr_edge('CAA', 'A', 2)
         expect.has_n_edges(3)
+
+
+def write_whole_graph(graph_path, is_sorted=True):
+    graph_builder = builder.Graph().with_kmer_size(3)
+    for kmer in ['AAC 10 .....C..',
+                 'ACC 11 a...A.G.',
+                 'CCA 10 a....C..',
+                 'CAC 10 .c.....T',
+                 'ACT 10 .c......',
+                 'CCG 1 a...A...',
+                 'CGA 1 .c......']:
+        graph_builder.with_kmer(kmer)
+    graph_stream = graph_builder.build()
+    graph = graph_stream.getvalue()
+    if not is_sorted:
+        record_size = Header.from_stream(graph_stream).record_size
+        graph = (graph[:-2 * record_size] + graph[-record_size:]
+                 + graph[-2 * record_size:-record_size])
+    graph_path.write_binary(graph)
+    return graph_path
+
+
+def unitigs_and_links(json_graph):
+    unitigs = {node['id']: node['unitig'] for node in json_graph['nodes']}
+    return (sorted(unitigs.values()),
+            sorted((unitigs[edge['source']], unitigs[edge['target']], edge['key'])
+                   for edge in json_graph['edges']))
+
+
+class TestWholeGraph:
+    def test_collapses_unitigs_of_sorted_graph(self, tmpdir):
+        # given
+        graph = write_whole_graph(tmpdir / 'graph.ctx')
+
+        # when
+        completed_process = runner.Cortexpy().traverse(str(graph), to_json=True)
+
+        # then
+        expect = JsonGraph(json.loads(completed_process.stdout))
+        expect.has_colors([0])
+        expect.has_n_nodes(3)
+        expect.has_node_repr('AACC').has_coverages_by_kmer([10], [11])
+        expect.has_node_repr('ACT').has_coverages_by_kmer([10], [10], [10])
+        expect.has_node_repr('GA').has_coverages_by_kmer([1], [1])
+        expect.has_repr_edge('AACC', 'ACT', 0)
+        expect.has_repr_edge('AACC', 'GA', 0)
+        expect.has_n_edges(2)
+
+    def test_writes_json_of_sorted_graph_to_out(self, tmpdir):
+        # given
+        graph = write_whole_graph(tmpdir / 'graph.ctx')
+        out = tmpdir / 'graph.json'
+
+        # when
+        completed_process = runner.Cortexpy().traverse(str(graph), to_json=True, out=str(out))
+
+        # then
+        assert '' == completed_process.stdout
+        expect = JsonGraph(json.loads(out.read()))
+        expect.has_n_nodes(3)
+        expect.has_n_edges(2)
+
+    def test_sorted_and_unsorted_graph_have_same_unitigs_and_links(self, tmpdir):
+        # given
+        sorted_graph = write_whole_graph(tmpdir / 'sorted.ctx')
+        unsorted_graph = write_whole_graph(tmpdir / 'unsorted.ctx', is_sorted=False)
+
+        # when
+        json_graphs = [json.loads(runner.Cortexpy().traverse(str(graph), to_json=True).stdout)
+                       for graph in [sorted_graph, unsorted_graph]]
+
+        # then
+        assert unitigs_and_links(json_graphs[0]) == unitigs_and_links(json_graphs[1])
+        assert ([('AACC', [[10, 11]]), ('CCACT', [[10, 10, 10]]), ('CCGA', [[1, 1]])]
+                == sorted((node['unitig'], node['coverage']) for node in json_graphs[0]['nodes']))
@@ -1,6 +1,10 @@
+import io
 import os
 
 import pytest
+from Bio import SeqIO
+from Bio.Seq import Seq
+from Bio.SeqRecord import SeqRecord
 
 from cortexpy.test import builder, runner, expectation
 
@@ -35,6 +39,32 @@ class Test(object):
         expect.has_n_records(3)
 
 
+class TestGraphKmers(object):
+    @pytest.mark.parametrize('kmer_size,processes', [(3, 1), (63, 1), (63, 2)])
+    def test_output_is_identical_to_biopython_fasta(self, tmpdir, kmer_size, processes):
+        # given
+        kmer_strings = ['A' * kmer_size,
+                        'A' * (kmer_size - 1) + 'C',
+                        'AC' * (kmer_size // 2) + 'G']
+        graph_builder = builder.Graph().with_kmer_size(kmer_size)
+        for kmer_string in kmer_strings:
+            graph_builder.with_kmer(kmer_string)
+        graph_path = tmpdir / 'graph.ctx'
+        graph_path.write_binary(graph_builder.build().getvalue())
+        expected = io.StringIO()
+        SeqIO.write((SeqRecord(Seq(s), id=str(i), description='')
+                     for i, s in enumerate(sorted(kmer_strings))),
+                    expected, 'fasta')
+
+        # when
+        completed_process = runner.Cortexpy(SPAWN_PROCESS) \
+            .view_graph(kmers=True, graph=graph_path, processes=processes)
+
+        # then
+        assert completed_process.returncode == 0, completed_process
+        assert expected.getvalue() == completed_process.stdout
+
+
 class TestContigs(object):
     def test_outputs_multiple_combinations(self, tmpdir):
         # given
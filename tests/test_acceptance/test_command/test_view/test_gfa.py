@@ -1,6 +1,7 @@
 import attr
 import pytest
 
+import cortexpy.test.builder as builder
 from cortexpy.test import runner
 from cortexpy.test.expectation import Fasta
 
@@ -44,3 +45,52 @@ class TestTraversal:
 
     def test_with_x_shaped_unitig_graph_outputs_four_records(self):
         pass
+
+
+def write_branch_graph(tmpdir):
+    graph_builder = builder.Graph().with_kmer_size(3)
+    for kmer in ['AAC 10 .....C..',
+                 'ACC 11 a...A.G.',
+                 'CCA 10 a....C..',
+                 'CAC 10 .c.....T',
+                 'ACT 10 .c......',
+                 'CCG 1 a...A...',
+                 'CGA 1 .c......']:
+        graph_builder.with_kmer(kmer)
+    graph = tmpdir / 'graph.ctx'
+    graph.write_binary(graph_builder.build().getvalue())
+    return str(graph)
+
+
+class TestViewGraph:
+    def test_writes_unitigs_and_links_of_sorted_graph(self, tmpdir):
+        # given
+        graph = write_branch_graph(tmpdir)
+
+        # when
+        completed_process = runner.Cortexpy().view_graph(graph, to_gfa=True)
+
+        # then
+        lines = [line.split('\t') for line in completed_process.stdout.splitlines()]
+        assert ['H', 'VN:Z:1.0'] == lines[0]
+        segments = {line[1]: line[2] for line in lines if line[0] == 'S'}
+        assert ['AACC', 'CCACT', 'CCGA'] == sorted(segments.values())
+        links = sorted((segments[line[1]], line[2], segments[line[3]], line[4], line[5])
+                       for line in lines if line[0] == 'L')
+        assert [('AACC', '+', 'CCACT', '+', '2M'),
+                ('AACC', '+', 'CCGA', '+', '2M')] == links
+
+
+class TestTraverse:
+    def test_writes_unitigs_of_sorted_graph_to_out(self, tmpdir):
+        # given
+        graph = write_branch_graph(tmpdir)
+        out = tmpdir / 'graph.gfa'
+
+        # when
+        runner.Cortexpy().traverse(graph, to_gfa=True, out=str(out))
+
+        # then
+        lines = [line.split('\t') for line in out.read().splitlines()]
+        assert ['H', 'S', 'S', 'S', 'L', 'L'] == [line[0] for line in lines]
+        assert ['AACC', 'CCACT', 'CCGA'] == sorted(line[2] for line in lines if line[0] == 'S')
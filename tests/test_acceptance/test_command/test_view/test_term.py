@@ -54,6 +54,47 @@ class Test(object):
         assert expected_kmers == CortexpyPrintOutputParser(stdout).get_kmer_strings()
 
 
+class TestGraph(object):
+    def test_prints_kmers_of_two_colors(self, tmpdir):
+        # given
+        graph_path = tmpdir / 'graph.ctx'
+        graph_path.write_binary(builder.Graph()
+                                .with_kmer_size(3)
+                                .with_num_colors(2)
+                                .with_kmer('AAA 1 0 .....C.. ........')
+                                .with_kmer('AAC 2 1 a......T a.......')
+                                .build()
+                                .getvalue())
+
+        # when
+        stdout = runner.Cortexpy().view_graph(graph_path).stdout
+
+        # then
+        assert 'AAA 1 0 .....C.. ........\nAAC 2 1 a......T a.......\n' == stdout
+
+
+class TestParallel(object):
+    def test_prints_same_kmers_as_single_process(self, tmpdir):
+        # given
+        graph_path = tmpdir / 'graph.ctx'
+        graph_path.write_binary(builder.Graph()
+                                .with_kmer_size(3)
+                                .with_num_colors(2)
+                                .with_kmer('AAA 1 0 .....C.. ........')
+                                .with_kmer('AAC 2 1 a......T a.......')
+                                .with_kmer('ACG 7 1 ........ ........')
+                                .build()
+                                .getvalue())
+        expected = runner.Cortexpy().view_graph(graph_path).stdout
+
+        # when
+        stdout = runner.Cortexpy().view_graph(graph_path, processes=2).stdout
+
+        # then
+        assert 3 == len(CortexpyPrintOutputParser(stdout).get_kmer_strings())
+        assert expected == stdout
+
+
 class TestTermWithRecord(object):
     def test_prints_single_kmer(self, tmpdir):
         # given
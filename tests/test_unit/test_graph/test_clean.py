@@ -0,0 +1,152 @@
+import io
+
+import numpy as np
+import pytest
+
+import cortexpy.test.builder as builder
+from cortexpy.graph.clean import clean_graph_path, find_unitigs, pick_coverage_threshold
+from cortexpy.graph.columnar_graph import ColumnarGraph
+from cortexpy.graph.parser.header import Header
+from cortexpy.graph.parser.streaming import kmer_generator_from_stream
+
+# A unitig AAC-ACC-CCA-CAC-ACT with an error branch ACC-CCG-CGA of coverage 1
+GRAPH_KMERS = [
+    'AAC 10 .....C..',
+    'ACC 11 a...A.G.',
+    'CCA 10 a....C..',
+    'CAC 10 .c.....T',
+    'ACT 10 .c......',
+    'CCG 1 a...A...',
+    'CGA 1 .c......',
+]
+
+
+def write_graph(tmpdir, kmers=GRAPH_KMERS):
+    graph_builder = builder.Graph().with_kmer_size(3)
+    for kmer in kmers:
+        graph_builder.with_kmer(kmer)
+    graph_path = tmpdir / 'graph.ctx'
+    graph_path.write_binary(graph_builder.build().getvalue())
+    return str(graph_path)
+
+
+def clean_and_parse(graph_path, **kwargs):
+    output = io.BytesIO()
+    report = clean_graph_path(graph_path, output, **kwargs)
+    output.seek(0)
+    header = Header.from_stream(output)
+    kmers = ['{} {} {}'.format(k.kmer, k.coverage[0], k.edges[0].to_str())
+             for k in kmer_generator_from_stream(io.BytesIO(output.getvalue()))]
+    return report, header, kmers
+
+
+class TestPickCoverageThreshold(object):
+    @pytest.mark.parametrize('histogram,threshold', [
+        ([0, 10, 4, 2, 5, 8, 3], 3),
+        ([0, 2, 0, 0, 4, 1], 3),
+        ([0, 0, 5, 3], 1),
+        ([0, 5, 4, 3, 2], 1),
+        ([], 1),
+    ])
+    def test_picks_first_minimum(self, histogram, threshold):
+        assert threshold == pick_coverage_threshold(histogram)
+
+
+class TestFindUnitigs(object):
+    def test_finds_unitigs_split_at_branch(self, tmpdir):
+        # given
+        with open(write_graph(tmpdir), 'rb') as fh:
+            graph = ColumnarGraph.from_graph_handle(fh)
+
+            # when
+            unitig_ids, unitig_coverage = find_unitigs(graph, np.zeros(len(graph), dtype=bool))
+
+            # then
+            kmers = [graph.codec.decode(graph.kmer_int(index)) for index in range(len(graph))]
+            unitigs = [sorted(kmer for kmer, unitig_id in zip(kmers, unitig_ids)
+                              if unitig_id == unitig)
+                       for unitig in range(len(unitig_coverage))]
+            assert [['AAC', 'ACC'], ['ACT', 'CAC', 'CCA'], ['CCG', 'CGA']] == sorted(unitigs)
+
+    def test_joins_unitigs_over_removed_branch(self, tmpdir):
+        # given
+        with open(write_graph(tmpdir), 'rb') as fh:
+            graph = ColumnarGraph.from_graph_handle(fh)
+            removed = graph.total_coverage < 9
+
+            # when
+            unitig_ids, unitig_coverage = find_unitigs(graph, removed)
+
+            # then
+            assert [-1, -1] == unitig_ids[removed].tolist()
+            assert {0} == set(unitig_ids[~removed].tolist())
+            assert [10.2] == unitig_coverage.tolist()
+
+
+class TestCleanGraphPath(object):
+    def test_removes_low_coverage_kmers_with_automatic_threshold(self, tmpdir):
+        # when
+        report, header, kmers = clean_and_parse(write_graph(tmpdir), remove_unitigs=False)
+
+        # then
+        assert 9 == report.kmer_threshold
+        assert 2 == report.n_kmers_removed
+        assert ['AAC 10 .....C..',
+                'ACC 11 a...A...',
+                'ACT 10 .c......',
+                'CAC 10 .c.....T',
+                'CCA 10 a....C..'] == kmers
+        block = header.color_info_blocks[0]
+        assert b'\x01' == block[0][2]
+        assert 9 == block[0][5]
+        assert b'\x00' == block[0][1]
+
+    def test_removes_low_coverage_unitigs_with_automatic_threshold(self, tmpdir):
+        # when
+        report, header, kmers = clean_and_parse(write_graph(tmpdir), remove_kmers=False)
+
+        # then
+        assert 9 == report.unitig_threshold
+        assert 1 == report.n_unitigs_removed
+        assert 2 == report.n_unitig_kmers_removed
+        assert ['AAC', 'ACC', 'ACT', 'CAC', 'CCA'] == [k.split()[0] for k in kmers]
+        block = header.color_info_blocks[0]
+        assert b'\x01' == block[0][1]
+        assert 9 == block[0][4]
+        assert b'\x00' == block[0][2]
+
+    def test_raises_on_unsorted_graph(self, tmpdir):
+        # given
+        graph_path = write_graph(tmpdir, GRAPH_KMERS[:2])
+        with open(graph_path, 'rb') as fh:
+            record_size = Header.from_stream(fh).record_size
+            fh.seek(0)
+            graph = fh.read()
+        with open(graph_path, 'wb') as fh:
+            fh.write(graph[:-2 * record_size] + graph[-record_size:]
+                     + graph[-2 * record_size:-record_size])
+
+        # when/then
+        with pytest.raises(ValueError, match='not sorted'):
+            clean_and_parse(graph_path)
+
+    def test_uses_given_thresholds(self, tmpdir):
+        # when
+        report, _, kmers = clean_and_parse(write_graph(tmpdir), kmer_threshold=11,
+                                           unitig_threshold=20)
+
+        # then
+        assert 6 == report.n_kmers_removed
+        assert 1 == report.n_unitigs_removed
+        assert [] == kmers
+
+    def test_keeps_graph_without_low_coverage_peak(self, tmpdir):
+        # given
+        graph_path = write_graph(tmpdir, GRAPH_KMERS[:5])
+
+        # when
+        report, _, kmers = clean_and_parse(graph_path)
+
+        # then
+        assert (0, 0) == (report.n_kmers_removed, report.n_unitigs_removed)
+        assert sorted(GRAPH_KMERS[:5]) == kmers
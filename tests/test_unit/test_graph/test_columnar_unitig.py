@@ -0,0 +1,274 @@
+import collections
+
+from hypothesis import assume, given, settings
+from hypothesis import strategies as s
+
+import cortexpy.test.builder as builder
+from cortexpy.graph.columnar_graph import ColumnarGraph
+from cortexpy.graph.columnar_unitig import UnitigLink, UnitigRecords
+from cortexpy.graph.interactor import Interactor
+from cortexpy.graph.parser.header import Header
+from cortexpy.graph.parser.streaming import load_cortex_graph
+from cortexpy.graph.serializer.kmer import dump_colored_de_bruijn_graph_to_cortex
+from cortexpy.graph.serializer.unitig import UnitigCollapser
+from cortexpy.test.builder.graph.cortex import CortexGraphBuilder
+from cortexpy.utils import revcomp
+
+
+def write_graph_of_records(graph_path, records, kmer_size, colors=(0,)):
+    b = CortexGraphBuilder().with_kmer_size(kmer_size).with_colors(*colors)
+    for record, color in zip(records, colors * len(records)):
+        b.add_path([record[i:i + kmer_size] for i in range(len(record) - kmer_size + 1)],
+                   color=color)
+    graph = b.build()
+    graph.graph.update(sample_names=['s{}'.format(c) for c in colors], num_colors=len(colors))
+    with open(graph_path, 'wb') as fh:
+        dump_colored_de_bruijn_graph_to_cortex(graph, fh)
+    return str(graph_path)
+
+
+def unitig_records_of(graph_path):
+    with open(graph_path, 'rb') as fh:
+        return UnitigRecords.from_columnar_graph(ColumnarGraph.from_graph_handle(fh))
+
+
+def canonical_unitigs(unitig_graph):
+    unitigs = collections.Counter()
+    for _, data in unitig_graph.nodes(data=True):
+        contig, coverage = data['unitig'], tuple(data['coverage'])
+        if revcomp(contig) < contig:
+            contig, coverage = revcomp(contig), coverage[::-1]
+        unitigs[(contig, coverage)] += 1
+    return unitigs
+
+
+def canonical_links(unitig_graph):
+    links = collections.Counter()
+    for source, target, color in unitig_graph.edges(keys=True):
+        if source is target:
+            continue
+        source, target = source.contig, target.contig
+        links[min((source, target), (revcomp(target), revcomp(source))) + (color,)] += 1
+    return links
+
+
+class TestUnitigRecords(object):
+    def test_finds_unitigs_and_links_of_branch(self, tmpdir):
+        # given
+        graph_path = write_graph_of_records(tmpdir / 'graph.ctx', ['AACCAC', 'ACCGA'], 3)
+
+        # when
+        records = unitig_records_of(graph_path)
+
+        # then
+        unitigs = sorted((records.sequence(u), records.coverage(u).tolist())
+                         for u in range(len(records)))
+        assert [('AACC', [[1], [1]]),
+                ('CCAC', [[1], [1]]),
+                ('CCGA', [[1], [1]])] == unitigs
+        links = records.links()
+        assert 2 == len(links)
+        for link in links:
+            source = records.sequence(link.source, link.source_is_reversed)
+            target = records.sequence(link.target, link.target_is_reversed)
+            assert source[-2:] == target[:2]
+
+    def test_walks_kmers_longer_than_one_container_word(self, tmpdir):
+        # given
+        record = 'ACGTTGCATGCCATGACTGACGTACGGTACCATGAACTGGACTG'
+        graph_path = write_graph_of_records(tmpdir / 'graph.ctx', [record], 35)
+
+        # when
+        records = unitig_records_of(graph_path)
+
+        # then
+        assert 1 == len(records)
+        assert record in {records.sequence(0), records.sequence(0, is_reversed=True)}
+        assert [] == records.links()
+
+    def test_finds_cycle(self, tmpdir):
+        # given
+        graph_path = write_graph_of_records(tmpdir / 'graph.ctx', ['AACGAAC'], 3)
+
+        # when
+        records = unitig_records_of(graph_path)
+
+        # then
+        assert 1 == len(records)
+        assert records.is_cycle[0]
+        assert [UnitigLink(0, False, 0, False, 0)] == records.links()
+
+
+def is_walk(records, contig, kmer_size):
+    """Return True if each pair of adjacent kmers in contig is adjacent in one of records"""
+    return all(any(edge in record or revcomp(edge) in record for record in records)
+               for edge in (contig[i:i + kmer_size + 1]
+                            for i in range(len(contig) - kmer_size)))
+
+
+def collapse_kmer_graph(graph_path):
+    with open(str(graph_path), 'rb') as fh:
+        kmer_graph = load_cortex_graph(fh)
+    consistent_graph = Interactor(kmer_graph).make_graph_nodes_consistent().graph
+    unitig_graph = UnitigCollapser(consistent_graph).collapse_kmer_unitigs().unitig_graph
+    return kmer_graph, consistent_graph, unitig_graph
+
+
+def collapse_columnar_graph(graph_path):
+    with open(str(graph_path), 'rb') as fh:
+        return UnitigCollapser(
+            ColumnarGraph.from_graph_handle(fh)
+        ).collapse_kmer_unitigs().unitig_graph
+
+
+def write_graph_of_kmers(graph_path, kmers):
+    graph_builder = builder.Graph().with_kmer_size(3)
+    for kmer in kmers:
+        graph_builder.with_kmer(kmer)
+    graph_path.write_binary(graph_builder.build().getvalue())
+    return graph_path
+
+
+def cycle_rotations(contig, kmer_size):
+    """Return the contigs of all rotations of a cyclic contig and its reverse complement"""
+    cycle = contig[:len(contig) - kmer_size + 1]
+    rotations = set()
+    for sequence in [cycle, revcomp(contig)[:len(cycle)]]:
+        for start in range(len(sequence)):
+            rotated = sequence[start:] + sequence[:start]
+            rotations.add(rotated + rotated[:kmer_size - 1])
+    return rotations
+
+
+class TestUnitigCollapser(object):
+    @settings(deadline=None, max_examples=50)
+    @given(s.lists(s.text('ACGT', min_size=3, max_size=12), min_size=1, max_size=3))
+    def test_collapses_same_unitigs_as_kmer_graph(self, tmpdir_factory, records):
+        # given
+        graph_path = write_graph_of_records(tmpdir_factory.mktemp('unitigs') / 'graph.ctx',
+                                            records, 3)
+
+        # when
+        kmer_graph, consistent_graph, expected = collapse_kmer_graph(graph_path)
+        unitig_graph = collapse_columnar_graph(graph_path)
+
+        # then
+        # cycles and contigs over kmers that overlap in both directions are covered by
+        # the example tests below
+        assume(len(consistent_graph) == len(kmer_graph))
+        assume(all(is_walk(records, unitig.contig, 3) for unitig in expected))
+        assume(not any(unitig.is_cycle for unitig in expected))
+        assume(not any(unitig.is_cycle for unitig in unitig_graph))
+        assert canonical_unitigs(expected) == canonical_unitigs(unitig_graph)
+        assert canonical_links(expected) == canonical_links(unitig_graph)
+
+    def test_splits_unitigs_at_change_of_colors(self, tmpdir):
+        # given
+        graph_path = write_graph_of_kmers(tmpdir / 'graph.ctx', [
+            'AAC 1 1 .....C.. .....C..',
+            'ACC 1 1 a...A... a.......',
+            'CCA 1 0 a....C.. ........',
+            'CAC 1 0 .c...... ........',
+        ])
+
+        # when
+        _, _, expected = collapse_kmer_graph(graph_path)
+        unitig_graph = collapse_columnar_graph(graph_path)
+
+        # then
+        assert {('AACC', ((1, 1), (1, 1))): 1,
+                ('CCAC', ((1, 0), (1, 0))): 1} == canonical_unitigs(unitig_graph)
+        assert canonical_unitigs(expected) == canonical_unitigs(unitig_graph)
+        assert canonical_links(expected) == canonical_links(unitig_graph)
+        assert [0, 1] == list(unitig_graph.graph['colors'])
+
+    def test_finds_two_kmer_cycle(self, tmpdir):
+        # given
+        graph_path = write_graph_of_kmers(tmpdir / 'graph.ctx', ['ACA 1 .c...C..',
+                                                                 'CAC 1 a...A...'])
+
+        # when
+        _, _, expected = collapse_kmer_graph(graph_path)
+        unitig_graph = collapse_columnar_graph(graph_path)
+
+        # then
+        unitig, = list(unitig_graph)
+        assert unitig.is_cycle
+        assert unitig.contig in cycle_rotations('ACAC', 3)
+        assert ((1,), (1,)) == unitig.coverage
+        assert [(unitig, unitig, 0)] == list(unitig_graph.edges(keys=True))
+        expected_unitig, = list(expected)
+        assert expected_unitig.is_cycle
+        assert expected_unitig.contig in cycle_rotations(unitig.contig, 3)
+
+    def test_does_not_close_kmers_that_overlap_in_both_directions_into_cycle(self, tmpdir):
+        # given
+        graph_path = write_graph_of_kmers(tmpdir / 'graph.ctx', ['ACA 1 .....C..',
+                                                                 'CAC 1 a.......'])
+
+        # when
+        _, _, expected = collapse_kmer_graph(graph_path)
+        unitig_graph = collapse_columnar_graph(graph_path)
+
+        # then
+        unitig, = list(unitig_graph)
+        assert 'ACAC' == unitig.contig
+        assert not unitig.is_cycle
+        assert [] == list(unitig_graph.edges(keys=True))
+        assert canonical_unitigs(expected) == canonical_unitigs(unitig_graph)
+
+    def test_finds_cycle_of_record_whose_kmers_overlap_in_both_directions(self, tmpdir):
+        # given
+        # the graph builder links CTC and TCT in both directions, so CTCT is a cycle
+        graph_path = write_graph_of_records(tmpdir / 'graph.ctx', ['CTCT'], 3)
+
+        # when
+        unitig_graph = collapse_columnar_graph(graph_path)
+
+        # then
+        unitig, = list(unitig_graph)
+        assert unitig.is_cycle
+        assert unitig.contig in cycle_rotations('CTCT', 3)
+        assert [(unitig, unitig, 0)] == list(unitig_graph.edges(keys=True))
+
+    def test_collapses_graph_without_kmers(self, tmpdir):
+        # given
+        graph_path = write_graph_of_records(tmpdir / 'graph.ctx', [], 3)
+
+        # when
+        with open(graph_path, 'rb') as fh:
+            unitig_graph = UnitigCollapser(
+                ColumnarGraph.from_graph_handle(fh)
+            ).collapse_kmer_unitigs().unitig_graph
+
+        # then
+        assert 0 == len(unitig_graph)
+
+
+class TestColumnarGraphIsSorted(object):
+    def test_sorted_graph(self, tmpdir):
+        # given
+        graph_path = write_graph_of_records(tmpdir / 'graph.ctx', ['AACCAC'], 3)
+
+        # when
+        with open(graph_path, 'rb') as fh:
+            is_sorted = ColumnarGraph.from_graph_handle(fh).is_sorted()
+
+        # then
+        assert is_sorted
+
+    def test_unsorted_graph(self, tmpdir):
+        # given
+        graph = builder.Graph().with_kmer_size(3).with_kmer('AAC').with_kmer('ACC').build()
+        record_size = Header.from_stream(graph).record_size
+        graph = graph.getvalue()
+        graph_path = tmpdir / 'graph.ctx'
+        graph_path.write_binary(graph[:-2 * record_size] + graph[-record_size:]
+                                + graph[-2 * record_size:-record_size])
+
+        # when
+        with open(graph_path, 'rb') as fh:
+            is_sorted = ColumnarGraph.from_graph_handle(fh).is_sorted()
+
+        # then
+        assert not is_sorted
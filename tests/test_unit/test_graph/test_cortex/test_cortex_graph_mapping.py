@@ -3,6 +3,7 @@ from hypothesis import given, strategies
 
 from cortexpy.graph.cortex import CortexGraphMapping
 from cortexpy.graph.parser.kmer import EmptyKmerBuilder
+from cortexpy.int_kmer import IntKmerCodec
 from cortexpy.test.builder.graph.cortex import get_cortex_graph_mapping_builder
 
 
@@ -114,3 +115,22 @@ class Test(object):
         assert 2 == len(cgm)
         assert '.....C..' == cgm['AAA'].edges[0].to_str()
         assert 'a.......' == cgm['AAC'].edges[0].to_str()
+
+
+class TestGetKmerForInt(object):
+    def test_respects_added_and_deleted_kmers(self):
+        # given
+        b = get_cortex_graph_mapping_builder()
+        b.with_kmer('AAA 1 ........')
+        b.with_kmer('AAC 1 ........')
+        cgm = b.build()
+        codec = IntKmerCodec(3)
+        assert 'AAA' == cgm.get_kmer_for_int(codec.encode('TTT')).kmer
+
+        # when
+        del cgm['AAA']
+
+        # then
+        with pytest.raises(KeyError):
+            cgm.get_kmer_for_int(codec.encode('TTT'))
+        assert 'AAC' == cgm.get_kmer_for_int(codec.encode('AAC')).kmer
@@ -0,0 +1,82 @@
+import io
+
+import pytest
+
+import cortexpy.test.builder as builder
+from cortexpy.graph.join import join_graph_streams
+from cortexpy.graph.parser.header import Header
+from cortexpy.graph.parser.streaming import kmer_generator_from_stream
+
+
+def join_and_parse(graph_builders, block_size=None):
+    output = io.BytesIO()
+    kwargs = {}
+    if block_size is not None:
+        kwargs['block_size'] = block_size
+    n_kmers = join_graph_streams([b.build() for b in graph_builders], output, **kwargs)
+    output.seek(0)
+    header = Header.from_stream(output)
+    kmers = list(kmer_generator_from_stream(io.BytesIO(output.getvalue())))
+    return n_kmers, header, kmers
+
+
+class TestJoinGraphStreams(object):
+    @pytest.mark.parametrize('block_size', [None, 1])
+    def test_merges_kmers_of_two_graphs_into_two_colors(self, block_size):
+        # given
+        graph1 = builder.Graph() \
+            .with_kmer_size(3) \
+            .with_color_names('g1') \
+            .with_kmer('AAA 1 .....C..') \
+            .with_kmer('AAC 2 a.......')
+        graph2 = builder.Graph() \
+            .with_kmer_size(3) \
+            .with_kmer('AAC 3 .......T') \
+            .with_kmer('ACT 4 a.......')
+
+        # when
+        n_kmers, header, kmers = join_and_parse([graph1, graph2], block_size=block_size)
+
+        # then
+        assert 3 == n_kmers
+        assert 2 == header.num_colors
+        assert b'g1' == header.sample_names[0]
+        assert ['AAA', 'AAC', 'ACT'] == [k.kmer for k in kmers]
+        assert [(1, 0), (2, 3), (0, 4)] == [tuple(k.coverage) for k in kmers]
+        assert ['.....C.. ........',
+                'a....... .......T',
+                '........ a.......'] == [' '.join(e.to_str() for e in k.edges) for k in kmers]
+
+    def test_joins_graph_with_itself_into_two_identical_colors(self):
+        # given
+        graph = builder.Graph() \
+            .with_kmer_size(3) \
+            .with_num_colors(2) \
+            .with_kmer('AAA 1 2 .....C.. ........')
+
+        # when
+        _, header, kmers = join_and_parse([graph, graph])
+
+        # then
+        assert 4 == header.num_colors
+        assert [(1, 2, 1, 2)] == [tuple(k.coverage) for k in kmers]
+
+    def test_raises_on_different_kmer_sizes(self):
+        # given
+        graph1 = builder.Graph().with_kmer('AAA')
+        graph2 = builder.Graph().with_kmer('AAAAA')
+
+        # when/then
+        with pytest.raises(ValueError):
+            join_and_parse([graph1, graph2])
+
+    def test_raises_on_unsorted_graph(self):
+        # given
+        graph1 = builder.Graph() \
+            .without_sorted_kmers() \
+            .with_kmer('AAC') \
+            .with_kmer('AAA')
+
+        # when/then
+        with pytest.raises(ValueError):
+            join_and_parse([graph1, builder.Graph().with_kmer('AAA')])
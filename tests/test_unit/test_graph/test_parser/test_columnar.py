@@ -0,0 +1,190 @@
+import io
+
+import numpy as np
+import pytest
+from hypothesis import given
+from hypothesis import strategies as s
+
+import cortexpy.test.builder as builder
+from cortexpy.graph.parser.columnar import (
+    KmerColumns,
+    is_sorted_from_stream_and_header,
+    kmer_columns_generator_from_stream_and_header,
+    load_kmer_columns,
+)
+from cortexpy.graph.parser.header import Header
+from cortexpy.graph.parser.kmer import StringKmerConverter
+from cortexpy.graph.parser.kmer_ext import raw_block_to_kmer_bytes
+from cortexpy.test.builder.graph.body import Body
+from cortexpy.test.builder.graph.kmer import kmer_records
+
+
+class TestKmerColumnsGeneratorFromStreamAndHeader(object):
+    @given(s.data(),
+           s.integers(min_value=1, max_value=65).map(lambda i: i * 2 - 1),
+           s.integers(min_value=1, max_value=5),
+           s.integers(min_value=0, max_value=7),
+           s.integers(min_value=1, max_value=100))
+    def test_parses_records(self, data, kmer_size, num_colors, n_kmers, block_size):
+        # given
+        body_builder = Body(sort_kmers=False, kmer_size=kmer_size)
+        expected_kmers = []
+        for _ in range(n_kmers):
+            kmer = data.draw(kmer_records(kmer_size, num_colors))
+            body_builder.with_kmer_record(kmer)
+            expected_kmers.append(kmer)
+        header = Header(kmer_size=kmer_size,
+                        kmer_container_size=body_builder.kmer_container_size,
+                        num_colors=num_colors)
+
+        # when
+        blocks = list(kmer_columns_generator_from_stream_and_header(body_builder.build(),
+                                                                    header,
+                                                                    block_size=block_size))
+
+        # then
+        assert all(len(b) <= max(1, block_size // header.record_size) for b in blocks)
+        assert n_kmers == sum(len(b) for b in blocks)
+        converter = StringKmerConverter(kmer_size)
+        rows = ((b, row) for b in blocks for row in range(len(b)))
+        for expected_kmer, (block, row) in zip(expected_kmers, rows):
+            assert list(converter.to_uints(expected_kmer.kmer)) == list(block.kmers[row])
+            assert list(expected_kmer.coverage) == list(block.coverage[row])
+            expected_edges = [np.packbits(e.data)[0] for e in expected_kmer.edges]
+            assert expected_edges == list(block.edges[row])
+
+    def test_stops_after_n_records(self):
+        # given
+        graph_builder = builder.Graph().with_kmer_size(3)
+        for kmer in ['AAA', 'AAC', 'AAG']:
+            graph_builder.with_kmer(kmer)
+        stream = graph_builder.build()
+        header = Header.from_stream(stream)
+
+        # when
+        blocks = list(kmer_columns_generator_from_stream_and_header(stream, header,
+                                                                    block_size=1,
+                                                                    n_records=2))
+
+        # then
+        assert [1, 1] == [len(b) for b in blocks]
+
+    def test_raises_on_truncated_record(self):
+        # given
+        graph_builder = builder.Graph().with_kmer_size(3).with_kmer('AAA')
+        stream = io.BytesIO(graph_builder.build().getvalue()[:-1])
+        header = Header.from_stream(stream)
+
+        # when/then
+        with pytest.raises(ValueError):
+            list(kmer_columns_generator_from_stream_and_header(stream, header))
+
+
+class TestLoadKmerColumns(object):
+    def test_loads_two_colors(self):
+        # given
+        graph_builder = builder.Graph() \
+            .with_kmer_size(3) \
+            .with_kmer('AAA 1 0 .......T ........') \
+            .with_kmer('AAT 2 3 a....C.. a.......')
+
+        # when
+        columns = load_kmer_columns(graph_builder.build())
+
+        # then
+        assert [[0], [3]] == columns.kmers.tolist()
+        assert [[1, 0], [2, 3]] == columns.coverage.tolist()
+        assert [[0b00001000, 0], [0b10000010, 0b10000000]] == columns.edges.tolist()
+
+    def test_loads_empty_graph(self):
+        # given
+        graph_builder = builder.Graph().with_kmer_size(3).with_num_colors(2)
+
+        # when
+        columns = load_kmer_columns(graph_builder.build())
+
+        # then
+        assert 0 == len(columns)
+        assert (0, 2) == columns.coverage.shape
+
+
+def swap_last_two_records(graph):
+    record_size = Header.from_stream(graph).record_size
+    graph = graph.getvalue()
+    return io.BytesIO(graph[:-2 * record_size] + graph[-record_size:]
+                      + graph[-2 * record_size:-record_size])
+
+
+class TestIsSortedFromStreamAndHeader(object):
+    @pytest.mark.parametrize('block_size', [1, 2 ** 16])
+    def test_sorted_graph(self, block_size):
+        # given
+        graph = builder.Graph().with_kmer_size(3).with_kmer('AAC').with_kmer('ACC').build()
+        header = Header.from_stream(graph)
+
+        # when/then
+        assert is_sorted_from_stream_and_header(graph, header, block_size=block_size)
+
+    @pytest.mark.parametrize('block_size', [1, 2 ** 16])
+    def test_unsorted_graph(self, block_size):
+        # given
+        graph = swap_last_two_records(
+            builder.Graph().with_kmer_size(3).with_kmer('AAC').with_kmer('ACC').build())
+        header = Header.from_stream(graph)
+
+        # when/then
+        assert not is_sorted_from_stream_and_header(graph, header, block_size=block_size)
+
+    @pytest.mark.parametrize('block_size', [1, 2 ** 16])
+    def test_graph_with_duplicate_kmer(self, block_size):
+        # given
+        graph = builder.Graph().with_kmer_size(3).with_kmer('AAC').with_kmer('ACC').build()
+        record_size = Header.from_stream(graph).record_size
+        graph = io.BytesIO(graph.getvalue() + graph.getvalue()[-record_size:])
+        header = Header.from_stream(graph)
+
+        # when/then
+        assert not is_sorted_from_stream_and_header(graph, header, block_size=block_size)
+
+    def test_empty_graph(self):
+        # given
+        graph = builder.Graph().with_kmer_size(3).build()
+        header = Header.from_stream(graph)
+
+        # when/then
+        assert is_sorted_from_stream_and_header(graph, header)
+
+
+class TestBlockKernels(object):
+    @given(s.data(),
+           s.integers(min_value=1, max_value=65).map(lambda i: i * 2 - 1),
+           s.integers(min_value=1, max_value=5),
+           s.integers(min_value=0, max_value=7))
+    def test_decode_records(self, data, kmer_size, num_colors, n_kmers):
+        # given
+        body_builder = Body(sort_kmers=False, kmer_size=kmer_size)
+        expected_kmers = []
+        for _ in range(n_kmers):
+            kmer = data.draw(kmer_records(kmer_size, num_colors))
+            body_builder.with_kmer_record(kmer)
+            expected_kmers.append(kmer)
+        header = Header(kmer_size=kmer_size,
+                        kmer_container_size=body_builder.kmer_container_size,
+                        num_colors=num_colors)
+        block = body_builder.build().getvalue()
+
+        # when
+        kmer_bytes = raw_block_to_kmer_bytes(kmer_size, header.record_size, block)
+        columns = KmerColumns.from_buffer(block, header)
+
+        # then
+        expected_strings = [k.kmer for k in expected_kmers]
+        assert ''.join(expected_strings).encode() == kmer_bytes
+        assert expected_strings == columns.kmer_strings(kmer_size)
+        assert [list(k.coverage) for k in expected_kmers] == columns.coverage.tolist()
+        expected_edges = [[list(e.data) for e in k.edges] for k in expected_kmers]
+        assert expected_edges == np.unpackbits(columns.edges[..., np.newaxis], axis=-1).tolist()
+
+    def test_raises_on_partial_record(self):
+        with pytest.raises(AssertionError):
+            raw_block_to_kmer_bytes(3, 13, b'\x00' * 14)
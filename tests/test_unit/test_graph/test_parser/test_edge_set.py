@@ -1,7 +1,13 @@
+import io
+
 import numpy as np
 import pytest
+from hypothesis import given
+from hypothesis import strategies as s
 
-from cortexpy.edge_set import EdgeSet
+from cortexpy.constants import EdgeTraversalOrientation
+from cortexpy.edge_set import EdgeSet, ByteEdgeSet
+from cortexpy.int_kmer import IntKmerCodec
 
 
 class TestIsEdge(object):
@@ -92,6 +98,27 @@ class TestIncomingOutgoingKmers(object):
             es.get_incoming_kmers('TTT')
 
 
+class TestIncomingOutgoingKmerInts(object):
+    @given(s.lists(s.integers(min_value=0, max_value=1), min_size=8, max_size=8),
+           s.text('ACGT', min_size=1, max_size=40))
+    def test_matches_kmer_strings(self, edges, kmer_string):
+        # given
+        es = EdgeSet(np.array(edges, dtype=np.uint8))
+        codec = IntKmerCodec(len(kmer_string))
+        kmer_int = codec.encode(kmer_string)
+
+        # when
+        incoming = [codec.decode(k) for k in es.get_incoming_kmer_ints(kmer_int, codec)]
+        outgoing = [codec.decode(k) for k in es.get_outgoing_kmer_ints(kmer_int, codec)]
+
+        # then
+        assert list(es.get_incoming_kmer_strings(kmer_string)) == incoming
+        assert list(es.get_outgoing_kmer_strings(kmer_string)) == outgoing
+        for oriented_edge_set in [es.oriented(o) for o in EdgeTraversalOrientation]:
+            assert (oriented_edge_set.num_neighbor(kmer_string)
+                    == oriented_edge_set.num_neighbor_for_int(kmer_int, codec))
+
+
 class TestStr(object):
     def test_empty_kmer(self):
         es = EdgeSet(np.zeros(8))
@@ -104,3 +131,41 @@ class TestStr(object):
         es.add_edge('c')
         assert '.c..A...' == es.to_str()
         assert '...T..g.' == es.to_str(as_revcomp=True)
+
+
+class TestByteEdgeSet(object):
+    def test_matches_array_edge_set_for_all_bytes(self):
+        for byte in range(256):
+            data = np.unpackbits(np.array([byte], dtype=np.uint8))
+            es = EdgeSet(data)
+            bes = ByteEdgeSet(byte)
+
+            assert bes == es
+            assert es == bes
+            assert list(bes.data) == list(es.data)
+            assert list(bes.incoming) == list(es.incoming)
+            assert list(bes.outgoing) == list(es.outgoing)
+            assert bes.num_incoming() == es.num_incoming()
+            assert bes.num_outgoing() == es.num_outgoing()
+            for as_revcomp in [True, False]:
+                assert bes.to_str(as_revcomp=as_revcomp) == es.to_str(as_revcomp=as_revcomp)
+            for letter in 'acgtACGT':
+                assert bes.is_edge(letter) == es.is_edge(letter)
+            assert (list(bes.get_incoming_kmer_strings('AAC'))
+                    == list(es.get_incoming_kmer_strings('AAC')))
+            assert (list(bes.get_outgoing_kmer_strings('GTT'))
+                    == list(es.get_outgoing_kmer_strings('GTT')))
+
+            bes_buffer = io.BytesIO()
+            bes.dump(bes_buffer)
+            es_buffer = io.BytesIO()
+            es.dump(es_buffer)
+            assert bes_buffer.getvalue() == es_buffer.getvalue() == bytes([byte])
+
+    def test_add_and_remove_edges_update_byte(self):
+        bes = ByteEdgeSet(0)
+        bes.add_edge('a')
+        bes.add_edge('A')
+        assert bes.byte == 0b10000001
+        bes.remove_edge('a')
+        assert bes.byte == 0b00000001
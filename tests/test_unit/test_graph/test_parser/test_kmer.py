@@ -11,7 +11,7 @@ from cortexpy.graph.parser.kmer import (
     KmerData,
     disconnect_kmers,
 )
-from cortexpy.test.builder.graph.body import KmerRecord
+from cortexpy.test.builder.graph.body import Body, KmerRecord
 from cortexpy.test.builder.graph.kmer import dna_sequences, kmer_strings, kmer_records
 
 
@@ -289,6 +289,41 @@ class TestHasEdgeTo(object):
         assert not kmer2.has_incoming_edge_from_kmer_in_color(kmer1, color_to_check)
 
 
+class TestToBytes(object):
+    @given(s.data(),
+           s.integers(min_value=1, max_value=33).map(lambda i: i * 2 - 1),
+           s.integers(min_value=1, max_value=3))
+    def test_writes_raw_record_of_unchanged_and_decoded_kmer(self, data, kmer_size, num_colors):
+        # given
+        record = data.draw(kmer_records(kmer_size, num_colors))
+        raw_record = Body(sort_kmers=False, kmer_size=kmer_size) \
+            .with_kmer_record(record) \
+            .build() \
+            .getvalue()
+        kmer = Kmer.from_kmer_data(KmerData(raw_record, kmer_size, num_colors))
+
+        # when/then
+        assert raw_record == kmer.to_bytes()
+        assert record.coverage == kmer.coverage
+        assert record.edges == kmer.edges
+        assert raw_record == kmer.to_bytes()
+
+    def test_writes_changed_coverage_and_edges(self):
+        # given
+        kmer = EmptyKmerBuilder(2).build('AAA')
+        kmer = Kmer.from_kmer_data(KmerData(kmer.to_bytes(), 3, 2))
+        kmer.edges[1].add_edge('t')
+        kmer.coverage = (7, 3)
+
+        # when
+        written = Kmer.from_kmer_data(KmerData(kmer.to_bytes(), 3, 2))
+
+        # then
+        assert 'AAA' == written.kmer
+        assert (7, 3) == written.coverage
+        assert ['........', '...t....'] == [e.to_str() for e in written.edges]
+
+
 class TestStringKmerConverter(object):
     @given(s.lists(s.sampled_from(list('ACGT')), min_size=1, max_size=65))
     def test_kmer_sizes(self, letters):
@@ -0,0 +1,114 @@
+from functools import partial
+from operator import add
+
+import pytest
+
+import cortexpy.test.builder as builder
+from cortexpy.graph.parser.parallel import (
+    kmer_generator_from_path,
+    load_cortex_graph_from_path,
+    parallel_map_records,
+    record_ranges,
+)
+from cortexpy.graph.parser.streaming import kmer_generator_from_stream
+
+
+def n_records_in_block(header, block):
+    return len(block) // header.record_size
+
+
+def first_coverage_in_block(n_colors, header, block):
+    assert n_colors == header.num_colors
+    return [block[start + 8] for start in range(0, len(block), header.record_size)]
+
+
+def write_graph(tmpdir, kmer_strings):
+    graph_builder = builder.Graph().with_kmer_size(3)
+    for idx, kmer_string in enumerate(kmer_strings):
+        graph_builder.with_kmer('{} {} ........'.format(kmer_string, idx + 1))
+    graph_path = tmpdir / 'graph.ctx'
+    graph_path.write_binary(graph_builder.build().getvalue())
+    return str(graph_path)
+
+
+KMER_STRINGS = ['AAA', 'AAC', 'AAG', 'AAT', 'ACA', 'ACC', 'ACG']
+
+
+class TestRecordRanges(object):
+    def test_splits_records_into_contiguous_ranges(self):
+        assert [(0, 2), (2, 4), (4, 7)] == record_ranges(7, 3)
+
+    def test_does_not_return_more_ranges_than_records(self):
+        assert [(0, 1), (1, 2)] == record_ranges(2, 4)
+
+    def test_returns_single_empty_range_without_records(self):
+        assert [(0, 0)] == record_ranges(0, 4)
+
+
+class TestParallelMapRecords(object):
+    @pytest.mark.parametrize('n_workers', [1, 3])
+    def test_returns_block_results_in_record_order(self, tmpdir, n_workers):
+        # given
+        graph_path = write_graph(tmpdir, KMER_STRINGS)
+
+        # when
+        results = parallel_map_records(graph_path, partial(first_coverage_in_block, 1),
+                                       n_workers=n_workers, block_size=2 * 13)
+
+        # then
+        assert list(range(1, 8)) == [c for block in results for c in block]
+
+    @pytest.mark.parametrize('n_workers', [1, 2])
+    def test_streams_first_block_result(self, tmpdir, n_workers):
+        # given
+        graph_path = write_graph(tmpdir, KMER_STRINGS)
+
+        # when
+        results = parallel_map_records(graph_path, partial(first_coverage_in_block, 1),
+                                       n_workers=n_workers, block_size=2 * 13)
+
+        # then
+        first_results = next(results)
+        assert 1 == first_results[0]
+        assert list(range(1, 8)) == first_results + [c for block in results for c in block]
+
+    @pytest.mark.parametrize('n_workers', [1, 3])
+    def test_reduces_block_results(self, tmpdir, n_workers):
+        # given
+        graph_path = write_graph(tmpdir, KMER_STRINGS)
+
+        # when
+        n_records = parallel_map_records(graph_path, n_records_in_block, n_workers=n_workers,
+                                         reduce_func=add, initial=0, block_size=13)
+
+        # then
+        assert 7 == n_records
+
+    def test_reduces_empty_graph_to_initial(self, tmpdir):
+        # given
+        graph_path = write_graph(tmpdir, [])
+
+        # when
+        n_records = parallel_map_records(graph_path, n_records_in_block, n_workers=2,
+                                         reduce_func=add, initial=0)
+
+        # then
+        assert 0 == n_records
+
+
+class TestLoadCortexGraphFromPath(object):
+    @pytest.mark.parametrize('n_workers', [1, 3])
+    def test_loads_same_kmers_as_stream(self, tmpdir, n_workers):
+        # given
+        graph_path = write_graph(tmpdir, KMER_STRINGS)
+        with open(graph_path, 'rb') as fh:
+            expected = list(kmer_generator_from_stream(fh))
+
+        # when
+        kmers = list(kmer_generator_from_path(graph_path, n_workers=n_workers))
+        graph = load_cortex_graph_from_path(graph_path, n_workers=n_workers)
+
+        # then
+        assert expected == kmers
+        assert KMER_STRINGS == [k.kmer for k in kmers]
+        assert set(KMER_STRINGS) == set(graph.nodes)
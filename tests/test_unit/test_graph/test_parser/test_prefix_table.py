@@ -0,0 +1,96 @@
+import itertools
+
+import numpy as np
+import pytest
+from hypothesis import given
+from hypothesis import strategies as s
+
+from cortexpy.graph.parser.kmer import StringKmerConverter
+from cortexpy.graph.parser.prefix_table import (
+    MAX_PREFIX_LENGTH, PrefixJumpTable, kmer_prefixes,
+)
+
+
+class TestKmerPrefixes(object):
+    def test_extracts_leading_bases_across_container_words(self):
+        # given
+        kmer_string = 'CGTA' + 'T' * 32
+        converter = StringKmerConverter(len(kmer_string))
+        kmers = np.array([converter.to_uints(kmer_string)])
+
+        # when
+        prefixes = [int(kmer_prefixes(kmers, len(kmer_string), length)[0])
+                    for length in [1, 4, 6]]
+
+        # then
+        expected_prefixes = [int(kmer_string[:length].translate(str.maketrans('ACGT', '0123')), 4)
+                             for length in [1, 4, 6]]
+        assert expected_prefixes == prefixes
+
+
+class TestRecordBounds(object):
+    @given(s.data(),
+           s.integers(min_value=1, max_value=129),
+           s.integers(min_value=0, max_value=20),
+           s.integers(min_value=1, max_value=6))
+    def test_bounds_contain_insertion_index(self, data, kmer_size, n_kmers, prefix_length):
+        # given
+        kmer_strings = sorted(set(data.draw(
+            s.lists(s.text('ACGT', min_size=kmer_size, max_size=kmer_size), max_size=n_kmers)
+        )))
+        query = data.draw(s.text('ACGT', min_size=kmer_size, max_size=kmer_size))
+        converter = StringKmerConverter(kmer_size)
+        kmers = np.array([converter.to_uints(k) for k in kmer_strings], dtype=np.uint64)
+        kmers = kmers.reshape(-1, (kmer_size + 31) // 32)
+
+        # when
+        table = PrefixJumpTable.from_kmer_blocks([kmers[:3], kmers[3:]],
+                                                 kmer_size=kmer_size,
+                                                 kmer_container_size=kmers.shape[1],
+                                                 prefix_length=prefix_length)
+        start, stop = table.record_bounds(converter.to_uints(query))
+
+        # then
+        assert len(kmer_strings) == table.offsets[-1]
+        expected_index = sum(k < query for k in kmer_strings)
+        assert start <= expected_index <= stop
+        assert all(k[:table.prefix_length] == query[:table.prefix_length]
+                   for k in kmer_strings[start:stop])
+
+    def test_caps_prefix_length_at_kmer_size(self):
+        # when
+        table = PrefixJumpTable.from_kmer_blocks([], kmer_size=3, kmer_container_size=1,
+                                                 prefix_length=8)
+
+        # then
+        assert 3 == table.prefix_length
+        assert 4 ** 3 + 1 == len(table.offsets)
+
+    def test_caps_prefix_length_at_max_prefix_length(self):
+        # when
+        table = PrefixJumpTable.from_kmer_blocks([], kmer_size=31, kmer_container_size=1,
+                                                 prefix_length=31)
+
+        # then
+        assert MAX_PREFIX_LENGTH == table.prefix_length
+        assert 4 ** MAX_PREFIX_LENGTH + 1 == len(table.offsets)
+
+    @pytest.mark.parametrize('prefix_length', [0, -1])
+    def test_raises_on_prefix_length_below_one(self, prefix_length):
+        # when/then
+        with pytest.raises(ValueError):
+            PrefixJumpTable.from_kmer_blocks([], kmer_size=3, kmer_container_size=1,
+                                             prefix_length=prefix_length)
+
+    def test_counts_records_per_prefix(self):
+        # given
+        kmer_strings = [''.join(p) for p in itertools.product('ACGT', repeat=3)]
+        converter = StringKmerConverter(3)
+        kmers = np.array([converter.to_uints(k) for k in kmer_strings], dtype=np.uint64)
+
+        # when
+        table = PrefixJumpTable.from_kmer_blocks([kmers], kmer_size=3, kmer_container_size=1,
+                                                 prefix_length=1)
+
+        # then
+        assert [0, 16, 32, 48, 64] == table.offsets.tolist()
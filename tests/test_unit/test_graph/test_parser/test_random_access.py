@@ -1,4 +1,5 @@
 import io
+import os
 import random
 from unittest import mock
 
@@ -12,7 +13,9 @@ import cortexpy.graph.serializer.kmer as kmer_serializer
 import cortexpy.test.builder as builder
 from cortexpy.graph.parser.header import Header
 from cortexpy.graph.parser.random_access import KmerUintSequence
+from cortexpy.graph.parser.sparse_index import SparseKmerIndex, sparse_index_path
 from cortexpy.test.builder.graph.body import KmerRecord, as_edge_set
+from cortexpy.int_kmer import IntKmerCodec
 from cortexpy.test.builder.graph.kmer import kmer_records
 from cortexpy.utils import lexlo
 
@@ -79,9 +82,44 @@ class TestSlurpedDunderGetitemDunder(TestDunderGetitemDunder):
     RAClass = parser.SlurpedRandomAccess.from_handle
 
 
+class TestMmapDunderGetitemDunder(TestDunderGetitemDunder):
+    RAClass = parser.MmapRandomAccess
+
+
+class TestInMemoryIndexDunderGetitemDunder(TestDunderGetitemDunder):
+    @staticmethod
+    def RAClass(graph_handle):
+        return parser.RandomAccess(graph_handle, load_kmer_uints=True)
+
+
+class TestMmapInMemoryIndexDunderGetitemDunder(TestDunderGetitemDunder):
+    @staticmethod
+    def RAClass(graph_handle):
+        return parser.MmapRandomAccess(graph_handle, load_kmer_uints=True)
+
+
+class TestPrefixJumpTableDunderGetitemDunder(TestDunderGetitemDunder):
+    @staticmethod
+    def RAClass(graph_handle):
+        return parser.RandomAccess(graph_handle, prefix_length=2)
+
+
+class TestMmapPrefixJumpTableDunderGetitemDunder(TestDunderGetitemDunder):
+    @staticmethod
+    def RAClass(graph_handle):
+        return parser.MmapRandomAccess(graph_handle, prefix_length=2)
+
+
+class TestClockCacheDunderGetitemDunder(TestDunderGetitemDunder):
+    @staticmethod
+    def RAClass(graph_handle):
+        return parser.RandomAccess(graph_handle, kmer_cache_size=1, cache_policy='clock')
+
+
 class TestGetKmerForString(object):
     @pytest.mark.parametrize('RAClass',
-                             (parser.RandomAccess, parser.SlurpedRandomAccess.from_handle))
+                             (parser.RandomAccess, parser.SlurpedRandomAccess.from_handle,
+                              parser.MmapRandomAccess))
     def test_gets_aaa_for_ttt_query(self, RAClass):
         # given
         graph_builder = builder.Graph()
@@ -98,6 +136,85 @@ class TestGetKmerForString(object):
         assert expected_kmer.kmer == cg.get_kmer_for_string('TTT').kmer
 
 
+class TestGetKmersForStrings(object):
+    @pytest.mark.parametrize('RAClass',
+                             (parser.RandomAccess, parser.SlurpedRandomAccess.from_handle,
+                              parser.MmapRandomAccess,
+                              lambda fh: parser.RandomAccess(fh, load_kmer_uints=True),
+                              lambda fh: parser.RandomAccess(fh, prefix_length=2)))
+    def test_returns_kmers_and_misses_in_input_order(self, RAClass):
+        # given
+        graph_builder = builder.Graph() \
+            .with_kmer_size(3) \
+            .with_kmer('AAA 1 .......T') \
+            .with_kmer('AAT 2 a....C..') \
+            .with_kmer('ACG 3 ........')
+        cg = RAClass(graph_builder.build())
+
+        # when
+        kmers = cg.get_kmers_for_strings(['CGT', 'AAC', 'ATT', 'AAA', 'TTT', 'CCC'])
+
+        # then
+        assert [None, None] == [kmers[1], kmers[5]]
+        kmers = [kmers[idx] for idx in [0, 2, 3, 4]]
+        assert ['ACG', 'AAT', 'AAA', 'AAA'] == [k.kmer for k in kmers]
+        assert [(3,), (2,), (1,), (1,)] == [tuple(k.coverage) for k in kmers]
+        edge_strings = [k.edges[0].to_str() for k in kmers]
+        assert ['........', 'a....C..', '.......T', '.......T'] == edge_strings
+
+    def test_retrieves_cached_kmers_and_misses_without_reading(self):
+        # given
+        fh = builder.Graph() \
+            .with_kmer_size(3) \
+            .with_kmer('AAA 1 .......T') \
+            .with_kmer('AAT 2 a....C..') \
+            .build()
+        ra = parser.RandomAccess(fh)
+        ra.get_kmers_for_strings(['TTT', 'AAT', 'CCC'])
+
+        with mock.patch.object(fh, 'read', wraps=fh.read) as mocked_read:
+            # when
+            kmers = ra.get_kmers_for_strings(['AAT', 'CCC', 'AAA'])
+
+            # then
+            assert 0 == mocked_read.call_count
+        assert ['AAT', None, 'AAA'] == [k if k is None else k.kmer for k in kmers]
+        assert 3 == ra.record_cache.stats.hits
+
+    @given(s.data(),
+           s.integers(min_value=1, max_value=35).map(lambda i: i * 2 - 1),
+           s.integers(min_value=0, max_value=5),
+           s.integers(min_value=0, max_value=5))
+    def test_agrees_with_get_kmer_for_string(self, data, kmer_size, n_kmers, n_queries):
+        # given
+        graph_builder = (builder.Graph()
+                         .with_kmer_size(kmer_size)
+                         .with_num_colors(1))
+        seen_kmers = set()
+        for _ in range(n_kmers):
+            kmer = data.draw(kmer_records(kmer_size, 1))
+            assume(lexlo(kmer.kmer) not in seen_kmers)
+            seen_kmers.add(lexlo(kmer.kmer))
+            kmer.kmer = lexlo(kmer.kmer)
+            graph_builder.with_kmer_record(kmer)
+        queries = [data.draw(kmer_records(kmer_size, 1)).kmer for _ in range(n_queries)]
+        queries += list(seen_kmers)
+        cg = parser.RandomAccess(graph_builder.build())
+
+        # when
+        kmers = cg.get_kmers_for_strings(queries)
+
+        # then
+        for query, kmer in zip(queries, kmers):
+            try:
+                expected = cg.get_kmer_for_string(query)
+            except KeyError:
+                assert kmer is None
+            else:
+                assert expected.kmer == kmer.kmer
+                assert expected.coverage == kmer.coverage
+
+
 class TestDunderIterDunder:
     RAClass = parser.RandomAccess
 
@@ -188,6 +305,70 @@ class TestSlurpedDunderIterDunder(TestDunderIterDunder):
     RAClass = parser.SlurpedRandomAccess.from_handle
 
 
+class TestMmapDunderIterDunder(TestDunderIterDunder):
+    RAClass = parser.MmapRandomAccess
+
+
+class TestMmapRandomAccess:
+    def test_retrieves_kmers_from_file_without_reading_handle(self, tmpdir):
+        # given
+        b = builder.Graph() \
+            .with_kmer_size(3) \
+            .with_kmer('AAA 1 .......T') \
+            .with_kmer('AAT 2 a....C..')
+        graph_path = tmpdir / 'graph.ctx'
+        graph_path.write_binary(b.build().getvalue())
+
+        with open(str(graph_path), 'rb') as fh:
+            ra = parser.MmapRandomAccess(fh)
+
+            # when
+            with mock.patch.object(fh, 'read', wraps=fh.read) as mocked_read:
+                kmers = [ra[k] for k in ['AAA', 'AAT']]
+
+                # then
+                assert 0 == mocked_read.call_count
+            assert ['AAA', 'AAT'] == [k.kmer for k in kmers]
+            assert [(1,), (2,)] == [k.coverage for k in kmers]
+            assert ['.......T', 'a....C..'] == [k.edges[0].to_str() for k in kmers]
+            with pytest.raises(KeyError):
+                ra['AAC']
+
+    @pytest.mark.parametrize('load_kmer_uints', [False, True])
+    def test_closes_memory_map_on_exit(self, tmpdir, load_kmer_uints):
+        # given
+        b = builder.Graph() \
+            .with_kmer_size(3) \
+            .with_kmer('AAA 1 .......T') \
+            .with_kmer('AAT 2 a....C..')
+        graph_path = tmpdir / 'graph.ctx'
+        graph_path.write_binary(b.build().getvalue())
+
+        with open(str(graph_path), 'rb') as fh:
+            # when
+            with parser.MmapRandomAccess(fh, load_kmer_uints=load_kmer_uints) as ra:
+                assert (2,) == ra['AAT'].coverage
+                mapped_graph = ra._mmap
+
+            # then
+            assert mapped_graph.closed
+            assert not fh.closed
+
+    def test_dumps_mapped_kmers(self):
+        # given
+        b = builder.Graph() \
+            .with_kmer_size(3) \
+            .with_kmer('AAA 1 .......T')
+        ra = parser.MmapRandomAccess(b.build())
+        buffer = io.BytesIO()
+
+        # when
+        ra['AAA'].dump(buffer)
+
+        # then
+        assert ra.body.tobytes() == buffer.getvalue()
+
+
 class TestKmerUintSequence(object):
     @given(s.data(),
            s.integers(min_value=1, max_value=129),
@@ -226,6 +407,56 @@ class TestKmerUintSequence(object):
             assert idx == sequence.index_kmer_string(expected_kmer.kmer)
 
 
+class TestKmerUintArray(object):
+    @given(s.data(),
+           s.integers(min_value=1, max_value=129),
+           s.integers(min_value=0, max_value=5),
+           s.booleans())
+    def test_index_agrees_with_kmer_uint_sequence(self, data, kmer_size, n_kmers, mmap_body):
+        # given
+        assume(kmer_size % 2 == 1)
+        graph_builder = (builder.Graph()
+                         .with_kmer_size(kmer_size)
+                         .with_num_colors(1))
+        seen_kmers = set()
+        for _ in range(n_kmers):
+            kmer = data.draw(kmer_records(kmer_size, 1))
+            while kmer.kmer in seen_kmers:
+                kmer = data.draw(kmer_records(kmer_size, 1))
+            seen_kmers.add(kmer.kmer)
+            graph_builder.with_kmer_record(kmer)
+        queries = [data.draw(kmer_records(kmer_size, 1)).kmer for _ in range(3)]
+        queries += sorted(seen_kmers)
+
+        RAClass = parser.MmapRandomAccess if mmap_body else parser.RandomAccess
+        sequence = RAClass(graph_builder.build()).graph_kmer_sequence
+
+        # when
+        array = sequence.to_array()
+
+        # then
+        assert len(sequence) == len(array)
+        converter = sequence.kmer_string_converter
+        expected = [sequence.index_kmer_string(q) for q in queries]
+        assert expected == [array.index_kmer_string(q) for q in queries]
+        uint_vectors = np.array([converter.to_uints(q) for q in queries], dtype=np.uint64)
+        assert expected == list(array.index_uint_vectors(uint_vectors))
+
+    def test_index_resolves_ties_in_leading_words(self):
+        # given
+        kmer_size = 35
+        kmers = sorted(['A' * 32 + 'CAA', 'A' * 32 + 'CCA', 'A' * 32 + 'CGA', 'C' * 35])
+        graph_builder = builder.Graph().with_kmer_size(kmer_size)
+        for kmer in kmers:
+            graph_builder.with_kmer(kmer)
+        array = parser.RandomAccess(graph_builder.build()).graph_kmer_sequence.to_array()
+
+        # when/then
+        assert [0, 1, 2, 3] == [array.index_kmer_string(k) for k in kmers]
+        assert 2 == array.index_kmer_string('A' * 32 + 'CCT')
+        assert 4 == array.index_kmer_string('G' * 35)
+
+
 class TestCacheComplexity:
     @given(s.integers(min_value=0, max_value=16))
     def test_regular_ra_parser(self, num_kmers):
@@ -252,7 +483,31 @@ class TestCacheComplexity:
                 ra[seen_kmer]
 
             # then
-            assert 2 * num_kmers == mocked_read.call_count
+            assert 0 == mocked_read.call_count
+
+    @pytest.mark.parametrize('cache_policy', ['lru', 'clock'])
+    def test_bounded_cache_rereads_evicted_records(self, cache_policy):
+        # given
+        fh = builder.Graph() \
+            .with_kmer_size(3) \
+            .with_kmer('AAA') \
+            .with_kmer('AAC') \
+            .build()
+        ra = parser.RandomAccess(fh, kmer_cache_size=1, cache_policy=cache_policy)
+
+        with mock.patch.object(fh, 'read', wraps=fh.read) as mocked_read:
+            # when
+            ra['AAA']
+            ra['AAA']
+            n_reads_after_hit = mocked_read.call_count
+            ra['AAC']
+            ra['AAA']
+
+            # then
+            assert mocked_read.call_count > 2 * n_reads_after_hit
+        assert (1, 3, 2) == (ra.record_cache.stats.hits,
+                             ra.record_cache.stats.misses,
+                             ra.record_cache.stats.evictions)
 
     @given(s.integers(min_value=0, max_value=16))
     def test_slurping_ra_parser(self, num_kmers):
@@ -285,13 +540,114 @@ class TestCacheComplexity:
         fh.seek(0)
         num_header_reads = 10
         num_eof_reads = 1
+        num_block_reads = min(num_kmers, 1)
         with mock.patch.object(fh, 'read', wraps=fh.read) as mocked_read:
             # when
             ra = parser.SlurpedRandomAccess.from_handle(fh)
 
             # then
-            assert num_kmers + num_eof_reads + num_header_reads == mocked_read.call_count
+            assert num_block_reads + num_eof_reads + num_header_reads == mocked_read.call_count
 
             for seen_kmer in sorted(seen_kmers):
                 ra[seen_kmer]
-            assert num_kmers + num_eof_reads + num_header_reads == mocked_read.call_count
+            assert num_block_reads + num_eof_reads + num_header_reads == mocked_read.call_count
+
+
+class TestSparseIndex(object):
+    def build_graph(self, tmpdir, page_size):
+        kmer_strings = ['AAA', 'AAC', 'AAG', 'AAT', 'ACA', 'ACC', 'ACG']
+        graph_builder = builder.Graph().with_kmer_size(3)
+        for kmer_string in kmer_strings:
+            graph_builder.with_kmer(kmer_string + ' 1 ........')
+        graph_path = tmpdir / 'graph.ctx'
+        graph_path.write_binary(graph_builder.build().getvalue())
+        index = SparseKmerIndex.from_graph_path(graph_path, page_size=page_size)
+        with open(sparse_index_path(graph_path), 'wb') as fh:
+            index.dump(fh)
+        return graph_path, kmer_strings
+
+    def test_reads_one_page_per_lookup(self, tmpdir):
+        # given
+        graph_path, kmer_strings = self.build_graph(tmpdir, page_size=2 * 13)
+
+        with open(str(graph_path), 'rb') as fh:
+            ra = parser.RandomAccess(fh, kmer_cache_size=0)
+            assert ra.sparse_index is not None
+
+            for kmer_string in kmer_strings:
+                # when
+                with mock.patch.object(fh, 'read', wraps=fh.read) as mocked_read:
+                    kmer = ra[kmer_string]
+
+                    # then
+                    assert 3 == mocked_read.call_count
+                assert kmer_string == kmer.kmer
+            for missing_kmer_string in ['AGA', 'ACT', 'TTT']:
+                with pytest.raises(KeyError):
+                    ra[missing_kmer_string]
+
+    def test_batch_lookup_reads_one_page_per_kmer(self, tmpdir):
+        # given
+        graph_path, kmer_strings = self.build_graph(tmpdir, page_size=2 * 13)
+
+        with open(str(graph_path), 'rb') as fh:
+            ra = parser.RandomAccess(fh, kmer_cache_size=0)
+
+            # when
+            with mock.patch.object(fh, 'read', wraps=fh.read) as mocked_read:
+                kmers = ra.get_kmers_for_strings(kmer_strings)
+
+                # then
+                assert 3 * len(kmer_strings) == mocked_read.call_count
+            assert kmer_strings == [k.kmer for k in kmers]
+
+    def test_ignores_stale_index(self, tmpdir):
+        # given
+        graph_path, kmer_strings = self.build_graph(tmpdir, page_size=13)
+        graph_path.write_binary(graph_path.read_binary())
+        stat = os.stat(str(graph_path))
+        os.utime(str(graph_path), ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+        # when
+        with open(str(graph_path), 'rb') as fh:
+            ra = parser.RandomAccess(fh)
+
+            # then
+            assert ra.sparse_index is None
+            assert kmer_strings == [ra[k].kmer for k in kmer_strings]
+
+    def test_mmap_uses_index(self, tmpdir):
+        # given
+        graph_path, kmer_strings = self.build_graph(tmpdir, page_size=3 * 13)
+
+        # when
+        with open(str(graph_path), 'rb') as fh:
+            ra = parser.MmapRandomAccess(fh)
+
+            # then
+            assert ra.sparse_index is not None
+            assert kmer_strings == [ra[k].kmer for k in kmer_strings]
+            with pytest.raises(KeyError):
+                ra['AGA']
+
+
+class TestGetKmerForInt(object):
+    @pytest.mark.parametrize('RAClass', [parser.RandomAccess,
+                                         parser.MmapRandomAccess,
+                                         parser.SlurpedRandomAccess.from_handle])
+    def test_retrieves_lexlo_kmer(self, RAClass):
+        # given
+        ra = RAClass(builder.Graph()
+                     .with_kmer_size(3)
+                     .with_kmer('AAC 2 ........')
+                     .build())
+        codec = IntKmerCodec(3)
+
+        # when
+        kmer = ra.get_kmer_for_int(codec.encode('GTT'))
+
+        # then
+        assert 'AAC' == kmer.kmer
+        assert (2,) == kmer.coverage
+        with pytest.raises(KeyError):
+            ra.get_kmer_for_int(codec.encode('AAA'))
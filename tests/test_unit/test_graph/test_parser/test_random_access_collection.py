@@ -7,6 +7,7 @@ from hypothesis import strategies as s
 import cortexpy.graph.parser.random_access as parser
 import cortexpy.test.builder as builder
 from cortexpy.graph.parser.random_access_collection import RandomAccessCollection
+from cortexpy.int_kmer import IntKmerCodec
 from cortexpy.test.builder.graph.body import KmerRecord, as_edge_set
 from cortexpy.test.builder.graph.kmer import kmer_records
 
@@ -127,3 +128,45 @@ class TestGetKmerForString(object):
         # when
         assert expected_kmer.kmer == cg.get_kmer_for_string('AAA').kmer
         assert expected_kmer.kmer == cg.get_kmer_for_string('TTT').kmer
+
+
+class TestGetKmersForStrings(object):
+    def test_returns_kmers_and_misses_in_input_order(self):
+        # given
+        collection_builder = GraphCollection(n_colors_per_graph=[1, 2],
+                                             kmer_size=3)
+        collection_builder.with_kmer_for_graph(0, 'AAA', color_coverage=1, edges='....A...')
+        collection_builder.with_kmer_for_graph(1, 'CCC', color_coverage=(2, 3),
+                                               edges=('........', '...t....'))
+        collection = collection_builder.build()
+
+        # when
+        kmers = collection.get_kmers_for_strings(['GGG', 'ACG', 'TTT'])
+
+        # then
+        assert [None] == kmers[1:2]
+        assert ['CCC', 'AAA'] == [kmers[0].kmer, kmers[2].kmer]
+        assert (0, 2, 3) == tuple(kmers[0].coverage)
+        assert (1, 0, 0) == tuple(kmers[2].coverage)
+        assert ('....A...', '........', '........') == tuple(str(e) for e in kmers[2].edges)
+
+
+class TestGetKmerForInt(object):
+    def test_fills_missing_kmers_with_empty_kmers(self):
+        # given
+        ra_parsers = [parser.RandomAccess(builder.Graph()
+                                          .with_kmer_size(3)
+                                          .with_kmer(kmer_string)
+                                          .build())
+                      for kmer_string in ['AAC 1 ........', 'AAA 2 ........']]
+        rac = RandomAccessCollection(ra_parsers)
+        codec = IntKmerCodec(3)
+
+        # when
+        kmer = rac.get_kmer_for_int(codec.encode('GTT'))
+
+        # then
+        assert 'AAC' == kmer.kmer
+        assert (1, 0) == tuple(kmer.coverage)
+        with pytest.raises(KeyError):
+            rac.get_kmer_for_int(codec.encode('ACG'))
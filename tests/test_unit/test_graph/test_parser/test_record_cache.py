@@ -0,0 +1,131 @@
+import pytest
+
+from cortexpy.graph.parser.record_cache import (
+    ClockRecordCache,
+    LRURecordCache,
+    RecordCache,
+    make_record_cache,
+)
+
+
+@pytest.fixture(params=['lru', 'clock'])
+def policy(request):
+    return request.param
+
+
+class TestRecordCache(object):
+    def test_counts_hits_and_misses(self, policy):
+        # given
+        cache = make_record_cache(policy, max_bytes=10)
+
+        # when
+        cache.put('AAA', b'record', 5)
+        values = [cache.get('AAA'), cache.get('AAC'), cache.get('AAA')]
+
+        # then
+        assert [b'record', None, b'record'] == values
+        assert (2, 1, 0) == (cache.stats.hits, cache.stats.misses, cache.stats.evictions)
+        assert pytest.approx(2 / 3) == cache.stats.hit_rate
+
+    def test_caches_none_values(self, policy):
+        # given
+        cache = make_record_cache(policy, max_bytes=10)
+        missing = object()
+
+        # when
+        cache.put('AAA', None, 5)
+
+        # then
+        assert cache.get('AAA', missing) is None
+        assert cache.get('AAC', missing) is missing
+
+    def test_stays_within_byte_budget(self, policy):
+        # given
+        cache = make_record_cache(policy, max_bytes=10)
+
+        # when
+        for idx in range(10):
+            cache.put(idx, idx, 3)
+
+        # then
+        assert 3 == len(cache)
+        assert 9 == cache.n_bytes
+        assert 7 == cache.stats.evictions
+
+    def test_does_not_cache_values_larger_than_budget(self, policy):
+        # given
+        cache = make_record_cache(policy, max_bytes=10)
+
+        # when
+        cache.put('AAA', b'record', 11)
+
+        # then
+        assert 0 == len(cache)
+        assert cache.get('AAA') is None
+
+    def test_replaces_value_of_cached_key(self, policy):
+        # given
+        cache = make_record_cache(policy, max_bytes=10)
+        cache.put('AAA', 1, 5)
+
+        # when
+        cache.put('AAA', 2, 4)
+
+        # then
+        assert 1 == len(cache)
+        assert 4 == cache.n_bytes
+        assert 2 == cache.get('AAA')
+
+    def test_zero_budget_disables_cache(self, policy):
+        # given
+        cache = make_record_cache(policy, max_bytes=0)
+
+        # when
+        cache.put('AAA', 1, 1)
+
+        # then
+        assert cache.get('AAA') is None
+
+    def test_raises_on_unknown_policy(self):
+        with pytest.raises(ValueError):
+            make_record_cache('fifo', max_bytes=10)
+
+    def test_base_class_is_abstract(self):
+        with pytest.raises(TypeError):
+            RecordCache(max_bytes=10)
+
+
+class TestLRURecordCache(object):
+    def test_evicts_least_recently_used_entry(self):
+        # given
+        cache = LRURecordCache(max_bytes=2)
+        cache.put('a', 1, 1)
+        cache.put('b', 2, 1)
+        cache.get('a')
+
+        # when
+        cache.put('c', 3, 1)
+
+        # then
+        assert 1 == cache.get('a')
+        assert cache.get('b') is None
+        assert 3 == cache.get('c')
+
+
+class TestClockRecordCache(object):
+    def test_gives_referenced_entries_a_second_chance(self):
+        # given
+        cache = ClockRecordCache(max_bytes=3)
+        cache.put('a', 1, 1)
+        cache.put('b', 2, 1)
+        cache.put('c', 3, 1)
+        cache.get('a')
+        cache.get('c')
+
+        # when
+        cache.put('d', 4, 1)
+
+        # then
+        assert cache.get('b') is None
+        assert [1, 3, 4] == [cache.get(k) for k in 'acd']
+        assert 1 == cache.stats.evictions
@@ -0,0 +1,106 @@
+import io
+import itertools
+import os
+
+import pytest
+
+import cortexpy.test.builder as builder
+from cortexpy.graph.parser.kmer import StringKmerConverter
+from cortexpy.graph.parser.sparse_index import SparseKmerIndex
+from cortexpy.utils import lexlo
+
+
+def write_graph(path, kmer_size, kmer_strings):
+    graph_builder = builder.Graph().with_kmer_size(kmer_size)
+    for kmer_string in kmer_strings:
+        graph_builder.with_kmer(kmer_string)
+    path.write_binary(graph_builder.build().getvalue())
+
+
+class TestFromGraphPath(object):
+    def test_stores_first_kmer_of_every_page(self, tmpdir):
+        # given
+        graph_path = tmpdir / 'graph.ctx'
+        write_graph(graph_path, 3, ['AAA', 'AAC', 'AAG', 'AAT', 'ACA'])
+
+        # when
+        index = SparseKmerIndex.from_graph_path(graph_path, page_size=26)
+
+        # then
+        assert 2 == index.records_per_page
+        assert 5 == index.n_records
+        assert 3 == index.n_pages
+        assert [[0, 2, 4]] == index.page_kmers.tolist()
+        assert index.is_valid_for(graph_path)
+
+    def test_indexes_empty_graph(self, tmpdir):
+        # given
+        graph_path = tmpdir / 'graph.ctx'
+        write_graph(graph_path, 3, [])
+
+        # when
+        index = SparseKmerIndex.from_graph_path(graph_path)
+
+        # then
+        assert 0 == index.n_pages
+        assert (0, 0) == index.record_bounds([0])
+
+
+class TestDumpAndFromStream(object):
+    def test_round_trips_index(self, tmpdir):
+        # given
+        graph_path = tmpdir / 'graph.ctx'
+        write_graph(graph_path, 33, ['A' * 32 + 'C', 'A' * 32 + 'G', 'C' * 33])
+        index = SparseKmerIndex.from_graph_path(graph_path, page_size=1)
+        buffer = io.BytesIO()
+
+        # when
+        index.dump(buffer)
+        buffer.seek(0)
+        loaded_index = SparseKmerIndex.from_stream(buffer)
+
+        # then
+        assert 2 == loaded_index.kmer_container_size
+        assert index.page_kmers.tolist() == loaded_index.page_kmers.tolist()
+        assert (index.records_per_page, index.n_records, index.graph_size,
+                index.graph_mtime_ns) == (loaded_index.records_per_page, loaded_index.n_records,
+                                          loaded_index.graph_size, loaded_index.graph_mtime_ns)
+
+    def test_raises_on_bad_magic_word(self):
+        with pytest.raises(ValueError):
+            SparseKmerIndex.from_stream(io.BytesIO(b'\0' * 64))
+
+
+class TestIsValidFor(object):
+    def test_is_invalid_after_graph_changes(self, tmpdir):
+        # given
+        graph_path = tmpdir / 'graph.ctx'
+        write_graph(graph_path, 3, ['AAA', 'AAC'])
+        index = SparseKmerIndex.from_graph_path(graph_path)
+
+        # when
+        stat = os.stat(str(graph_path))
+        os.utime(str(graph_path), ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+        # then
+        assert not index.is_valid_for(graph_path)
+
+
+class TestRecordBounds(object):
+    def test_bounds_contain_insertion_index_of_every_kmer(self, tmpdir):
+        # given
+        all_kmer_strings = (''.join(p) for p in itertools.product('ACGT', repeat=3))
+        kmer_strings = [k for k in all_kmer_strings if k == lexlo(k)][::2]
+        graph_path = tmpdir / 'graph.ctx'
+        write_graph(graph_path, 3, kmer_strings)
+        index = SparseKmerIndex.from_graph_path(graph_path, page_size=3 * 13)
+        converter = StringKmerConverter(3)
+
+        for query in (''.join(p) for p in itertools.product('ACGT', repeat=3)):
+            # when
+            start, stop = index.record_bounds(converter.to_uints(query))
+
+            # then
+            expected_index = sum(k < query for k in kmer_strings)
+            assert start <= expected_index <= stop
+            assert stop - start <= index.records_per_page
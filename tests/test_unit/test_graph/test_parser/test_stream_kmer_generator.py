@@ -53,7 +53,8 @@ class TestStreamKmerGenerator(object):
         # given
         num_colors = 1
         kmer_size = 11
-        expected_num_calls = n_kmers + 1
+        # all records fit in one block, which is followed by a read at the end of the stream
+        expected_num_calls = min(n_kmers, 1) + 1
         builder = Body(kmer_size=kmer_size)
 
         for _ in range(n_kmers):
@@ -0,0 +1,162 @@
+import io
+
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as s
+
+import cortexpy.test.builder as builder
+from cortexpy.graph.interactor import Interactor
+from cortexpy.graph.parser.constants import RECORD_BLOCK_SIZE
+from cortexpy.graph.parser.header import Header
+from cortexpy.graph.parser.random_access import RandomAccess
+from cortexpy.graph.parser.streaming import kmer_generator_from_stream, load_cortex_graph
+from cortexpy.graph.prune import (
+    close_process_ra_parsers, dead_end_kmer_ints_of_kmers, find_tips_less_than,
+    process_ra_parser, prune_tips_less_than_from_graph_path,
+)
+from cortexpy.graph.serializer.kmer import dump_colored_de_bruijn_graph_to_cortex
+from cortexpy.int_kmer import get_int_kmer_codec
+from cortexpy.test.builder.graph.cortex import CortexGraphBuilder
+
+
+def write_graph_of_records(graph_path, records, kmer_size, colors=(0,)):
+    b = CortexGraphBuilder().with_kmer_size(kmer_size).with_colors(*colors)
+    for record, color in zip(records, colors * len(records)):
+        b.add_path([record[i:i + kmer_size] for i in range(len(record) - kmer_size + 1)],
+                   color=color)
+    graph = b.build()
+    graph.graph.update(sample_names=['s{}'.format(c) for c in colors], num_colors=len(colors))
+    with open(graph_path, 'wb') as fh:
+        dump_colored_de_bruijn_graph_to_cortex(graph, fh)
+
+
+def kmer_tuples(kmers):
+    return sorted((k.kmer, tuple(k.coverage), tuple(e.to_str() for e in k.edges)) for k in kmers)
+
+
+def prune_in_memory(graph_path, n, from_edge_dfs=False):
+    with open(graph_path, 'rb') as fh:
+        graph = load_cortex_graph(fh)
+    if from_edge_dfs:
+        graph.remove_nodes_from(Interactor(graph)._find_nodes_of_tips_less_than_from_edge_dfs(n))
+    else:
+        graph = Interactor(graph).prune_tips_less_than(n).graph
+    return kmer_tuples(graph.node[node] for node in graph)
+
+
+def prune_streaming(graph_path, n, **kwargs):
+    output = io.BytesIO()
+    n_pruned = prune_tips_less_than_from_graph_path(n, graph_path, output, **kwargs)
+    output.seek(0)
+    return n_pruned, kmer_tuples(kmer_generator_from_stream(output))
+
+
+class TestFindTipsLessThan(object):
+    def test_records_length_and_coverage_of_tips(self):
+        # given
+        graph_builder = builder.Graph() \
+            .with_kmer_size(3) \
+            .with_num_colors(2) \
+            .with_kmer('AAC 1 2 ......G. ......G.') \
+            .with_kmer('ACG 3 0 a....C.. a.......') \
+            .with_kmer('CCG 5 0 ........ .....C..') \
+            .with_kmer('CGC 1 1 ........ ac......')
+        ra_parser = RandomAccess(graph_builder.build())
+        codec = get_int_kmer_codec(3)
+
+        # when
+        tips = list(find_tips_less_than(4, dead_end_kmer_ints_of_kmers(ra_parser.values(), codec),
+                                        ra_parser, 3))
+
+        # then
+        assert [('AAC', 'ACG'), ('CCG',)] == [tuple(codec.decode(k) for k in tip.kmer_ints)
+                                              for tip in tips if tip]
+        assert [(3, 3), (5,)] == [tip.coverage for tip in tips if tip]
+        assert [2, 1] == [len(tip) for tip in tips if tip]
+
+
+class TestProcessRaParser(object):
+    def test_reuses_parser_until_closed(self, tmpdir):
+        # given
+        graph_path = str(tmpdir / 'graph.ctx')
+        write_graph_of_records(graph_path, ['AACGC'], 3)
+
+        # when
+        ra_parser = process_ra_parser(graph_path)
+        second_ra_parser = process_ra_parser(graph_path)
+        close_process_ra_parsers()
+
+        # then
+        assert ra_parser is second_ra_parser
+        assert ra_parser.graph_handle.closed
+        assert process_ra_parser(graph_path) is not ra_parser
+        close_process_ra_parsers()
+
+
+class TestPruneTipsLessThanFromGraphPath(object):
+    @pytest.mark.parametrize('n_workers', [1, 2])
+    def test_prunes_two_tips_and_removes_their_edges(self, tmpdir, n_workers):
+        # given
+        graph_path = str(tmpdir / 'graph.ctx')
+        write_graph_of_records(graph_path, ['CCCGC', 'AACGC'], 3)
+
+        # when
+        n_pruned, kmers = prune_streaming(graph_path, 3, n_workers=n_workers, block_size=1)
+
+        # then
+        assert 4 == n_pruned
+        assert [('CGC', (1,), ('........',))] == kmers
+
+    @pytest.mark.parametrize('block_size', [1, RECORD_BLOCK_SIZE])
+    def test_raises_on_unsorted_graph(self, tmpdir, block_size):
+        # given
+        graph = builder.Graph().with_kmer_size(3).with_kmer('AAC').with_kmer('ACC').build()
+        record_size = Header.from_stream(graph).record_size
+        graph = graph.getvalue()
+        graph_path = tmpdir / 'graph.ctx'
+        graph_path.write_binary(graph[:-2 * record_size] + graph[-record_size:]
+                                + graph[-2 * record_size:-record_size])
+
+        # when/then
+        with pytest.raises(ValueError, match='not sorted'):
+            prune_streaming(str(graph_path), 2, block_size=block_size)
+
+    def test_keeps_tips_that_are_long_enough(self, tmpdir):
+        # given
+        graph_path = str(tmpdir / 'graph.ctx')
+        write_graph_of_records(graph_path, ['CCCGC', 'AACGC'], 3)
+
+        # when
+        n_pruned, kmers = prune_streaming(graph_path, 2)
+
+        # then
+        assert 0 == n_pruned
+        assert ['AAC', 'ACG', 'CCC', 'CCG', 'CGC'] == [k[0] for k in kmers]
+
+    def test_prunes_tip_of_second_color(self, tmpdir):
+        # given
+        graph_path = str(tmpdir / 'graph.ctx')
+        write_graph_of_records(graph_path, ['AAACCCG', 'AAACCAA'], 3, colors=(0, 1))
+
+        # when
+        n_pruned, kmers = prune_streaming(graph_path, 3)
+
+        # then
+        assert 6 == n_pruned
+        assert ['ACC'] == [k[0] for k in kmers]
+        assert prune_in_memory(graph_path, 3) == kmers
+
+    @settings(deadline=None, max_examples=50)
+    @given(s.lists(s.text('ACGT', min_size=3, max_size=12), min_size=1, max_size=3),
+           s.integers(min_value=2, max_value=5))
+    def test_prunes_same_kmers_as_interactor(self, tmpdir_factory, records, n):
+        # given
+        graph_path = str(tmpdir_factory.mktemp('prune') / 'graph.ctx')
+        write_graph_of_records(graph_path, records, 3)
+
+        # when
+        _, kmers = prune_streaming(graph_path, n, block_size=1)
+
+        # then
+        assert prune_in_memory(graph_path, n, from_edge_dfs=True) == kmers
+        assert prune_in_memory(graph_path, n) == kmers
@@ -0,0 +1,88 @@
+import io
+import random
+
+import pytest
+
+import cortexpy.test.builder as builder
+from cortexpy.graph.parser.header import Header
+from cortexpy.graph.parser.streaming import (
+    kmer_string_generator_from_stream,
+    record_block_generator_from_stream_and_header,
+)
+from cortexpy.graph.serializer.external_sort import ExternalRecordSorter
+from cortexpy.graph.serializer.kmer import dumpable_header
+from cortexpy.utils import lexlo
+
+
+def sorted_graph_and_shuffled_records(kmer_strings):
+    graph_builder = builder.Graph().with_kmer_size(len(kmer_strings[0]))
+    for idx, kmer_string in enumerate(kmer_strings):
+        graph_builder.with_kmer('{} {} ........'.format(kmer_string, idx + 1))
+    graph = graph_builder.build().getvalue()
+    stream = io.BytesIO(graph)
+    header = dumpable_header(Header.from_stream(stream))
+    records = [block[start:start + header.record_size]
+               for block in record_block_generator_from_stream_and_header(stream, header)
+               for start in range(0, len(block), header.record_size)]
+    random.Random(1).shuffle(records)
+    return graph, header, records
+
+
+class TestExternalRecordSorter(object):
+    @pytest.mark.parametrize('kmer_size', [3, 33])
+    @pytest.mark.parametrize('run_records', [1, 3, 100])
+    def test_writes_graph_identical_to_sorted_graph(self, tmpdir, kmer_size, run_records):
+        # given
+        rng = random.Random(kmer_size)
+        kmer_strings = sorted({lexlo(''.join(rng.choice('ACGT') for _ in range(kmer_size)))
+                               for _ in range(20)})
+        graph, header, records = sorted_graph_and_shuffled_records(kmer_strings)
+        sorter = ExternalRecordSorter(header, run_bytes=run_records * header.record_size,
+                                      tmpdir=str(tmpdir))
+
+        # when
+        for record in records:
+            sorter.add_record(record)
+        output = io.BytesIO()
+        sorter.dump(output)
+
+        # then
+        assert len(kmer_strings) == sorter.n_records
+        assert graph == output.getvalue()
+        assert kmer_strings == list(kmer_string_generator_from_stream(io.BytesIO(graph)))
+
+    def test_spills_full_runs(self):
+        # given
+        _, header, records = sorted_graph_and_shuffled_records(['AAA', 'AAC', 'AAG'])
+        sorter = ExternalRecordSorter(header, run_bytes=2 * header.record_size)
+
+        # when
+        for record in records:
+            sorter.add_record(record)
+
+        # then
+        assert 1 == sorter.n_spilled_runs
+
+    @pytest.mark.parametrize('run_records', [1, 2, 100])
+    def test_raises_on_duplicate_kmer(self, run_records):
+        # given
+        _, header, records = sorted_graph_and_shuffled_records(['AAA', 'AAC', 'AAG'])
+        sorter = ExternalRecordSorter(header, run_bytes=run_records * header.record_size)
+        for record in records + records[:1]:
+            sorter.add_record(record)
+
+        # when/then
+        with pytest.raises(ValueError, match='Kmer AA. was added more than once'):
+            sorter.dump(io.BytesIO())
+
+    def test_writes_empty_graph(self):
+        # given
+        graph = builder.Graph().with_kmer_size(3).build().getvalue()
+        sorter = ExternalRecordSorter(dumpable_header(Header.from_stream(io.BytesIO(graph))))
+        output = io.BytesIO()
+
+        # when
+        sorter.dump(output)
+
+        # then
+        assert graph == output.getvalue()
@@ -1,2 +1,30 @@
+import io
+
+import pytest
+
+import cortexpy.test.builder as builder
+from cortexpy.graph.parser.streaming import kmer_string_generator_from_stream, load_cortex_graph
+from cortexpy.graph.serializer.kmer import dump_colored_de_bruijn_graph_to_cortex
+
+
 class TestDumpCortexGraph(object):
-    pass
+    @pytest.mark.parametrize('run_bytes', [1, 2 ** 20])
+    def test_writes_sorted_kmers_independent_of_run_size(self, tmpdir, run_bytes):
+        # given
+        kmer_strings = ['AAA', 'AAC', 'ACA', 'ACG', 'CCA']
+        graph_builder = builder.Graph().with_kmer_size(3)
+        for kmer_string in kmer_strings:
+            graph_builder.with_kmer(kmer_string)
+        graph = load_cortex_graph(graph_builder.build())
+        expected = io.BytesIO()
+        dump_colored_de_bruijn_graph_to_cortex(graph, expected, run_bytes=2 ** 20)
+
+        # when
+        output = io.BytesIO()
+        dump_colored_de_bruijn_graph_to_cortex(graph, output, run_bytes=run_bytes,
+                                               tmpdir=str(tmpdir))
+
+        # then
+        assert expected.getvalue() == output.getvalue()
+        output.seek(0)
+        assert kmer_strings == list(kmer_string_generator_from_stream(output))
@@ -0,0 +1,157 @@
+import io
+from unittest import mock
+
+import cortexpy.test.builder as builder
+from cortexpy.graph.columnar_graph import ColumnarGraph
+from cortexpy.graph.parser.header import Header
+from cortexpy.graph.parser.streaming import load_cortex_graph
+from cortexpy.graph.serializer.serializer import Serializer, load_graph_to_serialize
+from cortexpy.utils import revcomp
+
+# A unitig AAC-ACC-CCA-CAC-ACT with a branch ACC-CCG-CGA
+GRAPH_KMERS = [
+    'AAC 10 .....C..',
+    'ACC 11 a...A.G.',
+    'CCA 10 a....C..',
+    'CAC 10 .c.....T',
+    'ACT 10 .c......',
+    'CCG 1 a...A...',
+    'CGA 1 .c......',
+]
+
+
+def build_graph(kmers=GRAPH_KMERS, num_colors=1):
+    graph_builder = builder.Graph().with_kmer_size(3).with_num_colors(num_colors)
+    for kmer in kmers:
+        graph_builder.with_kmer(kmer)
+    return graph_builder.build()
+
+
+def to_gfa(graph):
+    output = io.StringIO()
+    Serializer(graph).to_gfa(output)
+    return output.getvalue()
+
+
+def parse_gfa(gfa):
+    """Return the header, the segments and the links of a GFA string with links
+    between oriented segment sequences"""
+    lines = [line.split('\t') for line in gfa.splitlines()]
+    segments = {line[1]: line[2:] for line in lines if line[0] == 'S'}
+    links = set()
+    for line in lines:
+        if line[0] == 'L':
+            source = segments[line[1]][0]
+            target = segments[line[3]][0]
+            if line[2] == '-':
+                source = revcomp(source)
+            if line[4] == '-':
+                target = revcomp(target)
+            links.add((source, target, line[5], line[6]))
+    return lines[0], sorted(segments.values()), links
+
+
+class TestToGfa(object):
+    def test_streams_segments_and_links_of_columnar_graph(self):
+        # given
+        graph = ColumnarGraph.from_graph_handle(build_graph())
+
+        # when
+        gfa = to_gfa(graph)
+
+        # then
+        header, segments, links = parse_gfa(gfa)
+        assert ['H', 'VN:Z:1.0'] == header
+        assert [['AACC', 'LN:i:4', 'KC:i:21', 'cc:B:I,21'],
+                ['CCACT', 'LN:i:5', 'KC:i:30', 'cc:B:I,30'],
+                ['CCGA', 'LN:i:4', 'KC:i:2', 'cc:B:I,2']] == segments
+        assert {('AACC', 'CCACT', '2M', 'cl:B:I,0'),
+                ('AACC', 'CCGA', '2M', 'cl:B:I,0')} == links
+        assert ['H', 'S', 'S', 'S', 'L', 'L'] == [line[0] for line in gfa.splitlines()]
+
+    def test_writes_same_gfa_for_kmer_graph_and_columnar_graph(self):
+        # given
+        graph_stream = build_graph()
+        kmer_graph = load_cortex_graph(graph_stream)
+        graph_stream.seek(0)
+        columnar_graph = ColumnarGraph.from_graph_handle(graph_stream)
+
+        # when
+        kmer_graph_gfa = parse_gfa(to_gfa(kmer_graph))
+        columnar_graph_gfa = parse_gfa(to_gfa(columnar_graph))
+
+        # then
+        assert kmer_graph_gfa == columnar_graph_gfa
+
+    def test_writes_reverse_complement_links_once(self):
+        # given
+        graph = ColumnarGraph.from_graph_handle(build_graph([
+            'AAC 1 .....C..',
+            'ACC 1 a...A..T',
+            'CCA 1 a....C..',
+            'CAC 1 .c......',
+            'AGG 1 .......T',
+        ]))
+
+        # when
+        gfa = to_gfa(graph)
+
+        # then
+        assert 2 == sum(line.startswith('L\t') for line in gfa.splitlines())
+        assert 1 == sum(line.endswith('\t-\t2M\tcl:B:I,0') for line in gfa.splitlines())
+        _, segments, links = parse_gfa(gfa)
+        assert ['AACC', 'AGG', 'CCAC'] == [segment[0] for segment in segments]
+        assert {('AACC', 'CCAC', '2M', 'cl:B:I,0'),
+                ('AACC', 'CCT', '2M', 'cl:B:I,0')} == links
+
+    def test_writes_coverage_and_link_colors_of_each_color(self):
+        # given
+        graph = ColumnarGraph.from_graph_handle(build_graph([
+            'AAC 1 2 .....C.. .....C..',
+            'ACC 1 2 a....... a.......',
+        ], num_colors=2))
+
+        # when
+        gfa = to_gfa(graph)
+
+        # then
+        _, segments, links = parse_gfa(gfa)
+        assert [['AACC', 'LN:i:4', 'KC:i:6', 'cc:B:I,2,4']] == segments
+        assert set() == links
+
+    def test_writes_header_of_graph_without_kmers(self):
+        # given
+        graph = ColumnarGraph.from_graph_handle(build_graph([]))
+
+        # when
+        gfa = to_gfa(graph)
+
+        # then
+        assert 'H\tVN:Z:1.0\n' == gfa
+
+
+class TestLoadGraphToSerialize(object):
+    def test_loads_kmer_graph_of_unsorted_graph(self):
+        # given
+        graph_stream = build_graph(GRAPH_KMERS[:2])
+        graph_bytes = graph_stream.getvalue()
+        record_size = Header.from_stream(io.BytesIO(graph_bytes)).record_size
+        graph_stream = io.BytesIO(graph_bytes[:-2 * record_size] + graph_bytes[-record_size:]
+                                  + graph_bytes[-2 * record_size:-record_size])
+
+        # when
+        with mock.patch.object(ColumnarGraph, 'from_graph_handle') as mocked_from_graph_handle:
+            graph = load_graph_to_serialize(graph_stream)
+
+        # then
+        assert not isinstance(graph, ColumnarGraph)
+        assert {'AAC', 'ACC'} == set(graph)
+        mocked_from_graph_handle.assert_not_called()
+
+    def test_loads_columnar_graph_of_sorted_graph(self):
+        # when
+        graph = load_graph_to_serialize(build_graph(GRAPH_KMERS[:2]))
+
+        # then
+        assert isinstance(graph, ColumnarGraph)
+        assert 2 == len(graph)
@@ -1,10 +1,21 @@
+import io
 import json
+from collections import Counter
+
+from hypothesis import given, settings
+from hypothesis import strategies as s
+from networkx.readwrite import json_graph
 
 import cortexpy.graph.serializer.serializer
+from cortexpy.graph.columnar_graph import ColumnarGraph
 from cortexpy.graph.interactor import Interactor
 from cortexpy.graph.contig_retriever import ContigRetriever
 from cortexpy.graph.parser.streaming import load_cortex_graph
+from cortexpy.graph.serializer.kmer import dump_colored_de_bruijn_graph_to_cortex
+from cortexpy.graph.serializer.serializer import Serializer
 from cortexpy.test import builder as builder, expectation
+from cortexpy.test.builder.graph.cortex import CortexGraphBuilder
+from cortexpy.utils import lexlo
 
 
 class TestFromKmerGraph(object):
@@ -62,3 +73,167 @@ class TestFromCortexGraph(object):
 
         expect.has_n_nodes(2)
         expect.has_n_edges(1)
+
+
+def node_link_graph_from_json(json_string):
+    return json_graph.node_link_graph(json.loads(json_string), attrs={'link': 'edges'})
+
+
+def unoriented_unitigs_and_links(graph):
+    """Return the unitigs and links of a node-link graph without their orientation
+
+    Each unitig is represented by the sorted lexlo kmers of its sequence and their coverages, so
+    neither the orientation of a unitig nor the starting kmer of a cyclic unitig matter. Links are
+    counted as unordered pairs of unitigs by color. Self links are left out."""
+    kmer_size = graph.graph['kmer_size']
+
+    def unoriented(node):
+        unitig = graph.nodes[node]['unitig']
+        coverage = graph.nodes[node]['coverage']
+        return tuple(sorted(
+            (lexlo(unitig[idx:idx + kmer_size]), tuple(c[idx] for c in coverage))
+            for idx in range(len(unitig) - kmer_size + 1)
+        ))
+
+    unitigs = Counter(unoriented(node) for node in graph)
+    links = Counter((tuple(sorted([unoriented(source), unoriented(target)])), color)
+                    for source, target, color in graph.edges(keys=True) if source != target)
+    return unitigs, links
+
+
+def kmers_of_unitigs(unitigs):
+    return sorted(kmer for unitig, count in unitigs.items() for kmer, _ in unitig * count)
+
+
+class RecordingStream(object):
+    def __init__(self):
+        self.writes = []
+
+    def write(self, string):
+        self.writes.append(string)
+
+
+class TestWriteJson(object):
+    def build_graph(self):
+        graph_builder = builder.Graph().with_kmer_size(3)
+        for kmer in ['AAC 10 .....C..',
+                     'ACC 11 a...A.G.',
+                     'CCA 10 a....C..',
+                     'CAC 10 .c.....T',
+                     'ACT 10 .c......',
+                     'CCG 1 a...A...',
+                     'CGA 1 .c......']:
+            graph_builder.with_kmer(kmer)
+        return graph_builder.build()
+
+    def test_columnar_graph_and_kmer_graph_have_same_node_link_graph(self):
+        # given
+        graph_stream = self.build_graph()
+        kmer_graph = load_cortex_graph(graph_stream)
+        graph_stream.seek(0)
+        columnar_graph = ColumnarGraph.from_graph_handle(graph_stream)
+
+        # when
+        graphs = [json_graph.node_link_graph(json.loads(Serializer(graph).to_json()),
+                                             attrs={'link': 'edges'})
+                  for graph in [kmer_graph, columnar_graph]]
+
+        # then
+        for graph in graphs:
+            assert {'sample_names': ['sample_0'], 'kmer_size': 3, 'num_colors': 1,
+                    'colors': [0]} == graph.graph
+            assert [('AACC', [[10, 11]]), ('CCACT', [[10, 10, 10]]), ('CCGA', [[1, 1]])] == \
+                sorted((data['unitig'], data['coverage']) for _, data in graph.nodes(data=True))
+            assert [('AACC', 'CCACT', 0), ('AACC', 'CCGA', 0)] == sorted(
+                (graph.nodes[s]['unitig'], graph.nodes[t]['unitig'], k)
+                for s, t, k in graph.edges(keys=True)
+            )
+
+    @settings(deadline=None, max_examples=50)
+    @given(s.lists(s.text('ACGT', min_size=5, max_size=12), min_size=1, max_size=3),
+           s.sampled_from([3, 5]))
+    def test_columnar_graph_and_kmer_graph_have_same_unitigs_up_to_orientation(
+            self, records, kmer_size):
+        # given
+        graph_builder = CortexGraphBuilder().with_kmer_size(kmer_size).with_colors(0)
+        for record in records:
+            graph_builder.add_path([record[i:i + kmer_size]
+                                    for i in range(len(record) - kmer_size + 1)])
+        graph = graph_builder.build()
+        graph.graph.update(sample_names=['sample_0'], num_colors=1)
+        graph_stream = io.BytesIO()
+        dump_colored_de_bruijn_graph_to_cortex(graph, graph_stream)
+        graph_stream.seek(0)
+        kmer_graph = load_cortex_graph(graph_stream)
+        graph_stream.seek(0)
+        columnar_graph = ColumnarGraph.from_graph_handle(graph_stream)
+
+        # when
+        kmer_json, columnar_json = [Serializer(graph).to_json()
+                                    for graph in [kmer_graph, columnar_graph]]
+
+        # then
+        kmer_unitigs, kmer_links = unoriented_unitigs_and_links(
+            node_link_graph_from_json(kmer_json))
+        columnar_unitigs, columnar_links = unoriented_unitigs_and_links(
+            node_link_graph_from_json(columnar_json))
+        assert sorted(kmer_graph) == kmers_of_unitigs(columnar_unitigs)
+        if sorted(kmer_graph) == kmers_of_unitigs(kmer_unitigs):
+            assert kmer_unitigs == columnar_unitigs
+            assert kmer_links == columnar_links
+
+    def test_columnar_graph_writes_each_kmer_of_palindromic_branch_once(self):
+        # given
+        graph_builder = builder.Graph().with_kmer_size(3)
+        graph_builder.with_kmer('ATC 1 ......G.')
+        graph_builder.with_kmer('CGA 1 ...tA..T')
+        graph_builder.with_kmer('GAA 1 .c......')
+        graph_stream = graph_builder.build()
+        kmer_graph = load_cortex_graph(graph_stream)
+        graph_stream.seek(0)
+        columnar_graph = ColumnarGraph.from_graph_handle(graph_stream)
+
+        # when
+        kmer_graph, columnar_graph = [node_link_graph_from_json(Serializer(graph).to_json())
+                                      for graph in [kmer_graph, columnar_graph]]
+
+        # then
+        assert ['ATC', 'ATC', 'CGA', 'CGA', 'GAA', 'GAA'] == kmers_of_unitigs(
+            unoriented_unitigs_and_links(kmer_graph)[0])
+        assert ['ATC', 'CGA', 'GAA'] == kmers_of_unitigs(
+            unoriented_unitigs_and_links(columnar_graph)[0])
+        assert 2 == len(columnar_graph.edges)
+
+    def test_columnar_graph_links_cyclic_unitig_that_turns_around_to_itself(self):
+        # given
+        graph_builder = builder.Graph().with_kmer_size(3)
+        graph_builder.with_kmer('AGA 1 ..g...G.')
+        graph_builder.with_kmer('CTC 1 ...t...T')
+        graph_stream = graph_builder.build()
+        kmer_graph = load_cortex_graph(graph_stream)
+        graph_stream.seek(0)
+        columnar_graph = ColumnarGraph.from_graph_handle(graph_stream)
+
+        # when
+        kmer_graph, columnar_graph = [node_link_graph_from_json(Serializer(graph).to_json())
+                                      for graph in [kmer_graph, columnar_graph]]
+
+        # then
+        assert ['AGAG'] == [data['unitig'] for _, data in kmer_graph.nodes(data=True)]
+        assert 0 == len(kmer_graph.edges)
+        assert ['GAGA'] == [data['unitig'] for _, data in columnar_graph.nodes(data=True)]
+        assert [(0, 0, 0)] == list(columnar_graph.edges(keys=True))
+
+    def test_writes_each_node_and_edge_separately(self):
+        # given
+        output = RecordingStream()
+
+        # when
+        Serializer(ColumnarGraph.from_graph_handle(self.build_graph())).write_json(output)
+
+        # then
+        node_writes = [json.loads(w) for w in output.writes if w.startswith('{"repr"')]
+        edge_writes = [json.loads(w) for w in output.writes if w.startswith('{"source"')]
+        assert [0, 1, 2] == [node['id'] for node in node_writes]
+        assert 2 == len(edge_writes)
+        assert json.loads(''.join(output.writes))['nodes'] == node_writes
@@ -0,0 +1,67 @@
+import numpy as np
+
+import cortexpy.test.builder as builder
+from cortexpy.graph.statistics import (
+    statistics_from_path, statistics_from_record_range,
+    statistics_from_stream,
+)
+
+
+def build_two_color_graph():
+    return builder.Graph() \
+        .with_kmer_size(3) \
+        .with_kmer('AAA 1 0 .....C.. ........') \
+        .with_kmer('AAC 2 1 a......T a.......') \
+        .with_kmer('ACG 7 1 ........ ........') \
+        .with_kmer('ACT 3 0 a.g...G. ........')
+
+
+class TestStatisticsFromStream(object):
+    def test_counts_kmers_coverage_degrees_and_tips(self):
+        # when
+        stats = statistics_from_stream(build_two_color_graph().build(), max_coverage=5)
+
+        # then
+        assert 4 == stats.n_kmers
+        assert [4, 2] == stats.n_kmers_present.tolist()
+        assert [[0, 1, 1, 1, 0, 1], [2, 2, 0, 0, 0, 0]] == stats.coverage_histograms.tolist()
+        assert [[2, 1, 1, 0, 0], [1, 1, 0, 0, 0]] == stats.in_degree_counts.tolist()
+        assert [[1, 3, 0, 0, 0], [2, 0, 0, 0, 0]] == stats.out_degree_counts.tolist()
+        assert [1, 1] == stats.n_tips.tolist()
+        assert [1, 1] == stats.n_isolated.tolist()
+
+    def test_empty_graph_has_no_kmers(self):
+        # when
+        stats = statistics_from_stream(builder.Graph().with_kmer_size(3).build())
+
+        # then
+        assert 0 == stats.n_kmers
+        assert 0 == stats.coverage_histograms.sum()
+
+
+class TestStatisticsFromPath(object):
+    def test_record_ranges_merge_to_whole_graph_statistics(self, tmpdir):
+        # given
+        graph_path = tmpdir / 'graph.ctx'
+        graph_path.write_binary(build_two_color_graph().build().getvalue())
+        expected = statistics_from_path(str(graph_path))
+
+        # when
+        stats = statistics_from_record_range(str(graph_path), 0, 1)
+        stats.merge(statistics_from_record_range(str(graph_path), 1, 4))
+
+        # then
+        assert expected.to_dict() == stats.to_dict()
+
+    def test_parallel_statistics_equal_serial_statistics(self, tmpdir):
+        # given
+        graph_path = tmpdir / 'graph.ctx'
+        graph_path.write_binary(build_two_color_graph().build().getvalue())
+
+        # when
+        serial = statistics_from_path(str(graph_path), max_coverage=3)
+        parallel = statistics_from_path(str(graph_path), max_coverage=3, n_processes=3)
+
+        # then
+        assert serial.to_dict() == parallel.to_dict()
+        assert np.all(4 == serial.coverage_histograms.sum(axis=1))
@@ -9,6 +9,7 @@ import cortexpy.graph.parser
 import cortexpy.test.builder as builder
 import cortexpy.test.expectation as expectation
 from cortexpy.constants import EdgeTraversalOrientation
+from cortexpy.int_kmer import get_int_kmer_codec
 
 
 @attr.s(slots=True)
@@ -60,6 +61,7 @@ class BranchTestDriver(object):
     parent_graph = attr.ib(attr.Factory(set))
     expected_start_kmer_string = attr.ib(None)
     warmup_ra_parser = attr.ib(False)
+    int_kmers = attr.ib(False)
 
     def with_kmer(self, *args, **kwargs):
         self.graph_builder.with_kmer(*args, **kwargs)
@@ -97,6 +99,10 @@ class BranchTestDriver(object):
         self.warmup_ra_parser = True
         return self
 
+    def with_int_kmers(self):
+        self.int_kmers = True
+        return self
+
     def run(self):
         if self.expected_start_kmer_string is None:
             self.expected_start_kmer_string = self.start_kmer_string
@@ -105,7 +111,8 @@ class BranchTestDriver(object):
         traverser = branch.Traverser(
             ra_parser,
             traversal_color=self.traversal_color,
-            other_stopping_colors=self.other_stopping_colors)
+            other_stopping_colors=self.other_stopping_colors,
+            int_kmers=self.int_kmers)
         if self.warmup_ra_parser:
             for k_string in list(ra_parser):
                 ra_parser[k_string]
@@ -292,7 +299,7 @@ class Test(object):
         expect \
             .has_nodes('AAA', 'AAT', 'ATA', 'TAA') \
             .has_n_edges(4 * num_colors)
-        expect.called_stream_read_n_times(8)
+        expect.called_stream_read_n_times(0)
 
     def test_one_seen_kmer_returns_empty_graph(self):
         # given
@@ -458,3 +465,51 @@ class TestJunctions(object):
             .has_neighbor_kmer_strings() \
             .has_reverse_neighbor_kmer_strings() \
             .has_n_edges(1)
+
+
+class TestIntKmers(object):
+    def test_three_connected_kmers_returns_same_graph_as_string_traversal(self):
+        for int_kmers in [False, True]:
+            # given
+            driver = BranchTestDriver()
+            (driver
+             .with_kmer_size(3)
+             .with_kmer('AAA 1 .......T')
+             .with_kmer('AAT 1 a....C..')
+             .with_kmer('ATC 1 a.......')
+             .with_start_kmer_string('AAA'))
+            if int_kmers:
+                driver.with_int_kmers()
+
+            # when
+            expect = driver.run()
+
+            # then
+            expect \
+                .has_last_kmer_string('ATC') \
+                .has_neighbor_kmer_strings() \
+                .has_nodes('AAA', 'AAT', 'ATC') \
+                .has_n_edges(2)
+            if int_kmers:
+                assert set(expect.traversed_branch.lexlo_kmer_ints) == {
+                    get_int_kmer_codec(3).encode(k) for k in ['AAA', 'AAT', 'ATC']}
+
+    def test_decodes_each_branch_kmer_once(self):
+        # given
+        codec = get_int_kmer_codec(3)
+        driver = BranchTestDriver()
+        (driver
+         .with_kmer_size(3)
+         .with_kmer('AAA 1 .......T')
+         .with_kmer('AAT 1 a....C..')
+         .with_kmer('ATC 1 a.......')
+         .with_start_kmer_string('AAA')
+         .with_int_kmers())
+
+        # when
+        with mock.patch.object(type(codec), 'decode', autospec=True,
+                               side_effect=type(codec).decode) as mocked_decode:
+            driver.run()
+
+        # then
+        assert mocked_decode.call_count == 3
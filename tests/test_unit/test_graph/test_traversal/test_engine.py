@@ -2,15 +2,27 @@ import pytest
 
 import cortexpy.graph
 import cortexpy.graph.parser
-from cortexpy.graph.parser.random_access import SlurpedRandomAccess
+from cortexpy.constants import EngineTraversalOrientation
+from cortexpy.graph.parser.random_access import (
+    MmapRandomAccess, RandomAccess, SlurpedRandomAccess,
+)
+from cortexpy.graph.serializer.kmer import dump_colored_de_bruijn_graph_to_cortex
+from cortexpy.graph.traversal.engine import Engine
+from cortexpy.test.builder.graph.cortex import CortexGraphBuilder
 from cortexpy.test.driver.graph.traversal import EngineTestDriver
 from cortexpy.test.expectation import KmerGraphExpectation
 
 
-@pytest.fixture(params=('slurped', 'not_slurped'))
+@pytest.fixture(params=('slurped', 'mmapped', 'not_slurped', 'slurped_int_kmers', 'int_kmers'))
 def driver(request):
     if request.param == 'slurped':
         return EngineTestDriver(ra_constructor=SlurpedRandomAccess.from_handle)
+    if request.param == 'mmapped':
+        return EngineTestDriver(ra_constructor=MmapRandomAccess)
+    if request.param == 'slurped_int_kmers':
+        return EngineTestDriver(ra_constructor=SlurpedRandomAccess.from_handle, int_kmers=True)
+    if request.param == 'int_kmers':
+        return EngineTestDriver(int_kmers=True)
     return EngineTestDriver()
 
 
@@ -506,3 +518,86 @@ class TestFixture:
         expect.has_node('GGATCTG').has_coverages('0 1')
         expect.has_n_nodes(4)
         # expect.has_edges('AAA AAC 1', 'CAA AAA 1')
+
+
+def write_two_component_graph(tmpdir):
+    graph_builder = CortexGraphBuilder().with_kmer_size(3).with_colors(0)
+    graph_builder.add_path(['AAA', 'AAT', 'ATC'])
+    graph_builder.add_path(['CCG', 'CGC', 'GCA'])
+    graph = graph_builder.build()
+    graph.graph.update(sample_names=['s0'], num_colors=1)
+    graph_path = str(tmpdir / 'graph.ctx')
+    with open(graph_path, 'wb') as fh:
+        dump_colored_de_bruijn_graph_to_cortex(graph, fh)
+    return graph_path
+
+
+class TestParallelTraversal(object):
+    def write_graph(self, tmpdir):
+        return write_two_component_graph(tmpdir)
+
+    @pytest.mark.parametrize('orientation', list(EngineTraversalOrientation))
+    def test_finds_same_graph_as_serial_traversal(self, tmpdir, orientation):
+        # given
+        graph_path = self.write_graph(tmpdir)
+        graphs = []
+
+        # when
+        for processes in [1, 2]:
+            with open(graph_path, 'rb') as fh:
+                engine = Engine(RandomAccess(fh), orientation=orientation,
+                                graph_paths=[graph_path], processes=processes)
+                graphs.append(engine.traverse_from_each_kmer_in('AAATCCGCA').graph)
+
+        # then
+        serial_graph, parallel_graph = graphs
+        assert sorted(serial_graph) == sorted(parallel_graph)
+        for kmer_string in serial_graph:
+            assert serial_graph.node[kmer_string] == parallel_graph.node[kmer_string]
+        assert sorted(serial_graph.edges(keys=True)) == sorted(parallel_graph.edges(keys=True))
+
+    def test_raises_if_merged_graph_exceeds_max_nodes(self, tmpdir):
+        # given
+        graph_path = self.write_graph(tmpdir)
+
+        # when/then
+        with open(graph_path, 'rb') as fh:
+            engine = Engine(RandomAccess(fh), max_nodes=3, graph_paths=[graph_path], processes=2)
+            with pytest.raises(Exception, match='max node limit'):
+                engine.traverse_from_each_kmer_in('AAATCCGCA')
+
+
+class TestSeedDeduplication(object):
+    def traverse(self, tmpdir, contig, orientation=EngineTraversalOrientation.both):
+        graph_path = write_two_component_graph(tmpdir)
+        with open(graph_path, 'rb') as fh:
+            return Engine(RandomAccess(fh), orientation=orientation) \
+                .traverse_from_each_kmer_in(contig)
+
+    def test_skips_seeds_covered_by_earlier_traversals(self, tmpdir):
+        # when
+        engine = self.traverse(tmpdir, 'AAATCCGCA')
+
+        # then
+        assert {'AAA', 'AAT', 'ATC', 'CCG', 'CGC', 'GCA'} == set(engine.graph)
+        assert (7, 0, 4) == (engine.seed_stats.seeds, engine.seed_stats.duplicates,
+                             engine.seed_stats.covered)
+        assert 4 == engine.seed_stats.traversals_avoided
+
+    def test_skips_reverse_complement_seeds(self, tmpdir):
+        # when
+        engine = self.traverse(tmpdir, 'AAATTT')
+
+        # then
+        assert {'AAA', 'AAT', 'ATC'} == set(engine.graph)
+        assert (4, 2, 1) == (engine.seed_stats.seeds, engine.seed_stats.duplicates,
+                             engine.seed_stats.covered)
+
+    def test_only_skips_identical_seeds_in_one_orientation(self, tmpdir):
+        # when
+        engine = self.traverse(tmpdir, 'AAATTTAAA', orientation=EngineTraversalOrientation.original)
+
+        # then
+        assert {'AAA', 'AAT', 'ATC'} == set(engine.graph)
+        assert (7, 1, 0) == (engine.seed_stats.seeds, engine.seed_stats.duplicates,
+                             engine.seed_stats.covered)
@@ -0,0 +1,47 @@
+from hypothesis import given
+from hypothesis import strategies as s
+
+from cortexpy.graph.parser.kmer import StringKmerConverter
+from cortexpy.int_kmer import IntKmerCodec, get_int_kmer_codec
+from cortexpy.utils import lexlo, revcomp
+
+kmer_strings = s.text('ACGT', min_size=1, max_size=129)
+
+
+class TestIntKmerCodec(object):
+    @given(kmer_strings)
+    def test_decodes_encoded_kmer(self, kmer_string):
+        codec = IntKmerCodec(len(kmer_string))
+        assert kmer_string == codec.decode(codec.encode(kmer_string))
+
+    @given(kmer_strings, kmer_strings)
+    def test_integer_order_is_lexicographic_order(self, kmer_string, other_string):
+        other_string = (other_string * len(kmer_string))[:len(kmer_string)]
+        codec = IntKmerCodec(len(kmer_string))
+        assert ((kmer_string < other_string)
+                == (codec.encode(kmer_string) < codec.encode(other_string)))
+
+    @given(kmer_strings)
+    def test_revcomp_and_lexlo(self, kmer_string):
+        codec = IntKmerCodec(len(kmer_string))
+        kmer_int = codec.encode(kmer_string)
+        assert revcomp(kmer_string) == codec.decode(codec.revcomp(kmer_int))
+        assert lexlo(kmer_string) == codec.decode(codec.lexlo(kmer_int))
+        assert (lexlo(kmer_string) == kmer_string) == codec.is_lexlo(kmer_int)
+
+    @given(kmer_strings, s.sampled_from('ACGT'))
+    def test_shifts_in_bases(self, kmer_string, base):
+        codec = IntKmerCodec(len(kmer_string))
+        kmer_int = codec.encode(kmer_string)
+        base_int = 'ACGT'.index(base)
+        assert kmer_string[1:] + base == codec.decode(codec.shift_in_right(kmer_int, base_int))
+        assert base + kmer_string[:-1] == codec.decode(codec.shift_in_left(kmer_int, base_int))
+
+    @given(kmer_strings)
+    def test_to_uints_matches_string_converter(self, kmer_string):
+        codec = IntKmerCodec(len(kmer_string))
+        expected = StringKmerConverter(len(kmer_string)).to_uints(kmer_string)
+        assert list(expected) == list(codec.to_uints(codec.encode(kmer_string)))
+
+    def test_shares_codecs_by_kmer_size(self):
+        assert get_int_kmer_codec(3) is get_int_kmer_codec(3)
@@ -0,0 +1,50 @@
+import pytest
+from Bio.Seq import reverse_complement
+from hypothesis import given
+from hypothesis import strategies as s
+
+from cortexpy import utils
+from cortexpy.utils import lexlo, revcomp, set_lexlo_cache_size
+
+
+@pytest.fixture
+def lexlo_cache_size():
+    yield set_lexlo_cache_size
+    set_lexlo_cache_size(utils.DEFAULT_LEXLO_CACHE_SIZE)
+
+
+class TestRevcomp(object):
+    @given(s.text('ACGTNacgtn'))
+    def test_matches_biopython(self, dna_string):
+        assert reverse_complement(dna_string) == revcomp(dna_string)
+
+
+class TestLexlo(object):
+    @given(s.text('ACGT', min_size=1))
+    def test_returns_lowest_of_kmer_and_revcomp(self, kmer_string):
+        assert min(kmer_string, reverse_complement(kmer_string)) == lexlo(kmer_string)
+
+    def test_memo_stays_within_cache_size(self, lexlo_cache_size):
+        # given
+        lexlo_cache_size(2)
+
+        # when
+        lexlo_strings = [lexlo(k) for k in ['AAA', 'TTT', 'ACG', 'CCC', 'GGG']]
+
+        # then
+        assert ['AAA', 'AAA', 'ACG', 'CCC', 'CCC'] == lexlo_strings
+        assert len(utils._lexlo_cache) <= 2
+
+    def test_zero_cache_size_disables_memo(self, lexlo_cache_size):
+        # given
+        lexlo_cache_size(0)
+
+        # when
+        lexlo('TTT')
+
+        # then
+        assert 0 == len(utils._lexlo_cache)
+
+    def test_raises_on_negative_cache_size(self):
+        with pytest.raises(ValueError):
+            set_lexlo_cache_size(-1)